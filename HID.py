@@ -1,37 +1,214 @@
 import os
 import select
-from select import epoll, EPOLLIN, EPOLLERR, EPOLLHUP
-from base_hid import *
+from collections import deque
+from threading import Condition, Lock, RLock
+from time import monotonic, monotonic_ns, sleep
+from select import epoll, EPOLLIN, EPOLLERR, EPOLLHUP, EPOLLOUT, POLLOUT
+from base_hid import BaseHid, HIDDeviceError, HIR_REPORT_SIZE, REPORT_QUEUED
+from hid_descriptor import INPUT
+from hidraw_index import hidraw_index
+from fcntl import ioctl
+from hidraw_ioctl import (
+    HIDIOCGFEATURE, HIDIOCGINPUT, HIDIOCSFEATURE, HIDIOCSOUTPUT,
+    get_report_descriptor, read_sysfs_report_descriptor
+)
+
+WRITE_QUEUE_HIGH_WATER = 256  # Глубина очереди отправки: drain() ожидает, новые отчёты не принимаются
+WRITE_QUEUE_LOW_WATER = 64  # Глубина очереди отправки, до которой drain() ожидает
+HIDD_POLL_INTERVAL = 0.001  # Интервал опроса HIDIOCGINPUT фоновым потоком, с
 
 class Hid(BaseHid):
-    def __init__(self, device_address, send_report_id=0, use_hidd=False):
-        self.epoll = epoll()
+    # hidraw начинает с Report ID только нумерованные отчёты, уточняется по дескриптору
+    _input_has_report_id = False
+
+    def __init__(self, device_address, send_report_id=0, use_hidd=False, hidd_poll_interval=HIDD_POLL_INTERVAL):
+        if hidd_poll_interval <= 0:
+            # Без паузы фоновый поток HidD непрерывно опрашивал бы устройство
+            raise ValueError("hidd_poll_interval must be positive")
+        self.epoll = None  # Собственный epoll создаётся при первом блокирующем ожидании
+        self._wakeup_fd = None  # eventfd для пробуждения ожидающего потока
+        self._feature_buffer = None  # Переиспользуемый буфер отчётов функций
+        self._hidd_input_buffer = None  # Переиспользуемый буфер входных отчётов HidD
+        self._write_queue = deque()  # Отчёты, не принятые устройством сразу (EAGAIN), в порядке записи
+        self._write_lock = Lock()  # Очередь отправки разбирают и пишущий поток, и поток epoll
+        self._write_poll = None  # poll для ожидания готовности к записи в drain()/flush()
+        self._write_poll_fd = None
+        self._epollout = False  # Подписан ли дескриптор в epoll на EPOLLOUT
+        # Вызовы других потоков (call_owner) и close() не пересекаются с ожиданием в epoll и разбором его событий
+        self._owner_lock = Condition(RLock())
+        self._owner_waiting = False  # Ожидает ли поток-владелец в epoll
+        self._owner_calls = deque()  # Вызовы, отложенные до пробуждения ожидающего потока
+        self.write_high_water = WRITE_QUEUE_HIGH_WATER
+        self.write_low_water = WRITE_QUEUE_LOW_WATER
+        self.hidd_poll_interval = hidd_poll_interval
         self.fd = None
+        self.hidraw_node = None
+        self.disconnected_at = None  # Момент отключения устройства (monotonic, нс)
+        self.reconnect_count = 0  # Количество переподключений
+        self.reconnect_latency_ns = None  # Задержка последнего переподключения, нс
         super().__init__(device_address, send_report_id, use_hidd)
 
     def _open_path(self, path):
         # Преобразуем путь устройства в hidraw
         self.path = path if isinstance(path, bytes) else path.encode()
-        # Ищем соответствующий hidraw
-        device_found = False
-        for i in range(20):
-            hidraw_path = f"/dev/hidraw{i}"
-            if os.path.exists(hidraw_path):
-                # Проверяем, соответствует ли это нашему устройству
+        # Находим соответствующий hidraw через кэшируемый индекс sysfs
+        node = hidraw_index.resolve(self.path)
+        if node is None:
+            raise HIDDeviceError(f"No hidraw node for device {self.path!r} found")
+        self._open_node(node)
+
+    def _open_node(self, node):
+        self.hidraw_node = node
+        self.fd = os.open(node.dev_path, os.O_RDWR | os.O_NONBLOCK)
+        self._attach_fd()
+        self._load_report_descriptor()
+
+    def _attach_fd(self):
+        # Регистрация нового дескриптора в epoll; отчёты, накопленные до отключения,
+        # дописываются в него, а остаток ждёт EPOLLOUT
+        if self.epoll is not None:
+            self.epoll.register(self.fd, EPOLLIN | EPOLLERR | EPOLLHUP)
+            self._epollout = False
+        if self._write_queue:
+            with self._write_lock:
+                if not self._flush_write_queue():
+                    self._watch_writable(True)
+
+    def _load_report_descriptor(self):
+        # Точные размеры отчётов берём из дескриптора: ioctl, а при ошибке - sysfs
+        try:
+            raw_descriptor = get_report_descriptor(self.fd)
+        except OSError:
+            raw_descriptor = read_sysfs_report_descriptor(self.hidraw_node.sys_path)
+        if not raw_descriptor:
+            return
+        try:
+            self.set_report_descriptor(raw_descriptor)
+        except ValueError as e:
+            print(f"Error parsing report descriptor: {e}")
+
+    def _get_epoll(self):
+        # Устройства, обслуживаемые HidReactor или asyncio, собственный epoll не создают
+        if self.epoll is None:
+            self.epoll = epoll()
+            self._wakeup_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+            self.epoll.register(self._wakeup_fd, EPOLLIN)
+            if self.fd is not None:
+                self.epoll.register(self.fd, EPOLLIN | EPOLLERR | EPOLLHUP)
+                self._epollout = False
+                if self._write_queue:
+                    self._watch_writable(True)
+        return self.epoll
+
+    def fileno(self):
+        return self.fd
+
+    def call_owner(self, callback):
+        # Если поток ждёт в epoll - вызов выполнит он сам после пробуждения,
+        # иначе вызов выполняется сразу, но не параллельно с началом ожидания
+        if self._reactor is not None:
+            BaseHid.call_owner(self, callback)
+            return
+        with self._owner_lock:
+            if not self._owner_waiting:
+                callback()
+                return
+            self._owner_calls.append(callback)
+            wakeup_fd = self._wakeup_fd
+        if wakeup_fd is not None:
+            try:
+                os.eventfd_write(wakeup_fd, 1)
+            except OSError:
+                pass
+
+    def _poll_owned(self, timeout, consume_wakeup=True):
+        # Ожидание в epoll потоком-владельцем без _owner_lock. None - ожидание не начиналось:
+        # выполнены отложенные вызовы, устройство закрыто или пробуждение уже запрошено.
+        # Вызывающий разбирает события под _owner_lock после _end_poll()
+        with self._owner_lock:
+            if self._run_owner_calls() or self.fd is None:
+                return None
+            # eventfd создаётся до проверки _woken: wakeup() после проверки застанет его
+            epoll = self._get_epoll()
+            if consume_wakeup and self._woken:
+                return None
+            self._owner_waiting = True
+        try:
+            return epoll.poll(-1 if timeout is None else timeout)
+        except InterruptedError:
+            return []
+
+    def _end_poll(self):
+        # Вызывается под _owner_lock. True - выполнены отложенные вызовы, события устарели
+        self._owner_waiting = False
+        self._owner_lock.notify_all()
+        if not self._run_owner_calls():
+            return False
+        self._reset_wakeup()
+        return True
+
+    def _run_owner_calls(self):
+        # Вызывается под _owner_lock
+        calls = self._owner_calls
+        count = len(calls)
+        while calls:
+            calls.popleft()()
+        return count > 0
+
+    def _close_fd(self):
+        if self.fd is not None:
+            if self.epoll is not None:
                 try:
-                    # Можно проверить через sysfs
-                    dev_path = f"/sys/class/hidraw/hidraw{i}/device"
-                    if os.path.exists(dev_path):
-                    # Собираем полный путь устройства
-                        realpath = os.path.realpath(dev_path)
-                        print(f"hidraw{i}: {realpath}")
-                        if path.decode() in realpath:
-                            fd = os.open(hidraw_path, os.O_RDWR | os.O_NONBLOCK)
-                            self.fd = fd
-                            self.epoll.register(fd, EPOLLIN | EPOLLERR | EPOLLHUP)
-                except Exception as e:
-                    print(f"Error checking {hidraw_path}: {e}")
-        
+                    self.epoll.unregister(self.fd)
+                except:
+                    pass
+            try:
+                os.close(self.fd)
+            except:
+                pass
+            self.fd = None
+            self._epollout = False
+
+    def _handle_disconnect(self):
+        # Устройство пропало: освобождаем дескриптор, буфер сохраняется до переподключения
+        self._close_fd()
+        if self.disconnected_at is None:
+            self.disconnected_at = monotonic_ns()
+
+    @property
+    def is_connected(self):
+        return self.fd is not None
+
+    def _find_reconnect_node(self):
+        # Ищем узел заново: номер hidraw после сброса USB может измениться
+        hidraw_index.invalidate()
+        if self.device_attributes is not None:
+            return hidraw_index.find(*self.device_attributes)
+        old_node = self.hidraw_node
+        if old_node is not None:
+            node = hidraw_index.resolve(old_node.phys) if old_node.phys else None
+            if node is None:
+                node = hidraw_index.find(old_node.vendor_id, old_node.product_id, old_node.uniq or None)
+            return node
+        return hidraw_index.resolve(self.path)
+
+    def reconnect(self):
+        if self.fd is not None:
+            return True
+        node = self._find_reconnect_node()
+        if node is None:
+            return False
+        try:
+            self._open_node(node)
+        except OSError:
+            return False
+        if self.disconnected_at is not None:
+            self.reconnect_latency_ns = monotonic_ns() - self.disconnected_at
+            self.disconnected_at = None
+        self.reconnect_count += 1
+        if self.metrics is not None:
+            self.metrics.reconnects += 1
+        return True
 
     def write(self, data):
         if self.fd:
@@ -40,52 +217,472 @@ class Hid(BaseHid):
                 data = bytes(data)
             elif isinstance(data, int):
                 data = bytes([data])
-            
+
+            return BaseHid.write(self, data)
+        else:
+            raise Exception("Device not opened")
+
+    def _write_report(self, data):
+        # Один отчёт - один системный вызов, буфер отчёта переиспользуется.
+        # Пока очередь отправки не пуста, новые отчёты встают в её конец, чтобы сохранить порядок
+        if not self._write_queue:
             try:
                 return os.write(self.fd, data)
+            except BlockingIOError:
+                pass
             except Exception as e:
                 print(f"Error writing: {e}")
                 return 0
-        else:
-            raise Exception("Device not opened")
+        # Устройство занято: копируем отчёт в очередь и дописываем его по готовности к записи.
+        # Очередь ограничена верхней границей: дальше отчёты не принимаются, писателю следует вызвать drain()
+        with self._write_lock:
+            queue = self._write_queue
+            if len(queue) >= self.write_high_water:
+                self._flush_write_queue()
+                if len(queue) >= self.write_high_water:
+                    return 0
+            queue.append(bytes(data))
+            self._flush_write_queue()
+            if queue:
+                self._watch_writable(True)
+            metrics = self.metrics
+            if metrics is not None:
+                metrics.queued_writes += 1
+                if len(queue) > metrics.write_queue_peak:
+                    metrics.write_queue_peak = len(queue)
+        return REPORT_QUEUED
+
+    def _flush_write_queue(self):
+        # Отправка отчётов из очереди до EAGAIN, вызывается под _write_lock
+        queue = self._write_queue
+        metrics = self.metrics
+        while queue:
+            if self.fd is None:
+                # Устройство отключено - отчёты ждут переподключения
+                return False
+            report = queue[0]
+            try:
+                written = os.write(self.fd, report)
+            except BlockingIOError:
+                return False
+            except Exception as e:
+                print(f"Error writing: {e}")
+                written = 0
+            queue.popleft()
+            if metrics is not None:
+                if not written:
+                    metrics.write_errors += 1
+                elif written < len(report):
+                    metrics.short_writes += 1
+        self._watch_writable(False)
+        return True
+
+    def _watch_writable(self, enabled):
+        # EPOLLOUT нужен только пока очередь не пуста, иначе epoll просыпался бы постоянно
+        if self._epollout != enabled and self.epoll is not None and self.fd is not None:
+            mask = EPOLLIN | EPOLLERR | EPOLLHUP
+            self.epoll.modify(self.fd, mask | EPOLLOUT if enabled else mask)
+            self._epollout = enabled
+
+    def _on_writable(self):
+        with self._write_lock:
+            self._flush_write_queue()
+
+    @property
+    def write_queue_depth(self):
+        return len(self._write_queue)
+
+    @property
+    def write_backpressure(self):
+        # Очередь отправки достигла верхней границы - писателю следует вызвать drain()
+        return len(self._write_queue) >= self.write_high_water
+
+    def drain(self, timeout=None):
+        # Если очередь достигла верхней границы - ждём её снижения до нижней.
+        # False - если не успели за timeout или устройство отключено
+        if len(self._write_queue) < self.write_high_water:
+            return True
+        return self._wait_write_queue(self.write_low_water, timeout)
+
+    def flush(self, timeout=None):
+        # Ожидание отправки всех отчётов очереди
+        return self._wait_write_queue(0, timeout)
+
+    def _wait_write_queue(self, depth, timeout):
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            with self._write_lock:
+                self._flush_write_queue()
+                if len(self._write_queue) <= depth:
+                    return True
+            if self.fd is None:
+                return False
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            if self._write_poll_fd != self.fd:
+                self._write_poll = select.poll()
+                self._write_poll.register(self.fd, POLLOUT)
+                self._write_poll_fd = self.fd
+            self._write_poll.poll(None if remaining is None else remaining * 1000)
+
+    def _init_hidd(self):
+        # Буферы и номера ioctl выделяются один раз и переиспользуются между вызовами
+        self._feature_buffer = bytearray(self.feature_report_length)
+        self._feature_view = memoryview(self._feature_buffer)
+        self._hidd_input_buffer = bytearray(self.input_report_length)
+        self._hidd_descriptor = self.report_descriptor
+        self._hidd_input_report_id = self._default_input_report_id()
+        self._hidd_input_view = memoryview(self._hidd_input_buffer)
+        self._ioc_get_feature = HIDIOCGFEATURE(self.feature_report_length)
+        self._ioc_get_input = HIDIOCGINPUT(self.input_report_length)
+        self._ioc_set_output = HIDIOCSOUTPUT(self.output_report_length)
 
-    def read(self, size=64):
-        return self._wait_for_event(size)
-    
-    def _wait_for_event(self, size):
+    def _ensure_hidd(self):
+        # Длины отчётов могли измениться после чтения дескриптора
+        if (
+            self._feature_buffer is None
+            or len(self._feature_buffer) != self.feature_report_length
+            or len(self._hidd_input_buffer) != self.input_report_length
+            or self._hidd_descriptor is not self.report_descriptor
+        ):
+            self._init_hidd()
+
+    def _default_input_report_id(self):
+        # Первый входной отчёт дескриптора, 0 - если отчёты не нумерованы
+        descriptor = self.report_descriptor
+        if descriptor is None or not descriptor.uses_report_ids:
+            return 0
+        return min((report_id for kind, report_id in descriptor.reports if kind == INPUT), default=0)
+
+    def recv_hidd_report(self, report_id=None):
+        # Получение входного отчёта через HIDIOCGINPUT в переиспользуемый буфер,
+        # по умолчанию - первого входного отчёта из дескриптора
+        self._ensure_hidd()
+        self._hidd_input_buffer[0] = self._hidd_input_report_id if report_id is None else report_id
         try:
-            # Используем epoll с таймаутом
-            events = self.epoll.poll(1.0)  # 1 секунда таймаут
-            for fd, event in events:
-                    if event & EPOLLIN:
-                        return os.read(fd, size)
-                    elif event & EPOLLERR:
-                        print("EPOLLERR - проверьте права доступа к устройству")
-                        return b''
-                    elif event & EPOLLHUP:
-                        print("EPOLLHUP - устройство отключено")
-                        return b''
-        except Exception as e:
-            print(f"Error in epoll: {e}")
-        
-        return b''
+            size = ioctl(self.fd, self._ioc_get_input, self._hidd_input_buffer, True)
+        except OSError as e:
+            print(f"Error getting input report: {e}")
+            return b''
+        return self._hidd_input_view[:size]
 
-    def close(self):
-        if hasattr(self, 'epoll') and self.epoll and self.fd:
+    def _reader_loop(self, put):
+        if not self._use_hidd:
+            BaseHid._reader_loop(self, put)
+            return
+        # HIDIOCGINPUT не ждёт новых данных и всегда возвращает текущий отчёт:
+        # опрашиваем его с интервалом и копируем из переиспользуемого буфера
+        while self._reader_running:
+            started = monotonic()
+            data = bytes(self.recv_hidd_report()) if self.fd is not None else b''
+            if not data:
+                if self.metrics is not None:
+                    self.metrics.record_input(0, 0)
+            elif self._on_input(data):
+                put(data)
+            remaining = self.hidd_poll_interval - (monotonic() - started)
+            if remaining > 0:
+                sleep(remaining)
+
+    def _write_hidd_report(self, data):
+        # Отправка выходного отчёта через HIDIOCSOUTPUT.
+        # Неизменяемые данные копируем, чтобы ioctl вернул длину, а не копию
+        self._ensure_hidd()
+        if memoryview(data).readonly:
+            data = bytearray(data)
+        request = self._ioc_set_output if len(data) == self.output_report_length else HIDIOCSOUTPUT(len(data))
+        try:
+            return ioctl(self.fd, request, data, True)
+        except OSError as e:
+            print(f"Error writing: {e}")
+            return 0
+
+    def get_feature_report_into(self, report_id, buffer):
+        # Получение отчёта функций прямо в буфер вызывающего, первым байтом - Report ID
+        buffer[0] = report_id
+        return ioctl(self.fd, HIDIOCGFEATURE(len(buffer)), buffer, True)
+
+    def get_feature_report(self, report_id):
+        # Представление действительно до следующего вызова
+        self._ensure_hidd()
+        self._feature_buffer[0] = report_id
+        size = ioctl(self.fd, self._ioc_get_feature, self._feature_buffer, True)
+        return self._feature_view[:size]
+
+    def send_feature_report(self, data):
+        # data - отчёт функций вместе с Report ID первым байтом
+        # Неизменяемые данные копируем в переиспользуемый буфер, чтобы ioctl вернул длину, а не копию
+        if memoryview(data).readonly:
+            self._ensure_hidd()
+            size = len(data)
+            if size <= len(self._feature_buffer):
+                self._feature_view[:size] = data
+                data = self._feature_view[:size]
+            else:
+                data = bytearray(data)
+        return ioctl(self.fd, HIDIOCSFEATURE(len(data)), data, True)
+
+    def get_feature_reports(self, report_ids, out=None):
+        # Пакетное получение: отчёты кладутся подряд в out слотами по feature_report_length
+        self._ensure_hidd()
+        length = self.feature_report_length
+        if out is None:
+            out = bytearray(length * len(report_ids))
+        view = memoryview(out)
+        request = self._ioc_get_feature
+        fd = self.fd
+        sizes = []
+        for index, report_id in enumerate(report_ids):
+            slot = view[index * length:(index + 1) * length]
+            slot[0] = report_id
+            sizes.append(ioctl(fd, request, slot, True))
+        return out, sizes
+
+    def send_feature_reports(self, reports):
+        # Пакетная отправка, возвращает количество принятых отчётов
+        sent = 0
+        send_feature_report = self.send_feature_report
+        for report in reports:
             try:
-                self.epoll.unregister(self.fd)
-            except:
-                pass
-        
-        if self.fd:
+                send_feature_report(report)
+            except OSError as e:
+                print(f"Error sending feature report: {e}")
+                break
+            sent += 1
+        return sent
+
+    def recv_report(self):
+        # Неблокирующее чтение одного отчёта, пустой буфер - если отчётов нет
+        try:
+            return os.read(self.fd, self.input_report_length)
+        except BlockingIOError:
+            return b''
+
+    def _recv_report_into(self, slot):
+        # Отчёт читается прямо в слот арены пакетного приёма
+        try:
+            return os.readv(self.fd, (slot,))
+        except BlockingIOError:
+            return 0
+
+    def wakeup(self):
+        # Мгновенное пробуждение потока, ожидающего в epoll
+        BaseHid.wakeup(self)
+        wakeup_fd = self._wakeup_fd
+        if wakeup_fd is not None:
             try:
-                os.close(self.fd)
-            except:
+                os.eventfd_write(wakeup_fd, 1)
+            except OSError:
                 pass
-            self.fd = None
-        
-        if hasattr(self, 'epoll') and self.epoll:
+
+    def cancel_wakeup(self):
+        BaseHid.cancel_wakeup(self)
+        self._reset_wakeup()
+
+    def _reset_wakeup(self):
+        wakeup_fd = self._wakeup_fd
+        if wakeup_fd is None:
+            return
+        try:
+            os.eventfd_read(wakeup_fd)
+        except OSError:
+            pass
+
+    def _handle_events(self, events):
+        # Разбор событий epoll под _owner_lock, общий для read() и фонового потока чтения.
+        # True - есть данные для чтения; при отключении дескриптор закрывается
+        readable = False
+        for fd, event in events:
+            if event & EPOLLOUT:
+                # Устройство готово принять отчёты из очереди отправки
+                self._on_writable()
+            if fd == self._wakeup_fd:
+                # Пробуждение: wakeup(), close() или вызов владельцу
+                self._reset_wakeup()
+            elif event & EPOLLHUP:
+                print("EPOLLHUP - устройство отключено")
+                self._handle_disconnect()
+                return False
+            elif event & EPOLLIN:
+                readable = True
+            elif event & EPOLLERR:
+                if self.metrics is not None:
+                    self.metrics.poll_errors += 1
+                print("EPOLLERR - проверьте права доступа к устройству")
+        return readable
+
+    def _wait_readable(self, timeout):
+        if self.fd is None:
+            # Устройство отключено - ждём переподключения
+            sleep(timeout if timeout is not None else 0.1)
+            return False
+        # Пробуждение адресовано потребителю: поток фонового чтения его не забирает
+        consume_wakeup = not self._reader_running
+        metrics = self.metrics
+        timed = metrics is not None and metrics.histograms  # Отметка времени нужна только гистограмме ожидания
+        started = monotonic_ns() if timed else 0
+        events = self._poll_owned(timeout, consume_wakeup)
+        if metrics is not None:
+            metrics.wakeups += 1
+            if timed:
+                metrics.poll_wait.record(monotonic_ns() - started)
+        with self._owner_lock:
+            if self._end_poll() or events is None:
+                if consume_wakeup and self._woken:
+                    self._woken = False
+                    return False
+                # Дескриптор мог смениться: вызывающий повторит чтение
+                return self.fd is not None
+            readable = self._handle_events(events)
+            if self.fd is None:
+                return False
+            if consume_wakeup and self._woken:
+                # Пробуждение сообщается, только если данных нет
+                self._woken = False
+            return readable
+
+    def _drain(self):
+        # Вычитываем все ожидающие отчёты до EAGAIN напрямую в хвост буфера приёма.
+        # Отчёт без маршрута не подтверждается: его место в хвосте займёт следующий
+        buffer = self.buffer
+        size = self.input_report_length
+        table = self.dispatch_table
+        has_report_id = self._input_has_report_id is not False
+        reports_count = 0
+        bytes_count = 0
+        while True:
+            slot = buffer.reserve(size)
             try:
-                self.epoll.close()
-            except:
-                pass
\ No newline at end of file
+                received = os.readv(self.fd, (slot,))
+            except BlockingIOError:
+                break
+            if not received:
+                break
+            if self._capture is not None:
+                self._capture_input(slot[:received])
+            reports_count += 1
+            bytes_count += received
+            if table is None or table.dispatch(slot, received, has_report_id):
+                buffer.commit(received)
+        # Счётчики обновляются на месте: приём - самый частый путь
+        metrics = self.metrics
+        if metrics is not None:
+            if not reports_count:
+                metrics.eagain += 1
+            else:
+                metrics.reports_in += reports_count
+                metrics.bytes_in += bytes_count
+                if metrics.last_write_ns is not None:
+                    metrics.record_response()
+        return reports_count
+
+    def _receive(self):
+        if self.reader_queue is not None:
+            BaseHid._receive(self)
+        elif self._ring is not None or self.fd is None:
+            # Отчёты публикует в кольцо фоновый поток или устройство отключено
+            return
+        elif self._use_hidd:
+            # HIDIOCGINPUT всегда возвращает текущий отчёт - запрашиваем его один раз
+            data = self.recv_hidd_report()
+            if self.metrics is not None:
+                self.metrics.record_input(1 if data else 0, len(data))
+            if data:
+                if self._capture is not None:
+                    self._capture_input(data)
+                if self._accept_input(data, len(data)):
+                    self.buffer.append(data)
+        else:
+            self._drain()
+
+    def read(self, size=HIR_REPORT_SIZE):
+        # Возвращаем доступные данные (не более size), ожидая их не дольше timeout
+        if not len(self.buffer):
+            self._receive()
+        if not len(self.buffer) and not self._wait_for_event():
+            return b''
+        return self._read(size)
+
+    def _wait_for_event(self):
+        timeout = self.timeout
+        if self.reader_queue is not None:
+            # Отчёты вычитывает фоновый поток, ждём их появления в очереди
+            ready = self.event.wait(timeout)
+            if self._woken:
+                self._woken = False
+                if not len(self.reader_queue):
+                    self.event.clear()
+                return False
+            if ready:
+                self._receive()
+            return ready
+
+        if self.fd is None:
+            return False
+
+        metrics = self.metrics
+        timed = metrics is not None and metrics.histograms  # Отметка времени нужна только гистограмме ожидания
+        deadline = None if timeout is None else monotonic() + timeout
+        has_data = False
+        try:
+            while True:
+                # None - бесконечное ожидание, 0 - неблокирующая проверка
+                started = monotonic_ns() if timed else 0
+                events = self._poll_owned(timeout)
+                if metrics is not None and events is not None:
+                    metrics.wakeups += 1
+                    if timed:
+                        metrics.poll_wait.record(monotonic_ns() - started)
+                with self._owner_lock:
+                    if self._end_poll():
+                        # Отключение или переподключение из другого потока: события устарели
+                        events = None
+                    if events and self._handle_events(events):
+                        # За одно пробуждение забираем все ожидающие отчёты
+                        self._drain()
+                        has_data = True
+                    if self._woken:
+                        # Внешнее пробуждение сообщается, только если данных нет
+                        self._woken = False
+                        break
+                    if has_data or self.fd is None:
+                        break
+                if deadline is not None:
+                    timeout = deadline - monotonic()
+                    if timeout <= 0:
+                        break
+        except Exception as e:
+            if metrics is not None:
+                metrics.poll_errors += 1
+            print(f"Error in epoll: {e}")
+
+        if not has_data and metrics is not None:
+            metrics.empty_wakeups += 1
+        return has_data
+
+    def close(self):
+        # Сначала будим ожидающий поток, затем освобождаем ресурсы,
+        # когда он выйдет из epoll и разберёт события
+        self.wakeup()
+        self.stop_reader()
+        self.stop_publisher()
+        with self._owner_lock:
+            self._owner_lock.wait_for(lambda: not self._owner_waiting)
+            self._close_fd()
+            self.stop_capture()
+            # Неотправленные отчёты отбрасываются: перед закрытием можно вызвать flush(timeout)
+            self._write_queue.clear()
+            self._write_poll = None
+            self._write_poll_fd = None
+
+            if self.epoll is not None:
+                try:
+                    self.epoll.close()
+                except:
+                    pass
+                self.epoll = None
+
+            if self._wakeup_fd is not None:
+                os.close(self._wakeup_fd)
+                self._wakeup_fd = None
\ No newline at end of file
@@ -0,0 +1,406 @@
+import asyncio
+import os
+from collections import deque
+from time import monotonic_ns
+from typing import Deque, Optional
+
+from base_hid import HIR_REPORT_SIZE, HIDDeviceError, WriteResult
+from hid_capture import CAPTURE_OUTPUT
+from HID import Hid
+
+ASYNC_MAX_REPORTS = 1024  # Максимальное количество непрочитанных отчётов до приостановки чтения
+
+
+class AsyncHid(Hid):
+    """
+    Аксессор HID устройства для asyncio.
+
+    Дескриптор hidraw регистрируется в работающем цикле событий через
+    `add_reader`/`add_writer`, поэтому один цикл обслуживает множество
+    устройств без собственного epoll и потока на каждое устройство.
+    При переполнении очереди отчётов чтение из дескриптора приостанавливается
+    до тех пор, пока потребитель не заберёт данные
+    """
+
+    def __init__(
+            self,
+            device_address,
+            send_report_id=0,
+            use_hidd=False,
+            max_reports: int = ASYNC_MAX_REPORTS
+        ):
+        """
+        Инициализация аксессора
+
+        Args:
+            device_address (HidAttributes | str):
+                Идентификаторы устройства или путь до устройства
+            send_report_id (UInt8):
+                ID отчёта по-умолчанию при отправке отчёта
+            use_hidd (bool): Использовать ли методы чтения-записи HidD
+            max_reports (int):
+                Максимальное количество непрочитанных отчётов
+        """
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # Цикл событий устройства
+        self._reports: Deque[bytes] = deque()  # Принятые, но не прочитанные отчёты
+        self._max_reports = max_reports
+        self._reading = False  # Зарегистрирован ли дескриптор на чтение
+        self._data_waiter: Optional[asyncio.Future] = None  # Ожидание новых отчётов
+        self._write_waiter: Optional[asyncio.Future] = None  # Общее ожидание готовности к записи
+        self._write_mutex = asyncio.Lock()  # Отчёт собирается в общем буфере: записи выполняются по очереди
+        super().__init__(device_address, send_report_id, use_hidd)
+
+
+    async def open(self):
+        """
+        Открытие устройства и регистрация его дескриптора в текущем цикле событий
+        """
+
+        self._loop = asyncio.get_running_loop()
+        self.run()
+
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+    def _open_node(self, node):
+        # Вместо собственного epoll регистрируем дескриптор в цикле событий
+        self.hidraw_node = node
+        self.fd = os.open(node.dev_path, os.O_RDWR | os.O_NONBLOCK)
+        self._load_report_descriptor()
+        if self._write_queue:  # Отчёты, накопленные до отключения
+            with self._write_lock:
+                self._flush_write_queue()
+        if self._loop is not None:
+            # Переподключение может быть вызвано и не из потока цикла событий
+            self._loop.call_soon_threadsafe(self._start_reading)
+
+
+    def call_owner(self, callback):
+        """
+        Выполнение вызова в потоке цикла событий: дескриптор
+        регистрируется и снимается с цикла только из его потока
+
+        Args:
+            callback (Callable[[], Any]): Вызов
+        """
+
+        if self._loop is None:
+            callback()
+        else:
+            self._loop.call_soon_threadsafe(callback)
+
+
+    def run(self):
+        Hid.run(self)
+        self._start_reading()
+
+
+    def _start_reading(self):
+        """
+        Регистрация дескриптора устройства на чтение в цикле событий
+        """
+
+        if not self._reading and self.fd is not None and self._loop is not None:
+            self._loop.add_reader(self.fd, self._on_readable)
+            self._reading = True
+
+
+    def _stop_reading(self):
+        """
+        Снятие дескриптора устройства с чтения в цикле событий
+        """
+
+        if self._reading and self._loop is not None:
+            self._loop.remove_reader(self.fd)
+            self._reading = False
+
+
+    def _wake(self, waiter: Optional[asyncio.Future]):
+        """
+        Пробуждение ожидающей корутины
+
+        Args:
+            waiter (Optional[asyncio.Future]): Ожидание для пробуждения
+        """
+
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+
+    def _on_readable(self):
+        """
+        Вычитывание всех доступных отчётов при готовности дескриптора
+        """
+
+        reports_count = 0
+        bytes_count = 0
+        while len(self._reports) < self._max_reports:
+            try:
+                report = os.read(self.fd, self.input_report_length)
+            except BlockingIOError:
+                break
+            except OSError:
+                self._handle_disconnect()  # Устройство отключено
+                break
+            if not report:
+                break
+            if self._capture is not None:
+                self._capture_input(report)
+            if self._accept_input(report, len(report)):
+                self._reports.append(report)
+            reports_count += 1
+            bytes_count += len(report)
+
+        if self.metrics is not None:
+            self.metrics.wakeups += 1
+            self.metrics.record_input(reports_count, bytes_count)
+
+        if len(self._reports) >= self._max_reports:  # Очередь заполнена - приостанавливаем чтение
+            self._stop_reading()
+
+        waiter, self._data_waiter = self._data_waiter, None
+        self._wake(waiter)
+
+
+    async def _wait_data(self):
+        """
+        Ожидание поступления новых отчётов.
+        Все ожидающие корутины используют одно ожидание, которое завершает `_on_readable`
+        """
+
+        if self.fd is None and not self.is_open:
+            raise HIDDeviceError("Device not opened")
+        waiter = self._data_waiter
+        if waiter is None:
+            waiter = self._data_waiter = self._loop.create_future()
+        await asyncio.shield(waiter)  # Отмена одной корутины не отменяет ожидание остальных
+
+
+    def _pop_report(self) -> bytes:
+        """
+        Извлечение отчёта из очереди с возобновлением чтения при необходимости
+
+        Returns:
+            bytes: Данные отчёта
+        """
+
+        report = self._reports.popleft()
+        if not self._reading and self.fd is not None:  # Появилось место - возобновляем чтение
+            self._start_reading()
+
+        return self._process_input_data(report)
+
+
+    async def read_report(self) -> bytes:
+        """
+        Получение одного отчёта
+
+        Returns:
+            bytes: Данные отчёта, пустой набор байт - если устройство закрыто
+        """
+
+        while not self._reports:
+            if not self.is_open:
+                return b""
+            await self._wait_data()
+
+        return self._pop_report()
+
+
+    async def read(self, size: int = HIR_REPORT_SIZE) -> bytes:
+        """
+        Чтение указанного количества байт из потока отчётов
+
+        Args:
+            size (int): Количество байт для чтения
+        Returns:
+            bytes: Прочитанные данные, пустой набор байт - если устройство закрыто
+        """
+
+        while len(self.buffer) < size:
+            if self._reports:
+                self.buffer.append(self._pop_report())
+                continue
+            if not self.is_open:
+                return b""
+            await self._wait_data()
+
+        return self._read(size)
+
+
+    def __aiter__(self):
+        return self
+
+
+    async def __anext__(self) -> bytes:
+        report = await self.read_report()
+        if not report and not self.is_open:
+            raise StopAsyncIteration
+
+        return report
+
+
+    async def _wait_writable(self):
+        """
+        Ожидание готовности дескриптора к записи.
+        Все ожидающие корутины используют одну регистрацию `add_writer`
+        """
+
+        waiter = self._write_waiter
+        if waiter is None:
+            waiter = self._write_waiter = self._loop.create_future()
+            self._loop.add_writer(self.fd, self._on_write_ready)
+        await asyncio.shield(waiter)  # Отмена одной корутины не отменяет ожидание остальных
+
+
+    def _on_write_ready(self):
+        """
+        Пробуждение корутин, ожидающих готовности к записи
+        """
+
+        if self.fd is not None:
+            self._loop.remove_writer(self.fd)
+        waiter, self._write_waiter = self._write_waiter, None
+        self._wake(waiter)
+
+
+    async def drain(self):
+        """
+        Ожидание снижения очереди отправки до нижней границы,
+        если она достигла верхней. Очередь наполняют синхронные пути записи
+        (`write_report`, периодическая отправка), когда устройство занято
+
+        Raises:
+            HIDDeviceError: Если устройство закрыто или отключено
+        """
+
+        if len(self._write_queue) >= self.write_high_water:
+            await self._wait_write_queue_async(self.write_low_water)
+
+
+    async def flush(self):
+        """
+        Ожидание отправки всех отчётов очереди отправки
+
+        Raises:
+            HIDDeviceError: Если устройство закрыто или отключено
+        """
+
+        await self._wait_write_queue_async(0)
+
+
+    async def _wait_write_queue_async(self, depth: int):
+        """
+        Дописывание очереди отправки по готовности дескриптора к записи
+
+        Args:
+            depth (int): Глубина очереди, до которой нужно дописать
+        Raises:
+            HIDDeviceError: Если устройство закрыто или отключено
+        """
+
+        while True:
+            with self._write_lock:
+                self._flush_write_queue()
+                if len(self._write_queue) <= depth:
+                    return
+            if self.fd is None:
+                raise HIDDeviceError("Device not opened")
+            await self._wait_writable()
+
+
+    async def write(self, data) -> WriteResult:
+        """
+        Запись данных в устройство. Если устройство не принимает отчёт,
+        корутина ожидает готовности дескриптора к записи.
+        Отчёты из очереди отправки уходят раньше новых.
+        При использовании HidD отчёты отправляются синхронным HIDIOCSOUTPUT
+
+        Args:
+            data (bytes | bytearray | memoryview | list | int): Данные для записи
+        Returns:
+            WriteResult: Количество принятых устройством отчётов и байт данных
+        """
+
+        if isinstance(data, list):
+            data = bytes(data)
+        elif isinstance(data, int):
+            data = bytes([data])
+
+        async with self._write_mutex:
+            if self._use_hidd:  # ioctl не возвращает EAGAIN: ждать готовности дескриптора не нужно
+                return Hid.write(self, data)
+            return await self._write_locked(data)
+
+
+    async def _write_locked(self, data) -> WriteResult:
+        """
+        Запись данных под блокировкой записи
+
+        Args:
+            data (bytes | bytearray | memoryview): Данные для записи
+        Returns:
+            WriteResult: Количество принятых устройством отчётов и байт данных
+        """
+
+        if self._write_queue:  # Сохраняем порядок отчётов
+            await self.flush()
+
+        source = memoryview(data)
+        report_length = self.output_report_length
+        payload_size = report_length - 1
+        reports_count = 0
+        bytes_count = 0
+
+        for report_start in range(0, len(source), payload_size):
+            chunk = source[report_start: report_start + payload_size]
+            report = self._prepare_output_buffer(chunk)
+            while True:
+                if self.fd is None:
+                    raise HIDDeviceError("Device not opened")
+                try:
+                    written = os.write(self.fd, report)
+                    break
+                except BlockingIOError:
+                    await self._wait_writable()  # Ожидаем, пока устройство примет отчёт
+            if written < report_length and self.metrics is not None:  # Отчёт принят не полностью
+                self.metrics.short_writes += 1
+            if self._capture is not None:
+                self._capture.append(CAPTURE_OUTPUT, self._send_report_id, report[:written])
+            reports_count += 1
+            bytes_count += len(chunk)
+
+        if self.metrics is not None and reports_count:
+            self.metrics.reports_out += reports_count
+            self.metrics.bytes_out += bytes_count
+            # Задержка запись-ответ отсчитывается от первой записи без ответа, если собираются гистограммы
+            if self.metrics.histograms and self.metrics.last_write_ns is None:
+                self.metrics.last_write_ns = monotonic_ns()
+
+        return WriteResult(reports_count, bytes_count)
+
+
+    def _close_fd(self):
+        # Снимаем дескриптор с цикла событий до его закрытия
+        if self.fd is not None and self._loop is not None:
+            self._stop_reading()
+            self._loop.remove_writer(self.fd)
+        Hid._close_fd(self)
+        waiter, self._write_waiter = self._write_waiter, None
+        self._wake(waiter)  # Ожидающие запись увидят закрытое устройство
+
+
+    def close(self):
+        Hid.close(self)
+        self.is_open = False
+        waiter, self._data_waiter = self._data_waiter, None
+        self._wake(waiter)
+        self._wake(self._write_waiter)
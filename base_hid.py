@@ -1,31 +1,24 @@
 from abc import abstractmethod
-from math import ceil
-from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Self, TypeAlias, cast
-from threading import Thread as Event
+from time import monotonic_ns
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Self, Tuple, TypeAlias, cast
+from threading import Event, Thread
 from base_interface import BaseIoInterface
+from hid_buffer import ReportArena, ReportBuffer
+from hid_capture import CAPTURE_INITIAL_SIZE, CAPTURE_INPUT, CAPTURE_OUTPUT, CaptureWriter
+from hid_dispatch import DispatchTable, ReportHandler
+from hid_descriptor import FEATURE, INPUT, OUTPUT, ReportDecoder, ReportDescriptor, compile_descriptor
+from hid_metrics import HidMetrics
+from hid_queue import OverflowPolicy, REPORT_QUEUE_SIZE, ReportQueue
+if TYPE_CHECKING:  # Кольцо в разделяемой памяти и обнаружение устройств загружаются при первом использовании
+    from hid_reactor import HidReactor
+    from hid_shm import SharedReportRing
 UInt8: TypeAlias = int
 DevicesListType: TypeAlias = List[Dict[str, bytes | int | str]]
 """Список свойств обнаруженных Bluetooth Classic устройств"""
 
-if TYPE_CHECKING:
-    def hid_enumerate(
-            vendor_id: Optional[int] = None,  # pylint: disable=unused-argument
-            product_id: Optional[int] = None  # pylint: disable=unused-argument
-        ) -> DevicesListType:  # pyright: ignore[reportReturnType]
-        """
-        Обнаружение всех подключённых HID устройств
-
-        Args:
-            vendor_id (Optional[int]): ID производителя
-            product_id (Optional[int]): ID продукта
-        Returns:
-            DevicesListType:
-                Список параметров обнаруженных HID устройств
-        """
-else:
-    from hid import enumerate as hid_enumerate
-
 HIR_REPORT_SIZE = 64  # Байтовый размер одного HID отчёта
+RECV_BATCH_SIZE = 64  # Количество отчётов в пакете `recv_reports` по умолчанию
+REPORT_QUEUED = -1  # Результат `_write_report`: устройство занято, отчёт целиком поставлен в очередь отправки
 
 
 class HIDDeviceError(Exception):
@@ -47,11 +40,45 @@ class HidAttributes(NamedTuple):
     serial_number: Optional[int] = None  # Серийный номер, опционально
 
 
+class WriteResult(NamedTuple):
+    """
+    Результат записи данных в HID устройство
+
+    Attributes:
+        reports_count (int): Количество принятых отчётов, включая поставленные в очередь отправки
+        bytes_count (int): Количество принятых байт полезных данных
+        queued_count (int): Сколько из принятых отчётов ещё не записано (устройство занято)
+    """
+
+    reports_count: int  # Количество принятых отчётов, включая поставленные в очередь отправки
+    bytes_count: int  # Количество принятых байт полезных данных
+    queued_count: int = 0  # Сколько из принятых отчётов ждёт в очереди отправки
+
+
+class InputReport(NamedTuple):
+    """
+    Входной отчёт пакетного приёма
+
+    Attributes:
+        timestamp (int): Момент приёма (monotonic, нс)
+        report_id (int): ID отчёта (`0` - отчёты без нумерации)
+        payload (memoryview): Данные отчёта без Report ID в арене приёма
+    """
+
+    timestamp: int  # Момент приёма (monotonic, нс)
+    report_id: int  # ID отчёта
+    payload: memoryview  # Данные отчёта без Report ID
+
+
 class BaseHid(BaseIoInterface):
     """
     Базовый класс аксессоров взаимодействия с устройствами HID
     """
 
+    # Начинаются ли принятые отчёты с Report ID: `None` - всегда, в том числе с нулевым
+    # для ненумерованных отчётов (ReadFile), `True`/`False` - по дескриптору устройства
+    _input_has_report_id: Optional[bool] = None
+
     def __init__(
             self,
             device_address: HidAttributes | str,
@@ -74,8 +101,14 @@ class BaseHid(BaseIoInterface):
                 соответствующее устройство по указанным атрибутам
         """
 
+        self.report_descriptor: Optional[ReportDescriptor] = None  # Разобранный дескриптор отчётов
+        self.report_decoders: Dict[Tuple[str, int], ReportDecoder] = {}  # Декодеры по (тип, ID отчёта)
+
         self.set_report_id(send_report_id)  # Устанавливаем ID отчёта для отправки отчётов
 
+        # Атрибуты устройства, если переданы (используются при переподключении):
+        self.device_attributes = device_address if isinstance(device_address, HidAttributes) else None
+
         # Определяем путь до устройства через атрибуты:
         if isinstance(device_address, HidAttributes):
             device_path = self.get_device_path_by_attributes(device_address)  # Получаем путь до устройства
@@ -94,11 +127,23 @@ class BaseHid(BaseIoInterface):
 
         self._self_timeout = None  # Таймаут пока не установлен
 
-        self.buffer = b""  # Внутренний буфер для чтения
+        self.buffer = ReportBuffer()  # Внутренний буфер для чтения
         self.device_handle = None  # Дескриптор устройства
         self.input_report_length = HIR_REPORT_SIZE + 1  # Добавляем байт для Report ID
         self.output_report_length = HIR_REPORT_SIZE + 1  # Добавляем байт для Report ID
         self.feature_report_length = HIR_REPORT_SIZE + 1  # Добавляем байт для Report ID
+        self._init_output_buffer()  # Выделяем переиспользуемый буфер выходного отчёта
+
+        self._reader_queue: Optional[ReportQueue] = None  # Очередь фонового чтения, если запущено
+        self._reader_thread: Optional[Thread] = None  # Поток фонового чтения
+        self._reader_running = False  # Флаг работы потока фонового чтения
+        self._ring: Optional["SharedReportRing"] = None  # Кольцо в разделяемой памяти, если публикация запущена
+        self._woken = False  # Было ли запрошено внешнее пробуждение
+        self._reactor: Optional["HidReactor"] = None  # Реактор, обслуживающий устройство
+        self.metrics: Optional[HidMetrics] = HidMetrics()  # Счётчики устройства (`None` - не собирать)
+        self._capture: Optional[CaptureWriter] = None  # Журнал отчётов, если запись запущена
+        self._recv_arena = ReportArena()  # Арены пакетного приёма отчётов
+        self.dispatch_table: Optional[DispatchTable] = None  # Маршруты входных отчётов (`None` - все в буфер)
 
         self._setup_api_functions()  # Настраиваем функции API
 
@@ -126,17 +171,15 @@ class BaseHid(BaseIoInterface):
                 соответствующее необходимым атрибутам
         """
 
-        # Находим устройство под атрибуты:
-        hid_devices = hid_enumerate(hid_attributes.vendor_id, hid_attributes.product_id)
+        from hid_sysfs import get_device_table  # pylint: disable=import-outside-toplevel
+
+        # Находим устройство под атрибуты в кэшированной таблице устройств:
+        device = get_device_table().by_ids(*hid_attributes)
 
-        if hid_devices:  # Если хотя бы одно устройство найдено
-            if hid_attributes.serial_number is None:  # Если соответствие серийному номеру не требуется
-                return cast(bytes, hid_devices[0]["path"])  # Возвращаем первое найденное устройство
-            for device in hid_devices:
-                if device["serial_number"] == hid_attributes.serial_number:  # Если серийный номер совпал
-                    return cast(bytes, device["path"])
+        if device is None:  # Если не нашли подходящее устройство
+            return None  # Возвращаем None как маркер того, что не нашли подходящее устройство
 
-        return None  # Возвращаем None как маркер того, что не нашли подходящее устройство
+        return device.path  # Возвращаем путь до найденного устройства
 
 
     @staticmethod
@@ -149,7 +192,10 @@ class BaseHid(BaseIoInterface):
                 Список всех найденных HID устройств и их характеристик
         """
 
-        return hid_enumerate()  # Возвращаем список всех обнаруженных HID устройств
+        from hid_sysfs import get_device_table  # pylint: disable=import-outside-toplevel
+
+        # Возвращаем список всех обнаруженных HID устройств:
+        return [device.as_dict() for device in get_device_table()]
 
 
     @classmethod
@@ -175,13 +221,15 @@ class BaseHid(BaseIoInterface):
                 с указанным именем (product_string)
         """
 
-        for device_info in cls.discover():  # Для каждого найденного HID устройства
-            if device_info["product_string"] == device_name:  # Если имя устройства совпало
-                return cls(
-                    device_address = cast(str, device_info["path"]),  # Передаём путь до устройства
-                    send_report_id = send_report_id,  # ID отчёта при отправке отчётов
-                    use_hidd = use_hidd  # Передаём флаг необходимости использования HidD
-                )  # Инициализируем класс и возвращаем
+        from hid_sysfs import get_device_table  # pylint: disable=import-outside-toplevel
+
+        device_info = get_device_table().by_product_string(device_name)  # Ищем устройство по имени
+        if device_info is not None:  # Если имя устройства совпало
+            return cls(
+                device_address = cast(str, device_info.path),  # Передаём путь до устройства
+                send_report_id = send_report_id,  # ID отчёта при отправке отчётов
+                use_hidd = use_hidd  # Передаём флаг необходимости использования HidD
+            )  # Инициализируем класс и возвращаем
 
         raise RuntimeError(f"No HID devices with name {device_name} found")  # Вызываем исключение
 
@@ -194,7 +242,67 @@ class BaseHid(BaseIoInterface):
             send_report_id (UInt8): ID отчёта для отправки
         """
 
-        self._send_report_id_byte = bytes(send_report_id)  # Устанавливаем новое ID отчёта для отправки
+        self._send_report_id = send_report_id  # Устанавливаем новое ID отчёта для отправки
+        self._send_report_id_byte = bytes((send_report_id,))  # ID отчёта в виде байта
+
+        if self.report_descriptor is not None:  # Размер выходного отчёта зависит от его ID
+            self._update_output_report_length()
+
+
+    def set_report_descriptor(self, raw_descriptor: bytes):
+        """
+        Установка дескриптора отчётов устройства: точные размеры
+        отчётов и предкомпилированные декодеры полей
+
+        Args:
+            raw_descriptor (bytes): Дескриптор отчётов
+        Raises:
+            ValueError: Если дескриптор повреждён
+        """
+
+        self.report_descriptor, self.report_decoders = compile_descriptor(raw_descriptor)  # Берём из кэша
+        self._input_has_report_id = self.report_descriptor.uses_report_ids
+
+        input_size = self.report_descriptor.max_report_size(INPUT)
+        if input_size:  # Буфер чтения должен вмещать самый длинный входной отчёт
+            self.input_report_length = input_size + 1  # Добавляем байт для Report ID
+        feature_size = self.report_descriptor.max_report_size(FEATURE)
+        if feature_size:
+            self.feature_report_length = feature_size + 1  # Добавляем байт для Report ID
+
+        self._update_output_report_length()
+
+
+    def _update_output_report_length(self):
+        """
+        Установка длины выходного отчёта по дескриптору для текущего ID отчёта
+        """
+
+        descriptor = cast(ReportDescriptor, self.report_descriptor)
+        output_size = descriptor.report_size(OUTPUT, self._send_report_id) or descriptor.max_report_size(OUTPUT)
+        if output_size and output_size + 1 != self.output_report_length:  # Если длина изменилась
+            self.output_report_length = output_size + 1  # Добавляем байт для Report ID
+            self._init_output_buffer()  # Перевыделяем буфер выходного отчёта
+
+
+    def decode_report(self, data: bytes | bytearray | memoryview, kind: str = INPUT) -> Tuple[int, ...]:
+        """
+        Декодирование полей отчёта по дескриптору отчётов
+
+        Args:
+            data (bytes | bytearray | memoryview):
+                Данные отчёта (с Report ID, если устройство использует нумерованные отчёты)
+            kind (str): Тип отчёта (`INPUT`, `OUTPUT`, `FEATURE`)
+        Returns:
+            Tuple[int, ...]: Значения всех полей отчёта
+        Raises:
+            KeyError: Если отчёт не описан в дескрипторе
+        """
+
+        descriptor = cast(ReportDescriptor, self.report_descriptor)
+        report_id = data[0] if descriptor.uses_report_ids else 0  # ID отчёта из первого байта
+
+        return self.report_decoders[(kind, report_id)].decode(data)
 
 
     @abstractmethod
@@ -264,7 +372,9 @@ class BaseHid(BaseIoInterface):
 
     def _process_input_data(self, data: bytes) -> bytes:
         """
-        Обработка входных данных, опциональное удаление ID отчета
+        Обработка входных данных, опциональное удаление ID отчета.
+        Нулевой ID удаляется, только если устройство добавляет его
+        к ненумерованным отчётам: иначе нулевой байт - это данные
 
         Args:
             data (bytes): Входные данные
@@ -272,7 +382,7 @@ class BaseHid(BaseIoInterface):
             bytes: Обработанные данные
         """
 
-        if len(data) > 0 and data[0] == 0:
+        if self._input_has_report_id is None and len(data) > 0 and data[0] == 0:
             data = data[1:]
 
         return data
@@ -292,10 +402,13 @@ class BaseHid(BaseIoInterface):
 
 
     @abstractmethod
-    def recv_hidd_report(self) -> bytes:
+    def recv_hidd_report(self, report_id: Optional[int] = None) -> bytes:
         """
         Получение данных с использованием HidD_GetInputReport
 
+        Args:
+            report_id (Optional[int]):
+                ID входного отчёта (`None` - первый входной отчёт из дескриптора)
         Returns:
             bytes: Данные полученного HID отчёта
         """
@@ -304,14 +417,325 @@ class BaseHid(BaseIoInterface):
     @abstractmethod
     def _wait_for_event(self) -> bool:
         """
-        Ожидание события от порта или внешнего события
+        Ожидание события от порта или внешнего события не дольше `timeout`
+        (`None` - бесконечное ожидание, `0` - неблокирующая проверка)
 
         Returns:
             bool:
                 - `True` - если пришёл ивент на получение данных
-                - `False` - если произошла активация внешнего ивента
+                - `False` - если произошла активация внешнего ивента,
+                  истёк таймаут или устройство отключено
+        """
+
+
+    @abstractmethod
+    def _wait_readable(self, timeout: Optional[float]) -> bool:
+        """
+        Ожидание готовности устройства к чтению
+
+        Args:
+            timeout (Optional[float]):
+                Таймаут в секундах (`None` - бесконечное ожидание)
+        Returns:
+            bool: Готово ли устройство к чтению
+        """
+
+
+    @property
+    def event(self) -> Optional[Event]:
+        """
+        Получение ивента наличия данных. В режиме фонового чтения
+        устанавливается при поступлении отчётов в очередь
+
+        Returns:
+            Optional[Event]: Ивент наличия данных
+        """
+
+        return self._event  # Возвращаем внутренний ивент
+
+
+    @event.setter
+    def event(self, event: Event):
+        """
+        Установка внешнего ивента наличия данных
+
+        Args:
+            event (Event): Внешний ивент, сбрасываемый аксессором после чтения
+        """
+
+        self._event = event  # Устанавливаем новый ивент
+        if self._reader_queue is not None:  # Очередь фонового чтения сигнализирует через новый ивент
+            self._reader_queue.event = event
+
+
+    def wakeup(self):
+        """
+        Пробуждение потока, ожидающего данные, из другого потока.
+        Ожидание `_wait_for_event` при этом возвращает `False`
+        """
+
+        self._woken = True  # Отмечаем внешнее пробуждение
+        if self._reader_queue is not None:  # В режиме фонового чтения ожидание идёт на ивенте
+            cast(Event, self._event).set()
+
+
+    def cancel_wakeup(self):
+        """
+        Отмена пробуждения, которое ожидающий поток ещё не получил
+        (например, адресованного уже остановленному потоку).
+        Следующее ожидание данных при этом не прерывается
+        """
+
+        self._woken = False
+
+
+    def call_owner(self, callback: Callable[[], Any]):
+        """
+        Выполнение вызова в потоке, владеющем дескриптором устройства
+        (реактор или ожидающий данные поток), например отключения
+        или переподключения из потока наблюдателя. Вызов может быть
+        выполнен позже, после возврата из метода
+
+        Args:
+            callback (Callable[[], Any]): Вызов
+        """
+
+        if self._reactor is not None:  # Дескриптор обслуживает поток реактора
+            self._reactor.call_soon(callback)
+        else:
+            callback()
+
+
+    def route(
+            self,
+            handler: Optional[ReportHandler] = None,
+            report_id: Optional[int] = None,
+            prefix: bytes = b"",
+            offset: int = 0,
+            crsf_type: Optional[int] = None
+        ) -> int:
+        """
+        Подписка на входные отчёты по ID отчёта, префиксу данных или типу кадра CRSF.
+        Пока есть хотя бы один маршрут, отчёты без подходящего маршрута
+        отбрасываются при приёме, до буферизации
+
+        Args:
+            handler (Optional[ReportHandler]):
+                Обработчик отчётов, вызываемый потоком приёма (`None` - передавать в буфер)
+            report_id (Optional[int]): ID отчёта (`None` - любой, `0` - ненумерованные отчёты)
+            prefix (bytes): Ожидаемые байты данных отчёта (без Report ID) начиная с `offset`
+            offset (int): Смещение префикса или начала кадра CRSF в данных отчёта
+            crsf_type (Optional[int]): Тип кадра CRSF, начинающегося со смещения `offset`
+        Returns:
+            int: Номер маршрута для `unroute`
+        """
+
+        table = self.dispatch_table
+        if table is None:
+            table = DispatchTable()
+        route = table.add(handler, report_id, prefix, offset, crsf_type)
+        self.dispatch_table = table
+
+        return route
+
+
+    def unroute(self, route: int):
+        """
+        Отмена маршрута. Без маршрутов все отчёты снова передаются в буфер
+
+        Args:
+            route (int): Номер маршрута
+        """
+
+        table = self.dispatch_table
+        if table is None:
+            return
+
+        table.remove(route)
+        if not len(table):
+            self.dispatch_table = None
+
+
+    def _accept_input(self, report: bytes | bytearray | memoryview, size: int) -> bool:
+        """
+        Маршрутизация принятого отчёта
+
+        Args:
+            report (bytes | bytearray | memoryview): Отчёт в том виде, в котором он принят
+            size (int): Размер отчёта
+        Returns:
+            bool: Следует ли передать отчёт в буфер или очередь
+        """
+
+        table = self.dispatch_table
+        if table is None:
+            return True
+
+        return table.dispatch(report, size, self._input_has_report_id is not False)
+
+
+    @property
+    def reader_queue(self) -> Optional[ReportQueue]:
+        """
+        Получение очереди фонового чтения
+
+        Returns:
+            Optional[ReportQueue]:
+                Очередь отчётов, `None` - если фоновое чтение не запущено
+        """
+
+        return self._reader_queue  # Возвращаем очередь фонового чтения
+
+
+    def start_reader(
+            self,
+            maxsize: int = REPORT_QUEUE_SIZE,
+            policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+        ) -> ReportQueue:
+        """
+        Запуск фонового потока, вычитывающего отчёты из устройства
+        в ограниченную очередь по мере их поступления
+
+        Args:
+            maxsize (int): Максимальное количество отчётов в очереди
+            policy (OverflowPolicy): Поведение очереди при переполнении
+        Returns:
+            ReportQueue: Очередь отчётов фонового чтения
         """
 
+        if self._reader_queue is None:  # Если фоновое чтение ещё не запущено
+            if self._ring is not None:
+                raise HIDDeviceError("Reports are already published to a shared ring")
+            self._reader_queue = ReportQueue(maxsize, policy, cast(Event, self._event))
+            self._start_reader_thread(self._reader_queue.put)
+
+        return self._reader_queue  # Возвращаем очередь фонового чтения
+
+
+    def start_publisher(self, slot_count: Optional[int] = None, name: Optional[str] = None) -> "SharedReportRing":
+        """
+        Запуск фонового потока, публикующего отчёты устройства в кольцо
+        в разделяемой памяти. Читатели других процессов подключаются
+        к кольцу по имени без повторного открытия устройства
+
+        Args:
+            slot_count (Optional[int]): Количество слотов кольца (`None` - `SHM_RING_SLOTS`)
+            name (Optional[str]): Имя блока разделяемой памяти (`None` - сгенерировать)
+        Returns:
+            SharedReportRing: Кольцо отчётов
+        Raises:
+            HIDDeviceError: Если уже запущено фоновое чтение в очередь
+        """
+
+        if self._ring is None:  # Если публикация ещё не запущена
+            if self._reader_queue is not None:
+                raise HIDDeviceError("Background reader is already running")
+            from hid_shm import SHM_RING_SLOTS, SharedReportRing  # pylint: disable=import-outside-toplevel
+            if slot_count is None:
+                slot_count = SHM_RING_SLOTS
+            self._ring = SharedReportRing.create(self.input_report_length, slot_count, name)
+            self._start_reader_thread(self._ring.publish)
+
+        return self._ring
+
+
+    def stop_publisher(self):
+        """
+        Остановка публикации отчётов и удаление кольца
+        """
+
+        ring = self._ring
+        if ring is None:  # Если публикация не запущена
+            return
+
+        self._stop_reader_thread()
+        self._ring = None
+        ring.close()
+
+
+    def _start_reader_thread(self, put):
+        """
+        Запуск потока фонового чтения
+
+        Args:
+            put (Callable[[bytes], Any]): Приёмник очередного отчёта
+        """
+
+        self._reader_running = True
+        self._reader_thread = Thread(target=self._reader_loop, args=(put,), name="HidReader", daemon=True)
+        self._reader_thread.start()
+
+
+    def _stop_reader_thread(self):
+        """
+        Остановка потока фонового чтения
+        """
+
+        self._reader_running = False  # Сообщаем потоку о завершении
+        if self._reader_thread is not None:
+            self._reader_thread.join()
+            self._reader_thread = None
+
+
+    def stop_reader(self):
+        """
+        Остановка фонового потока чтения.
+        Непрочитанные отчёты переносятся во внутренний буфер
+        """
+
+        queue = self._reader_queue
+        if queue is None:  # Если фоновое чтение не запущено
+            return
+
+        self._reader_running = False  # Сообщаем потоку о завершении
+        queue.close()  # Пробуждаем поток, если он ожидает места в очереди
+        self._stop_reader_thread()
+
+        self._reader_queue = None
+        for report in queue.drain():  # Сохраняем непрочитанные отчёты
+            self.buffer.append(report)
+
+
+    def _reader_loop(self, put):
+        """
+        Цикл потока фонового чтения
+
+        Args:
+            put (Callable[[bytes], Any]): Приёмник очередного отчёта (очередь или кольцо)
+        """
+
+        while self._reader_running:
+            try:
+                data = self.recv_report()  # Читаем очередной отчёт
+            except (OSError, TypeError):  # Устройство закрыто или отключено
+                data = b""
+            if data:
+                if self._on_input(data):
+                    put(data)  # Кладём отчёт в очередь согласно политике переполнения или в кольцо
+            else:
+                if self.metrics is not None:
+                    self.metrics.record_input(0, 0)
+                self._wait_readable(0.1)  # Ждём новых отчётов, периодически проверяя флаг
+
+
+    def _on_input(self, report: bytes) -> bool:
+        """
+        Учёт отчёта, принятого потоком фонового чтения или реактором:
+        счётчики, журнал и маршрутизация
+
+        Args:
+            report (bytes): Принятый отчёт
+        Returns:
+            bool: Следует ли передать отчёт потребителю (очередь, кольцо, обработчик реактора)
+        """
+
+        if self.metrics is not None:
+            self.metrics.record_input(1, len(report))
+        if self._capture is not None:
+            self._capture_input(report)
+
+        return self._accept_input(report, len(report))
+
 
     def receive(self) -> bytes:
         """
@@ -322,13 +746,20 @@ class BaseHid(BaseIoInterface):
             bytes: Данные в виде байт
         """
 
-        if len(self.buffer) == 0:
-            return b""
+        return self.buffer.consume()  # Извлекаем все данные, очищая буфер
 
-        data = bytes(self.buffer)
-        self.buffer = b""  # Очистка буфера после чтения
 
-        return data
+    def peek(self) -> memoryview:
+        """
+        Получение представления всех данных буфера без копирования
+        и без удаления их из буфера. Представление действительно
+        до следующего чтения или приёма данных
+
+        Returns:
+            memoryview: Представление данных буфера
+        """
+
+        return self.buffer.view()  # Возвращаем представление данных буфера
 
 
     def _is_report(self) -> bool:
@@ -348,11 +779,103 @@ class BaseHid(BaseIoInterface):
         Чтение всех полученных данных во внутренний буфер
         """
 
+        # В режиме фонового чтения забираем отчёты из очереди (они уже прошли маршрутизацию),
+        # иначе - напрямую из устройства:
+        from_queue = self._reader_queue is not None
+        recv_report = self._reader_queue.get_nowait if from_queue else self.recv_report
+
         while True:  # Пока отчёты есть в буфере
-            data = self.recv_report()  # Читаем данные отчётов
+            data = recv_report()  # Читаем данные отчётов
             if not data:  # Если отчёты в буфере закончились
                 break  # Выходим из цикла
-            self.buffer += data  # Добавляем данные в буфер
+            if from_queue or self._accept_input(data, len(data)):
+                self.buffer.append(data)  # Добавляем данные в буфер
+
+
+    def _recv_report_into(self, slot: memoryview) -> int:
+        """
+        Неблокирующий приём одного отчёта в слот арены
+
+        Args:
+            slot (memoryview): Слот размером `input_report_length`
+        Returns:
+            int: Длина принятого отчёта (`0` - отчётов нет)
+        """
+
+        data = self.recv_report()
+        size = len(data)
+        slot[:size] = data
+
+        return size
+
+
+    def recv_reports(self, max_n: int = RECV_BATCH_SIZE) -> List[InputReport]:
+        """
+        Пакетный приём отчётов с сохранением их границ и моментов приёма.
+        Отчёты принимаются прямо в арену без промежуточных копий; если отчётов нет,
+        ожидание длится не дольше `timeout`. Представления данных действительны,
+        пока не приняты следующие `RECV_ARENA_COUNT - 1` пакетов.
+        Не сочетается с фоновым чтением и потоковым чтением (`read`, `receive`)
+
+        Args:
+            max_n (int): Наибольшее количество отчётов в пакете
+        Returns:
+            List[InputReport]: Принятые отчёты, пустой список - если отчётов нет
+        Raises:
+            HIDDeviceError: Если отчёты забирает фоновый поток
+        """
+
+        if self._reader_queue is not None or self._ring is not None:
+            raise HIDDeviceError("Reports are consumed by the background reader")
+
+        reports = self._recv_batch(max_n)
+        if not reports and self.timeout != 0 and self._wait_readable(self.timeout):
+            reports = self._recv_batch(max_n)
+
+        return reports
+
+
+    def _recv_batch(self, max_n: int) -> List[InputReport]:
+        """
+        Неблокирующий приём доступных отчётов в очередную арену
+
+        Args:
+            max_n (int): Наибольшее количество отчётов в пакете
+        Returns:
+            List[InputReport]: Принятые отчёты
+        """
+
+        size = self.input_report_length
+        arena = self._recv_arena.acquire(size, max_n)
+        has_report_id = self._input_has_report_id is not False
+        recv_report_into = self._recv_report_into
+        reports: List[InputReport] = []
+        reports_count = 0
+        bytes_count = 0
+        offset = 0
+
+        for _ in range(max_n):
+            slot = arena[offset:offset + size]
+            received = recv_report_into(slot)
+            if not received:
+                break
+            reports_count += 1
+            timestamp = monotonic_ns()
+            if self._capture is not None:
+                self._capture_input(slot[:received])
+            bytes_count += received
+            if not self._accept_input(slot, received):  # Слот отброшенного отчёта используется повторно
+                continue
+            if has_report_id:  # Первый байт - ID отчёта
+                reports.append(InputReport(timestamp, slot[0], slot[1:received]))
+            else:
+                reports.append(InputReport(timestamp, 0, slot[:received]))
+            offset += size
+
+        if self.metrics is not None:
+            self.metrics.record_input(reports_count, bytes_count)
+
+        return reports
 
 
     @property
@@ -379,59 +902,240 @@ class BaseHid(BaseIoInterface):
             bytes: Прочитанные данные в виде байтов
         """
 
-        data = self.buffer[:size]  # Чтение данных из буфера
-        self.buffer = self.buffer[size:]  # Удаление прочитанных данных
+        return self.buffer.consume(size)  # Извлекаем данные из буфера
 
-        return bytes(data)  # Возвращаем прочитанные данные
 
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """
+        Неблокирующее чтение доступных данных в переданный буфер
+        без создания промежуточных объектов
+
+        Args:
+            buffer (bytearray | memoryview): Буфер для записи данных
+        Returns:
+            int: Количество записанных байт
+        """
 
-    def _prepare_output_buffer(self, data: bytes) -> bytes:
+        if len(self.buffer) < len(buffer):  # Если данных в буфере недостаточно - принимаем новые
+            self._receive()
+
+        return self.buffer.consume_into(buffer)  # Копируем данные напрямую в буфер вызывающего
+
+
+    def _init_output_buffer(self):
+        """
+        Выделение переиспользуемого буфера выходного отчёта
+        под текущую длину `output_report_length`
         """
-        Подготовка выходного буфера с правильной длиной
+
+        self._output_report = bytearray(self.output_report_length)  # Буфер отчёта вместе с Report ID
+        self._output_view = memoryview(self._output_report)  # Представление буфера без копирования
+        self._output_padding = memoryview(bytes(self.output_report_length))  # Нули для дополнения отчёта
+
+
+    def _prepare_output_buffer(self, data: memoryview) -> memoryview:
+        """
+        Заполнение переиспользуемого выходного буфера: ID отчёта,
+        данные и дополнение нулями до длины отчёта
 
         Args:
-            data (bytes): Исходные данные
+            data (memoryview):
+                Данные отчёта (len(data) < output_report_length)
         Returns:
-            bytes: Подготовленный буфер
+            memoryview: Представление заполненного буфера отчёта
         """
 
-        return self._send_report_id_byte + data + b'\x00' * (self.output_report_length - len(data))
+        report = self._output_view
+        size = len(data) + 1  # Длина данных вместе с Report ID
+        report[0] = self._send_report_id  # Записываем ID отчёта
+        report[1:size] = data  # Копируем данные напрямую из исходного буфера
+        if size < len(report):  # Если данных меньше длины отчёта - дополняем нулями
+            report[size:] = self._output_padding[size:len(report)]
+
+        return report
 
 
     @abstractmethod
-    def _write_report(self, data: bytes):
+    def _write_report(self, data: memoryview) -> int:
         """
         Запись с использованием WriteFile с OVERLAPPED
 
         Args:
-            data (bytes):
-                Данные для записи (len(data) <= размеру отчёта)
+            data (memoryview):
+                Полный отчёт для записи вместе с Report ID
+        Returns:
+            int:
+                Количество записанных байт (`0` - отчёт не принят,
+                `REPORT_QUEUED` - отчёт поставлен в очередь отправки)
         """
 
 
     @abstractmethod
-    def _write_hidd_report(self, data: bytes):
+    def _write_hidd_report(self, data: memoryview) -> int:
         """
         Запись с использованием HidD_SetOutputReport
 
         Args:
-            data (bytes):
-                Данные для записи (len(data) <= размеру отчёта)
+            data (memoryview):
+                Полный отчёт для записи вместе с Report ID
+        Returns:
+            int:
+                Количество записанных байт (`0` - отчёт не принят,
+                отрицательное - отчёт поставлен в очередь отправки, по модулю - его длина)
+        """
+
+
+    def write(self, data: bytes | bytearray | memoryview) -> WriteResult:
+        """
+        Запись данных в HID устройство.
+        Данные разбиваются на отчёты, каждый из которых заполняется
+        в переиспользуемом буфере без промежуточных копий
+
+        Args:
+            data (bytes | bytearray | memoryview): Данные для записи
+        Returns:
+            WriteResult:
+                Количество принятых отчётов и байт данных и количество отчётов,
+                ждущих в очереди отправки. Запись прекращается на первом не принятом отчёте
+        """
+
+        source = memoryview(data)  # Представление исходных данных без копирования
+        report_length = self.output_report_length
+        payload_size = report_length - 1  # Размер данных в одном отчёте
+        metrics = self.metrics
+        reports_count = 0
+        bytes_count = 0
+        queued_count = 0
+
+        for report_start in range(0, len(source), payload_size):  # Разбиваем на отдельные отчёты
+            chunk = source[report_start: report_start + payload_size]  # Данные очередного отчёта
+            report = self._prepare_output_buffer(chunk)
+            written = self._write_report(report)
+            if not written:  # Если отчёт не принят
+                if metrics is not None:
+                    metrics.write_errors += 1
+                break
+            if written == REPORT_QUEUED:  # Устройство занято: отчёт ждёт в очереди отправки
+                queued_count += 1
+                written = report_length
+            elif written < report_length and metrics is not None:  # Отчёт принят не полностью
+                metrics.short_writes += 1
+            if self._capture is not None:
+                self._capture.append(CAPTURE_OUTPUT, self._send_report_id, report[:written])
+            reports_count += 1
+            bytes_count += len(chunk)
+
+        if metrics is not None and reports_count:
+            metrics.reports_out += reports_count
+            metrics.bytes_out += bytes_count
+            # Задержка запись-ответ отсчитывается от первой записи без ответа, если собираются гистограммы
+            if metrics.histograms and metrics.last_write_ns is None:
+                metrics.last_write_ns = monotonic_ns()
+
+        return WriteResult(reports_count, bytes_count, queued_count)
+
+
+    def write_report(self, report: bytes | bytearray | memoryview) -> WriteResult:
+        """
+        Запись готового отчёта без копирования в выходной буфер.
+        Используется для отчётов, которые заполняются на месте
+        и отправляются многократно (например, периодически)
+
+        Args:
+            report (bytes | bytearray | memoryview): Полный отчёт, первым байтом - Report ID
+        Returns:
+            WriteResult:
+                Принят ли отчёт, количество принятых байт данных (без Report ID)
+                и поставлен ли отчёт в очередь отправки
+        """
+
+        metrics = self.metrics
+        written = self._write_report(report)
+        if not written:  # Если отчёт не принят
+            if metrics is not None:
+                metrics.write_errors += 1
+            return WriteResult(0, 0)
+
+        queued = written == REPORT_QUEUED
+        accepted = len(report) if queued else written  # Отчёт из очереди уйдёт целиком
+        if self._capture is not None:
+            self._capture.append(CAPTURE_OUTPUT, report[0], report[:accepted])
+        if metrics is not None:
+            if accepted < len(report):  # Отчёт принят не полностью
+                metrics.short_writes += 1
+            metrics.reports_out += 1
+            metrics.bytes_out += accepted - 1
+            # Задержка запись-ответ отсчитывается от первой записи без ответа, если собираются гистограммы
+            if metrics.histograms and metrics.last_write_ns is None:
+                metrics.last_write_ns = monotonic_ns()
+
+        return WriteResult(1, accepted - 1, 1 if queued else 0)
+
+
+    def start_capture(self, path: str, initial_size: int = CAPTURE_INITIAL_SIZE) -> CaptureWriter:
+        """
+        Запуск записи принимаемых и отправляемых отчётов в журнал
+
+        Args:
+            path (str): Путь до файла журнала (перезаписывается)
+            initial_size (int): Начальный размер файла журнала
+        Returns:
+            CaptureWriter: Журнал отчётов
         """
 
+        self.stop_capture()  # Завершаем предыдущую запись, если была
+        self._capture = CaptureWriter(path, initial_size)
+
+        return self._capture
+
 
-    def write(self, data: bytes):
+    def stop_capture(self):
         """
-        Запись данных в HID устройство
-        (неблокирующее через OVERLAPPED + wait)
+        Остановка записи отчётов и закрытие журнала
+        """
+
+        capture = self._capture
+        if capture is not None:
+            self._capture = None  # Сначала отключаем запись на горячих путях
+            capture.close()
+
+
+    def _capture_input(self, report: bytes | bytearray | memoryview):
+        """
+        Запись входного отчёта в журнал
 
         Args:
-            data (bytes): Данные для записи
+            report (bytes | bytearray | memoryview): Отчёт в том виде, в котором он принят
         """
 
-        for i in range(ceil(len(data) / self.output_report_length)):  # Разбиваем на отдельный отчёты
-            report_start = i * self.output_report_length  # Индекс начала нового отчёта
-            self._write_report(data[report_start: report_start + self.output_report_length])  # Записываем отчёт на HID
+        capture = self._capture
+        if capture is None:
+            return
+        # ID отчёта берётся так же, как при маршрутизации, чтобы воспроизведение приняло отчёты в том же виде
+        report_id = report[0] if report and self._input_has_report_id is not False else 0
+        capture.append(CAPTURE_INPUT, report_id, report)
+
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок счётчиков и гистограмм задержек устройства
+
+        Returns:
+            Dict[str, Any]:
+                Значения счётчиков и гистограмм, пустой словарь - если сбор выключен.
+                В режиме фонового чтения отброшенные отчёты учитываются по очереди
+        """
+
+        if self.metrics is None:
+            return {}
+
+        snapshot = self.metrics.snapshot()
+        if self._reader_queue is not None:  # Отчёты отбрасывает очередь фонового чтения
+            snapshot["dropped_reports"] += self._reader_queue.dropped_count
+        if self.dispatch_table is not None:  # Отчёты без подходящего маршрута отбрасываются при приёме
+            snapshot["dispatch"] = self.dispatch_table.stats()
+
+        return snapshot
 
 
     @abstractmethod
@@ -1,7 +1,7 @@
 from abc import abstractmethod
 from typing import Any, Optional
 from base.specialized import BaseSpecializedHandler
-from threading import Thread as Event
+from threading import Event
 
 
 class BaseIoInterface(BaseSpecializedHandler):
@@ -18,7 +18,7 @@ class BaseIoInterface(BaseSpecializedHandler):
     def __init__(self, *args: Any, **kwargs: Any):
         self.is_open = False  # Интерфейс пока не открыт
 
-        self._event: Optional[Event]  # Указываем аннотацию типа для ивента
+        self._event: Optional[Event] = Event()  # Ивент наличия данных для пробуждения аксессора
 
         self._timeout = None  # Таймаут пока не установлен
 
@@ -54,10 +54,10 @@ class BaseIoInterface(BaseSpecializedHandler):
     def event(self, event: Event):
         """
         Установка внешнего ивента для пробуждения процесса
-        из другого процесса
+        из другого потока
 
         Args:
-            event (Event): Внешний ивент с автоматическим сбросом
+            event (Event): Внешний ивент, сбрасываемый аксессором после чтения
         """
 
 
@@ -0,0 +1,69 @@
+"""
+Сравнение пропускной способности буфера приёма:
+конкатенация `bytes` против `ReportBuffer` при большом
+количестве накопленных отчётов
+"""
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hid_buffer import ReportBuffer  # pylint: disable=wrong-import-position
+
+REPORT_SIZE = 64  # Размер одного отчёта
+REPORTS_COUNT = 20_000  # Количество накопленных отчётов
+READ_SIZE = 64  # Размер одного чтения
+
+
+def bench_bytes(report: bytes) -> float:
+    """
+    Прежняя реализация: `buffer += data` и `buffer = buffer[size:]`
+
+    Args:
+        report (bytes): Данные одного отчёта
+    Returns:
+        float: Время выполнения в секундах
+    """
+
+    start = perf_counter()
+    buffer = b""
+    for _ in range(REPORTS_COUNT):  # Накапливаем отчёты
+        buffer += report
+    while buffer:  # Вычитываем накопленное
+        _ = buffer[:READ_SIZE]
+        buffer = buffer[READ_SIZE:]
+
+    return perf_counter() - start
+
+
+def bench_ring(report: bytes) -> float:
+    """
+    Реализация на `ReportBuffer`
+
+    Args:
+        report (bytes): Данные одного отчёта
+    Returns:
+        float: Время выполнения в секундах
+    """
+
+    start = perf_counter()
+    buffer = ReportBuffer()
+    for _ in range(REPORTS_COUNT):  # Накапливаем отчёты
+        buffer.append(report)
+    while len(buffer):  # Вычитываем накопленное
+        buffer.consume(READ_SIZE)
+
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    report = bytes(range(REPORT_SIZE))
+    total_bytes = REPORT_SIZE * REPORTS_COUNT
+    for name, bench in (("bytes", bench_bytes), ("ReportBuffer", bench_ring)):
+        elapsed = bench(report)
+        print(
+            f"{name:>12}: {REPORTS_COUNT} reports in {elapsed * 1000:.1f} ms, "
+            f"{REPORTS_COUNT / elapsed:,.0f} reports/s, {total_bytes / elapsed / 1e6:.1f} MB/s"
+        )
@@ -0,0 +1,101 @@
+"""
+Пропускная способность разбора кадров CRSF (кадров в секунду)
+на синтетическом потоке: потоковый разбор из буфера приёма
+и пакетный разбор записанного журнала через NumPy
+"""
+
+import os
+import random
+import struct
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crsf import (  # pylint: disable=wrong-import-position
+    CRSF_ADDRESS_FLIGHT_CONTROLLER, CRSF_FRAMETYPE_DEVICE_INFO, CRSF_FRAMETYPE_LINK_STATISTICS,
+    CRSF_FRAMETYPE_RC_CHANNELS_PACKED, CrsfParser, build_extended_frame, build_frame
+)
+from hid_buffer import ReportBuffer  # pylint: disable=wrong-import-position
+
+FRAMES_COUNT = 100_000  # Количество кадров в синтетическом потоке
+CHUNK_SIZE = 64  # Размер порции данных, поступающей в буфер приёма (один отчёт HID)
+
+
+def make_stream(frames_count: int, corrupt_ratio: float = 0.0) -> bytes:
+    """
+    Генерация синтетического потока кадров
+
+    Args:
+        frames_count (int): Количество кадров
+        corrupt_ratio (float): Доля кадров с испорченным CRC
+    Returns:
+        bytes: Поток кадров
+    """
+
+    rng = random.Random(1)
+    channels = build_frame(CRSF_FRAMETYPE_RC_CHANNELS_PACKED, bytes(rng.randrange(256) for _ in range(22)), CRSF_ADDRESS_FLIGHT_CONTROLLER)
+    statistics = build_frame(CRSF_FRAMETYPE_LINK_STATISTICS, bytes(range(10)), CRSF_ADDRESS_FLIGHT_CONTROLLER)
+    info = build_extended_frame(CRSF_FRAMETYPE_DEVICE_INFO, 0xEA, 0xEE, b"TBS CROSSFIRE\0" + struct.pack(">IIIBB", 1, 2, 3, 4, 0))
+    templates = (channels, channels, channels, statistics, info)
+
+    stream = bytearray()
+    for _ in range(frames_count):
+        frame = bytearray(rng.choice(templates))
+        if corrupt_ratio and rng.random() < corrupt_ratio:
+            frame[-1] ^= 0xFF
+        stream += frame
+
+    return bytes(stream)
+
+
+def bench_streaming(stream: bytes) -> float:
+    """
+    Потоковый разбор: данные поступают порциями в буфер приёма
+
+    Args:
+        stream (bytes): Поток кадров
+    Returns:
+        float: Время выполнения в секундах
+    """
+
+    parser = CrsfParser()
+    buffer = ReportBuffer()
+    view = memoryview(stream)
+    start = perf_counter()
+    for offset in range(0, len(stream), CHUNK_SIZE):
+        buffer.append(view[offset:offset + CHUNK_SIZE])
+        parser.feed_from(buffer)
+
+    return perf_counter() - start
+
+
+def bench_batch(stream: bytes) -> float:
+    """
+    Пакетный разбор журнала с векторизованной проверкой CRC
+
+    Args:
+        stream (bytes): Поток кадров
+    Returns:
+        float: Время выполнения в секундах
+    """
+
+    parser = CrsfParser()
+    start = perf_counter()
+    parser.parse_batch(stream)
+
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    stream = make_stream(FRAMES_COUNT)
+    benches = [("streaming", bench_streaming)]
+    try:
+        import numpy  # pylint: disable=unused-import,import-outside-toplevel
+        benches.append(("numpy batch", bench_batch))
+    except ImportError:
+        print("numpy is not installed, skipping batch mode")
+
+    for name, bench in benches:
+        elapsed = bench(stream)
+        print(f"{name:>12}: {FRAMES_COUNT / elapsed:,.0f} frames/s, {len(stream) / elapsed / 1e6:.1f} MB/s")
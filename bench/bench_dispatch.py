@@ -0,0 +1,95 @@
+"""
+Приём потока, в котором нужна лишь малая доля отчётов:
+буферизация всех отчётов с фильтрацией потребителем
+против маршрутизации по ID отчёта при приёме (`BaseHid.route`)
+"""
+
+import os
+import sys
+from time import perf_counter_ns, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_hid import open_device  # pylint: disable=wrong-import-position
+
+REPORTS_COUNT = 2_000  # Количество отчётов в одном измерении (помещается в буфер сокета устройства)
+WANTED_RATIO = 10  # Нужен каждый N-й отчёт
+WANTED_ID = 2  # ID нужных отчётов
+TELEMETRY_ID = 1  # ID ненужной телеметрии
+ROUNDS_COUNT = 5  # Количество измерений
+
+
+def fill(device) -> None:
+    """
+    Отправка отчётов через loopback фиктивного устройства
+
+    Args:
+        device (FakeHid): Устройство
+    """
+
+    payload = bytes(device.output_report_length - 1)
+    for index in range(REPORTS_COUNT):
+        device.set_report_id(WANTED_ID if index % WANTED_RATIO == 0 else TELEMETRY_ID)
+        device.write(payload)
+    sleep(0.05)  # Поток устройства возвращает отчёты
+
+
+def bench_buffer() -> tuple:
+    """
+    Все отчёты попадают в буфер, потребитель отбирает нужные
+
+    Returns:
+        tuple: Лучшее время в мс, количество нужных отчётов и байт в буфере
+    """
+
+    device = open_device(loopback=True)
+    size = device.input_report_length
+    best = None
+    try:
+        for _ in range(ROUNDS_COUNT):
+            fill(device)
+            started = perf_counter_ns()
+            device._receive()  # pylint: disable=protected-access
+            buffered = device.in_waiting
+            data = device.receive()
+            wanted = [data[index:index + size] for index in range(0, len(data), size) if data[index] == WANTED_ID]
+            elapsed = perf_counter_ns() - started
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        device.close()
+
+    return best / 1e6, len(wanted), buffered
+
+
+def bench_route() -> tuple:
+    """
+    Нужные отчёты передаются обработчику при приёме, остальные отбрасываются
+
+    Returns:
+        tuple: Лучшее время в мс, количество нужных отчётов и байт в буфере
+    """
+
+    device = open_device(loopback=True)
+    best = None
+    wanted = []
+    device.route(lambda report: wanted.append(bytes(report)), report_id=WANTED_ID)
+    try:
+        for _ in range(ROUNDS_COUNT):
+            fill(device)
+            wanted.clear()
+            started = perf_counter_ns()
+            device._receive()  # pylint: disable=protected-access
+            elapsed = perf_counter_ns() - started
+            best = elapsed if best is None else min(best, elapsed)
+            buffered = device.in_waiting
+    finally:
+        device.close()
+
+    return best / 1e6, len(wanted), buffered
+
+
+if __name__ == "__main__":
+    for name, bench in (("buffer+filter", bench_buffer), ("route", bench_route)):
+        elapsed, count, buffered = bench()
+        print(f"{name:<14} {REPORTS_COUNT} reports, {count} wanted: {elapsed:7.2f} ms, buffered {buffered:7} bytes")
@@ -0,0 +1,136 @@
+"""
+Измерение количества системных вызовов и выделений памяти
+при приёме пачки отчётов: одно чтение на пробуждение epoll
+против вычитывания всех отчётов до EAGAIN в буфер приёма
+"""
+
+import os
+import socket
+import sys
+import tracemalloc
+from select import epoll, EPOLLIN
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import HID  # pylint: disable=wrong-import-position
+from HID import Hid  # pylint: disable=wrong-import-position
+
+REPORT_SIZE = 65  # Размер отчёта вместе с Report ID
+BURST_SIZE = 100  # Количество отчётов в одной пачке
+BURSTS_COUNT = 50  # Количество пачек
+
+
+class CountingOs:
+    """
+    Обёртка модуля `os`, подсчитывающая вызовы чтения
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(os, name)
+
+    def read(self, fd, size):
+        self.calls += 1
+        return os.read(fd, size)
+
+    def readv(self, fd, buffers):
+        self.calls += 1
+        return os.readv(fd, buffers)
+
+
+class CountingEpoll:
+    """
+    Обёртка epoll, подсчитывающая вызовы ожидания
+    """
+
+    def __init__(self, poller):
+        self.poller = poller
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self.poller, name)
+
+    def poll(self, *args):
+        self.calls += 1
+        return self.poller.poll(*args)
+
+
+def send_burst(peer: socket.socket, report: bytes):
+    for _ in range(BURST_SIZE):
+        peer.send(report)
+
+
+def bench_single_read(device: socket.socket, peer: socket.socket, report: bytes):
+    """
+    Прежний путь: `epoll.poll` + один `os.read` на пробуждение
+    """
+
+    counting_os = CountingOs()
+    poller = CountingEpoll(epoll())
+    poller.register(device.fileno(), EPOLLIN)
+    received = []
+
+    tracemalloc.start()
+    for _ in range(BURSTS_COUNT):
+        send_burst(peer, report)
+        for _ in range(BURST_SIZE):
+            for fd, _event in poller.poll(1.0):
+                received.append(counting_os.read(fd, REPORT_SIZE))
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+    poller.close()
+
+    return poller.calls, counting_os.calls, blocks, peak
+
+
+def bench_drain(device: socket.socket, peer: socket.socket, report: bytes):
+    """
+    Новый путь: пробуждение ожидающего потока (`_wait_for_event` на epoll из `_get_epoll`),
+    `os.readv` до EAGAIN в буфер приёма и `readinto`
+    """
+
+    counting_os = CountingOs()
+    HID.os = counting_os
+    hid = Hid("/bench")
+    hid.fd = device.fileno()
+    hid.timeout = 1.0
+    hid.epoll = CountingEpoll(hid._get_epoll())  # pylint: disable=protected-access
+    target = bytearray(REPORT_SIZE * BURST_SIZE)
+
+    tracemalloc.start()
+    for _ in range(BURSTS_COUNT):
+        send_burst(peer, report)
+        # Путь блокирующего `read`, когда буфер пуст: одно пробуждение вычитывает всю пачку
+        if not hid._wait_for_event():  # pylint: disable=protected-access
+            raise RuntimeError("No wakeup for a pending burst")
+        hid.readinto(target)  # Пачку забираем без создания объектов
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+    HID.os = os
+
+    polls = hid.epoll.calls
+    hid.epoll = hid.epoll.poller
+    hid.fd = None  # Дескриптор принадлежит сокету
+    hid.close()
+
+    return polls, counting_os.calls, blocks, peak
+
+
+if __name__ == "__main__":
+    report = bytes(REPORT_SIZE)
+    total = BURST_SIZE * BURSTS_COUNT
+    for name, bench in (("poll+read", bench_single_read), ("drain+readv", bench_drain)):
+        device, peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        device.setblocking(False)
+        peer.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        polls, reads, blocks, peak = bench(device, peer, report)
+        print(
+            f"{name:>12}: {total} reports, {polls} epoll.poll, {reads} read syscalls "
+            f"(incl. EAGAIN), {blocks} live allocations, peak {peak / 1024:.1f} KiB"
+        )
+        device.close()
+        peer.close()
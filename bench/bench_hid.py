@@ -0,0 +1,273 @@
+"""
+Набор измерений пропускной способности и задержек HID аксессора
+на фиктивном устройстве `FakeHid`: отчётов и байт в секунду,
+p50/p99 задержки приёма и выделения памяти для `write`, `read`,
+`receive` и `in_waiting`
+"""
+
+import os
+import sys
+import tracemalloc
+from statistics import quantiles
+from time import monotonic_ns, perf_counter
+from typing import Callable, List, NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hid_fake import REPORT_HEADER, FakeHid  # pylint: disable=wrong-import-position
+
+REPORT_SIZE = 64  # Размер полезной нагрузки отчёта
+REPORTS_COUNT = 20_000  # Количество отчётов в одном измерении
+INPUT_RATE = 20_000  # Частота генерации входных отчётов в секунду
+INPUT_BURST = 10  # Размер пачки входных отчётов
+ALLOCATION_REPORTS_COUNT = 2_000  # Количество отчётов при подсчёте выделений памяти
+
+
+class BenchResult(NamedTuple):
+    """
+    Результат одного измерения
+
+    Attributes:
+        reports_per_second (float): Отчётов в секунду
+        bytes_per_second (float): Байт в секунду
+        latencies_ns (List[int]): Задержки приёма отчётов, нс
+    """
+
+    reports_per_second: float
+    bytes_per_second: float
+    latencies_ns: List[int]
+
+
+def _latency(report: memoryview, now: int) -> int:
+    """
+    Задержка отчёта от момента отправки устройством
+
+    Args:
+        report (memoryview): Отчёт вместе с Report ID
+        now (int): Момент приёма (monotonic, нс)
+    Returns:
+        int: Задержка, нс
+    """
+
+    return now - REPORT_HEADER.unpack_from(report, 1)[1]
+
+
+def bench_write(device: FakeHid, count: int) -> BenchResult:
+    """
+    Запись отчётов по одному: `write` на каждый отчёт
+
+    Args:
+        device (FakeHid): Открытое устройство без loopback
+        count (int): Количество отчётов
+    Returns:
+        BenchResult: Результат измерения
+    """
+
+    payload = bytes(REPORT_SIZE)
+    latencies = []
+    start = perf_counter()
+    for _ in range(count):
+        begin = monotonic_ns()
+        device.write(payload)
+        latencies.append(monotonic_ns() - begin)
+    elapsed = perf_counter() - start
+
+    return BenchResult(count / elapsed, count * REPORT_SIZE / elapsed, latencies)
+
+
+def bench_read(device: FakeHid, count: int) -> BenchResult:
+    """
+    Чтение входных отчётов по одному: блокирующий `read` на каждый отчёт
+
+    Args:
+        device (FakeHid): Открытое устройство, генерирующее отчёты
+        count (int): Количество отчётов
+    Returns:
+        BenchResult: Результат измерения
+    """
+
+    size = device.input_report_length
+    latencies = []
+    start = perf_counter()
+    while len(latencies) < count:
+        report = device.read(size)
+        if len(report) == size:
+            latencies.append(_latency(memoryview(report), monotonic_ns()))
+    elapsed = perf_counter() - start
+
+    return BenchResult(count / elapsed, count * size / elapsed, latencies)
+
+
+def bench_receive(device: FakeHid, count: int) -> BenchResult:
+    """
+    Опрос `in_waiting` и получение всех накопленных данных через `receive`
+
+    Args:
+        device (FakeHid): Открытое устройство, генерирующее отчёты
+        count (int): Количество отчётов
+    Returns:
+        BenchResult: Результат измерения
+    """
+
+    size = device.input_report_length
+    latencies = []
+    start = perf_counter()
+    while len(latencies) < count:
+        if device.in_waiting < size:
+            continue
+        now = monotonic_ns()
+        data = memoryview(device.receive())
+        for offset in range(0, len(data) - size + 1, size):
+            latencies.append(_latency(data[offset:offset + size], now))
+    elapsed = perf_counter() - start
+
+    return BenchResult(len(latencies) / elapsed, len(latencies) * size / elapsed, latencies)
+
+
+def bench_recv_reports(device: FakeHid, count: int) -> BenchResult:
+    """
+    Пакетный приём отчётов через `recv_reports` с моментом приёма каждого отчёта
+
+    Args:
+        device (FakeHid): Открытое устройство, генерирующее отчёты
+        count (int): Количество отчётов
+    Returns:
+        BenchResult: Результат измерения
+    """
+
+    size = device.input_report_length
+    latencies = []
+    start = perf_counter()
+    while len(latencies) < count:
+        for report in device.recv_reports():
+            _sequence, sent = REPORT_HEADER.unpack_from(report.payload, 0)
+            latencies.append(report.timestamp - sent)
+    elapsed = perf_counter() - start
+
+    return BenchResult(len(latencies) / elapsed, len(latencies) * size / elapsed, latencies)
+
+
+def bench_in_waiting(device: FakeHid, count: int) -> BenchResult:
+    """
+    Стоимость опроса `in_waiting` при отсутствии новых данных
+
+    Args:
+        device (FakeHid): Открытое устройство без генерации отчётов
+        count (int): Количество опросов
+    Returns:
+        BenchResult: Результат измерения (отчёт - один опрос)
+    """
+
+    latencies = []
+    start = perf_counter()
+    for _ in range(count):
+        begin = monotonic_ns()
+        _ = device.in_waiting
+        latencies.append(monotonic_ns() - begin)
+    elapsed = perf_counter() - start
+
+    return BenchResult(count / elapsed, 0.0, latencies)
+
+
+def bench_loopback(device: FakeHid, count: int) -> BenchResult:
+    """
+    Время приёма-передачи: `write` отчёта и `read` его копии от устройства
+
+    Args:
+        device (FakeHid): Открытое устройство с loopback
+        count (int): Количество отчётов
+    Returns:
+        BenchResult: Результат измерения
+    """
+
+    size = device.output_report_length
+    payload = bytearray(REPORT_SIZE)
+    latencies = []
+    start = perf_counter()
+    for sequence in range(count):
+        REPORT_HEADER.pack_into(payload, 0, sequence, monotonic_ns())
+        device.write(payload)
+        report = b""
+        while len(report) < size:
+            report += device.read(size - len(report))
+        latencies.append(_latency(memoryview(report), monotonic_ns()))
+    elapsed = perf_counter() - start
+
+    return BenchResult(count / elapsed, count * size / elapsed, latencies)
+
+
+def count_allocations(bench: Callable[[FakeHid, int], BenchResult], device: FakeHid) -> tuple:
+    """
+    Подсчёт выделений памяти во время измерения
+
+    Args:
+        bench (Callable[[FakeHid, int], BenchResult]): Функция измерения
+        device (FakeHid): Открытое устройство
+    Returns:
+        tuple: Количество живых выделений после измерения и пиковый объём в байтах
+    """
+
+    tracemalloc.start()
+    bench(device, ALLOCATION_REPORTS_COUNT)
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+
+    return blocks, peak
+
+
+def open_device(rate: float = 0.0, loopback: bool = False) -> FakeHid:
+    """
+    Открытие фиктивного устройства для измерения
+
+    Args:
+        rate (float): Частота генерации входных отчётов
+        loopback (bool): Возвращать ли выходные отчёты
+    Returns:
+        FakeHid: Открытое устройство
+    """
+
+    device = FakeHid(REPORT_SIZE, rate, INPUT_BURST, loopback)
+    device.run()
+    device.timeout = 1.0
+
+    return device
+
+
+def format_latency(latencies: List[int]) -> str:
+    """
+    Форматирование p50/p99 задержки
+
+    Args:
+        latencies (List[int]): Задержки, нс
+    Returns:
+        str: Строка с p50/p99 в микросекундах
+    """
+
+    percentiles = quantiles(latencies, n=100)
+
+    return f"p50 {percentiles[49] / 1000:8.1f} us, p99 {percentiles[98] / 1000:8.1f} us"
+
+
+if __name__ == "__main__":
+    benches = (
+        ("write", bench_write, 0.0, False),
+        ("read", bench_read, INPUT_RATE, False),
+        ("receive", bench_receive, INPUT_RATE, False),
+        ("recv_reports", bench_recv_reports, INPUT_RATE, False),
+        ("in_waiting", bench_in_waiting, 0.0, False),
+        ("loopback", bench_loopback, 0.0, True),
+    )
+    for name, bench, rate, loopback in benches:
+        device = open_device(rate, loopback)
+        result = bench(device, REPORTS_COUNT)
+        blocks, peak = count_allocations(bench, device)
+        dropped = device.dropped_count
+        device.close()
+
+        print(
+            f"{name:>12}: {result.reports_per_second:10,.0f} reports/s, "
+            f"{result.bytes_per_second / 1e6:6.2f} MB/s, {format_latency(result.latencies_ns)}, "
+            f"{blocks} live allocations, peak {peak / 1024:.1f} KiB"
+            + (f", {dropped} dropped" if dropped else "")
+        )
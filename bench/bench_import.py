@@ -0,0 +1,128 @@
+"""
+Время запуска стека HID: импорт модулей (`python -X importtime`)
+и первое обращение к таблице устройств и индексу hidraw
+без кэша на диске и с ним. Каждое измерение - отдельный процесс
+"""
+
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS_COUNT = 15  # Количество запусков процесса на одно измерение
+TOP_COUNT = 10  # Количество самых дорогих модулей в отчёте
+
+LOOKUP_SCRIPT = """
+from time import perf_counter_ns
+from hid_sysfs import get_device_table
+from hidraw_index import hidraw_index
+started = perf_counter_ns()
+get_device_table()
+hidraw_index.nodes()
+print((perf_counter_ns() - started) // 1000)
+"""  # Первое обращение к таблице устройств и индексу hidraw, мкс
+
+
+def run_python(arguments: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    """
+    Запуск интерпретатора в каталоге репозитория
+
+    Args:
+        arguments (List[str]): Аргументы интерпретатора
+        env (Dict[str, str]): Переменные окружения
+    Returns:
+        subprocess.CompletedProcess: Результат запуска
+    """
+
+    return subprocess.run(
+        [sys.executable, *arguments], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(output: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Разбор вывода `-X importtime`
+
+    Args:
+        output (str): Вывод в stderr
+    Returns:
+        Tuple[Dict[str, int], Dict[str, int]]: Собственное и суммарное время импорта модулей, мкс
+    """
+
+    own: Dict[str, int] = {}
+    cumulative: Dict[str, int] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        own[name] = int(self_us)
+        cumulative[name] = int(cumulative_us)
+
+    return own, cumulative
+
+
+def bench_import(module: str, env: Dict[str, str]) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Время импорта модуля в новом процессе
+
+    Args:
+        module (str): Имя модуля
+        env (Dict[str, str]): Переменные окружения
+    Returns:
+        Tuple[float, List[Tuple[str, float]]]:
+            Медианное время импорта в мс и самые дорогие модули (медиана собственного времени, мс)
+    """
+
+    totals: List[int] = []
+    modules: Dict[str, List[int]] = {}
+    for _ in range(RUNS_COUNT):
+        own, cumulative = parse_importtime(run_python(["-X", "importtime", "-c", f"import {module}"], env).stderr)
+        totals.append(cumulative[module])
+        for name, value in own.items():
+            modules.setdefault(name, []).append(value)
+
+    top = sorted(((name, statistics.median(values) / 1000) for name, values in modules.items()), key=lambda item: -item[1])
+
+    return statistics.median(totals) / 1000, top[:TOP_COUNT]
+
+
+def bench_lookup(env: Dict[str, str], disk_cache: bool) -> float:
+    """
+    Время первого обращения к таблице устройств в новом процессе
+
+    Args:
+        env (Dict[str, str]): Переменные окружения
+        disk_cache (bool): Использовать ли кэш на диске (он заполняется первым запуском)
+    Returns:
+        float: Медианное время в мс
+    """
+
+    env = dict(env)
+    if not disk_cache:
+        env["MYHID_NO_CACHE"] = "1"
+    run_python(["-c", LOOKUP_SCRIPT], env)  # Заполнение кэша и прогрев файловой системы
+
+    return statistics.median(
+        int(run_python(["-c", LOOKUP_SCRIPT], env).stdout) for _ in range(RUNS_COUNT)
+    ) / 1000
+
+
+if __name__ == "__main__":
+    compileall.compile_dir(ROOT, maxlevels=0, quiet=1)  # Измеряем импорт из готового байт-кода
+    with tempfile.TemporaryDirectory() as cache_root:
+        environment = dict(os.environ, XDG_CACHE_HOME=cache_root)
+        environment.pop("MYHID_NO_CACHE", None)
+
+        total, top = bench_import("HID", environment)
+        print(f"import HID: {total:.2f} ms (median of {RUNS_COUNT})")
+        for name, own in top:
+            print(f"  {name:<24} {own:6.2f} ms")
+
+        cold = bench_lookup(environment, disk_cache=False)
+        warm = bench_lookup(environment, disk_cache=True)
+        print(f"first device lookup: sysfs scan {cold:.2f} ms, disk cache {warm:.2f} ms")
@@ -0,0 +1,78 @@
+"""
+Накладные расходы сбора метрик устройства (`HidMetrics`)
+на фиктивном устройстве: сравнение процессорного времени
+измеряющего потока с включёнными и выключенными метриками.
+
+Учитывается время только измеряющего потока (`thread_time_ns`),
+поэтому поток фиктивного устройства и ожидание в epoll не вносят шума.
+Прогоны чередуются парами в разном порядке, результат - медиана
+и межквартильный размах накладных расходов по парам.
+Метрики сравниваются в конфигурации по умолчанию - без гистограмм задержек
+"""
+
+import gc
+import os
+import sys
+from statistics import median, quantiles
+from time import thread_time_ns
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_hid import bench_in_waiting, bench_loopback, bench_write, open_device  # pylint: disable=wrong-import-position
+from hid_metrics import HidMetrics  # pylint: disable=wrong-import-position
+
+REPORTS_COUNT = 2_000  # Количество отчётов в одном измерении
+WARMUP_COUNT = 20_000  # Количество отчётов прогрева
+ROUNDS_COUNT = 150  # Количество пар прогонов с метриками и без
+
+
+def measure(bench, loopback: bool) -> tuple:
+    """
+    Процессорное время на отчёт с выключенными и включёнными метриками
+    и накладные расходы по парам прогонов на одном устройстве
+
+    Args:
+        bench: Функция измерения из `bench_hid`
+        loopback (bool): Возвращать ли выходные отчёты
+    Returns:
+        tuple: Лучшее время на отчёт без метрик и с метриками (нс),
+            медиана и квартили накладных расходов (%)
+    """
+
+    device = open_device(loopback=loopback)
+    best = [float("inf"), float("inf")]
+    overheads = []
+    try:
+        bench(device, WARMUP_COUNT)
+        gc.collect()
+        gc.disable()  # Сборка мусора попадала бы в случайные прогоны
+        for round_index in range(ROUNDS_COUNT):
+            spent = [0, 0]
+            for enabled in (False, True) if round_index % 2 else (True, False):
+                device.metrics = HidMetrics() if enabled else None
+                started = thread_time_ns()
+                bench(device, REPORTS_COUNT)
+                spent[enabled] = thread_time_ns() - started
+                best[enabled] = min(best[enabled], spent[enabled] / REPORTS_COUNT)
+            overheads.append((spent[True] - spent[False]) / spent[False] * 100)
+    finally:
+        gc.enable()
+        device.close()
+
+    quartiles = quantiles(overheads, n=4)
+
+    return best[0], best[1], median(overheads), quartiles[0], quartiles[2]
+
+
+if __name__ == "__main__":
+    for name, bench, loopback in (
+            ("write", bench_write, False),
+            ("in_waiting", bench_in_waiting, False),
+            ("loopback", bench_loopback, True),
+        ):
+        disabled, enabled, overhead, low, high = measure(bench, loopback)
+        print(
+            f"{name:>10}: off {disabled:7,.0f} ns, on {enabled:7,.0f} ns CPU/report, "
+            f"overhead {overhead:5.2f}% (IQR {low:5.2f}..{high:5.2f}%)"
+        )
@@ -0,0 +1,97 @@
+"""
+Декодирование пакета отчётов: `ReportDecoder.decode` и распаковка каналов CRSF
+по одному отчёту против векторизованных функций `hid_numpy`
+"""
+
+import os
+import random
+import sys
+from time import perf_counter_ns
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hid_numpy  # pylint: disable=wrong-import-position
+from crsf import CRSF_FRAMETYPE_RC_CHANNELS_PACKED, build_frame, _decode_rc_channels  # pylint: disable=wrong-import-position
+from hid_descriptor import INPUT, compile_descriptor  # pylint: disable=wrong-import-position
+
+REPORTS_COUNT = 10_000  # Количество отчётов в пакете
+REPORT_LENGTH = 64  # Длина отчёта CRSF
+FRAME_OFFSET = 1  # Смещение кадра CRSF в отчёте (после Report ID)
+DESCRIPTOR = bytes((
+    0x06, 0x00, 0xFF, 0x09, 0x01, 0xA1, 0x01, 0x85, 0x01,
+    0x15, 0x00, 0x26, 0xFF, 0x00, 0x75, 0x08, 0x95, 0x04, 0x09, 0x01, 0x81, 0x02,  # 4 x 8 бит
+    0x16, 0x00, 0x80, 0x26, 0xFF, 0x7F, 0x75, 0x10, 0x95, 0x04, 0x09, 0x02, 0x81, 0x02,  # 4 x 16 бит со знаком
+    0x15, 0x00, 0x26, 0xFF, 0x0F, 0x75, 0x0C, 0x95, 0x04, 0x09, 0x03, 0x81, 0x02,  # 4 x 12 бит
+    0xC0,
+))  # Дескриптор тестового отчёта
+
+
+def measure(function, *args) -> float:
+    """
+    Время одного вызова функции (лучшее из трёх)
+
+    Args:
+        function: Функция
+        *args: Аргументы функции
+    Returns:
+        float: Время в мс
+    """
+
+    best = None
+    for _ in range(3):
+        started = perf_counter_ns()
+        function(*args)
+        elapsed = perf_counter_ns() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best / 1e6
+
+
+def bench_descriptor() -> None:
+    """
+    Декодирование отчётов по дескриптору
+    """
+
+    _, decoders = compile_descriptor(DESCRIPTOR)
+    decoder = decoders[(INPUT, 1)]
+    length = decoder.size + 1
+    rng = random.Random(0)
+    data = bytes(rng.randrange(256) for _ in range(length * REPORTS_COUNT))
+
+    def decode_each():
+        return [decoder.decode(data[index:index + length]) for index in range(0, len(data), length)]
+
+    def decode_batch():
+        return hid_numpy.decode_batch(decoder, hid_numpy.report_matrix(data, length))
+
+    assert (decode_batch() == decode_each()).all()
+    print(f"descriptor  decode: {measure(decode_each):8.2f} ms, numpy: {measure(decode_batch):6.2f} ms")
+
+
+def bench_crsf() -> None:
+    """
+    Поиск и распаковка кадров каналов CRSF
+    """
+
+    rng = random.Random(0)
+    data = bytearray()
+    for _ in range(REPORTS_COUNT):
+        payload = bytes(rng.randrange(256) for _ in range(hid_numpy.CRSF_RC_PAYLOAD_SIZE))
+        frame = build_frame(CRSF_FRAMETYPE_RC_CHANNELS_PACKED, payload)
+        data += bytes(FRAME_OFFSET) + frame + bytes(REPORT_LENGTH - FRAME_OFFSET - len(frame))
+    start = FRAME_OFFSET + 3  # Начало каналов: синхронизация, длина и тип кадра
+
+    def decode_each():
+        return [_decode_rc_channels(data, index + start) for index in range(0, len(data), REPORT_LENGTH)]
+
+    def decode_batch():
+        return hid_numpy.crsf_rc_channels(hid_numpy.report_matrix(data, REPORT_LENGTH), FRAME_OFFSET)
+
+    assert (decode_batch()[1] == decode_each()).all()
+    print(f"crsf      channels: {measure(decode_each):8.2f} ms, numpy: {measure(decode_batch):6.2f} ms")
+
+
+if __name__ == "__main__":
+    print(f"{REPORTS_COUNT} reports")
+    bench_descriptor()
+    bench_crsf()
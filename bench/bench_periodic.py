@@ -0,0 +1,106 @@
+"""
+Точность периодической отправки отчётов на фиктивном устройстве:
+цикл `time.sleep` + `write` против планировщика на timerfd
+(`PeriodicScheduler`) с двумя потоками разной частоты
+"""
+
+import os
+import sys
+from time import monotonic_ns, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_hid import open_device  # pylint: disable=wrong-import-position
+from hid_metrics import LatencyHistogram  # pylint: disable=wrong-import-position
+from hid_periodic import PeriodicScheduler  # pylint: disable=wrong-import-position
+
+DURATION = 3.0  # Длительность одного измерения в секундах
+RATES = (500.0, 250.0)  # Частоты потоков отчётов, Гц
+
+
+def format_jitter(snapshot: dict) -> str:
+    """
+    Форматирование снимка гистограммы опозданий
+
+    Args:
+        snapshot (dict): Снимок `LatencyHistogram`
+    Returns:
+        str: Строка с p50/p99/максимумом в микросекундах
+    """
+
+    return (
+        f"p50 {snapshot['p50'] / 1000:7.1f} us, p99 {snapshot['p99'] / 1000:7.1f} us, "
+        f"max {snapshot['max'] / 1000:7.1f} us"
+    )
+
+
+def bench_sleep(rate: float) -> tuple:
+    """
+    Отправка отчётов циклом со `sleep` до расчётного момента
+
+    Args:
+        rate (float): Частота отправки, Гц
+    Returns:
+        tuple: Гистограмма опозданий и количество пропущенных периодов
+    """
+
+    device = open_device()
+    period_ns = round(1e9 / rate)
+    report = bytearray(device.output_report_length - 1)
+    jitter = LatencyHistogram()
+    missed = 0
+    deadline = monotonic_ns() + period_ns
+    end = deadline + int(DURATION * 1e9)
+    try:
+        while deadline < end:
+            delay = deadline - monotonic_ns()
+            if delay > 0:
+                sleep(delay / 1e9)
+            now = monotonic_ns()
+            late = now - deadline
+            skipped = late // period_ns  # Пропущенные периоды не догоняем, как и timerfd
+            missed += skipped
+            jitter.record(late - skipped * period_ns)
+            device.write(report)
+            deadline += (skipped + 1) * period_ns
+    finally:
+        device.close()
+
+    return jitter, missed
+
+
+def bench_scheduler(rates: tuple) -> list:
+    """
+    Отправка отчётов планировщиком с потоками указанных частот
+
+    Args:
+        rates (tuple): Частоты потоков, Гц
+    Returns:
+        list: Снимки потоков
+    """
+
+    device = open_device()
+    scheduler = PeriodicScheduler()
+    try:
+        start_ns = monotonic_ns() + 10_000_000  # Общий момент начала выравнивает кратные частоты
+        streams = [scheduler.add_stream(device, rate, start_ns=start_ns) for rate in rates]
+        scheduler.start()
+        sleep(DURATION)
+        scheduler.stop()
+        return [stream.snapshot() for stream in streams]
+    finally:
+        scheduler.close()
+        device.close()
+
+
+if __name__ == "__main__":
+    for rate in RATES:
+        histogram, missed_count = bench_sleep(rate)
+        snapshot = histogram.snapshot()
+        print(f"sleep      {rate:5.0f} Hz: sent {snapshot['count']:5}, missed {missed_count:3}, late {format_jitter(snapshot)}")
+    for snapshot in bench_scheduler(RATES):
+        print(
+            f"timerfd    {snapshot['rate']:5.0f} Hz: sent {snapshot['sent']:5}, missed {snapshot['missed']:3}, "
+            f"late {format_jitter(snapshot['jitter'])}"
+        )
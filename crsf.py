@@ -0,0 +1,407 @@
+import struct
+from typing import List, NamedTuple, Optional, Tuple
+
+from hid_buffer import ReportBuffer
+
+# Адреса устройств CRSF, с которых может начинаться кадр:
+CRSF_ADDRESS_BROADCAST = 0x00
+CRSF_ADDRESS_FLIGHT_CONTROLLER = 0xC8
+CRSF_ADDRESS_RADIO_TRANSMITTER = 0xEA
+CRSF_ADDRESS_RECEIVER = 0xEC
+CRSF_ADDRESS_TRANSMITTER = 0xEE
+CRSF_SYNC_BYTES = frozenset((
+    CRSF_ADDRESS_FLIGHT_CONTROLLER,
+    CRSF_ADDRESS_RADIO_TRANSMITTER,
+    CRSF_ADDRESS_RECEIVER,
+    CRSF_ADDRESS_TRANSMITTER
+))
+
+# Типы кадров CRSF:
+CRSF_FRAMETYPE_LINK_STATISTICS = 0x14
+CRSF_FRAMETYPE_RC_CHANNELS_PACKED = 0x16
+CRSF_FRAMETYPE_DEVICE_PING = 0x28
+CRSF_FRAMETYPE_DEVICE_INFO = 0x29
+CRSF_FRAMETYPE_PARAMETER_SETTINGS_ENTRY = 0x2B
+CRSF_FRAMETYPE_PARAMETER_READ = 0x2C
+CRSF_FRAMETYPE_PARAMETER_WRITE = 0x2D
+CRSF_EXTENDED_FRAMETYPE_MIN = 0x28  # Начиная с этого типа кадр содержит адреса получателя и отправителя
+
+CRSF_FRAME_LENGTH_MIN = 2  # Минимальное значение поля длины (тип + CRC)
+CRSF_FRAME_LENGTH_MAX = 62  # Максимальное значение поля длины
+CRSF_FRAME_SIZE_MAX = CRSF_FRAME_LENGTH_MAX + 2  # Максимальный размер кадра вместе с адресом и длиной
+CRSF_RC_CHANNELS_COUNT = 16  # Количество каналов в кадре RC_CHANNELS_PACKED
+CRSF_RC_CHANNEL_BITS = 11  # Разрядность одного канала
+
+_LINK_STATISTICS = struct.Struct("<BBBbBBBBBb")  # Полезная нагрузка LINK_STATISTICS
+_DEVICE_INFO_TAIL = struct.Struct(">IIIBB")  # Серийный номер, ID оборудования, ID ПО, число параметров, версия
+
+
+def _build_crc8_table(polynomial: int) -> bytes:
+    """
+    Построение таблицы CRC8
+
+    Args:
+        polynomial (int): Полином CRC8
+    Returns:
+        bytes: Таблица из 256 значений
+    """
+
+    table = bytearray(256)
+    for index in range(256):
+        crc = index
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[index] = crc
+
+    return bytes(table)
+
+
+CRC8_DVB_S2_TABLE = _build_crc8_table(0xD5)  # Таблица CRC8 DVB-S2
+
+
+def crc8_dvb_s2(data: bytes | bytearray | memoryview, crc: int = 0) -> int:
+    """
+    Табличный расчёт CRC8 DVB-S2
+
+    Args:
+        data (bytes | bytearray | memoryview): Данные
+        crc (int): Начальное значение
+    Returns:
+        int: Значение CRC8
+    """
+
+    table = CRC8_DVB_S2_TABLE
+    for byte in data:
+        crc = table[crc ^ byte]
+
+    return crc
+
+
+class CrsfFrame(NamedTuple):
+    """
+    Кадр CRSF без специализированного декодирования
+
+    Attributes:
+        address (int): Адрес (байт синхронизации) кадра
+        frame_type (int): Тип кадра
+        payload (bytes): Полезная нагрузка кадра
+    """
+
+    address: int  # Адрес кадра
+    frame_type: int  # Тип кадра
+    payload: bytes  # Полезная нагрузка
+
+
+class LinkStatistics(NamedTuple):
+    """
+    Кадр статистики радиоканала (LINK_STATISTICS)
+    """
+
+    address: int
+    uplink_rssi_1: int
+    uplink_rssi_2: int
+    uplink_link_quality: int
+    uplink_snr: int
+    active_antenna: int
+    rf_mode: int
+    uplink_tx_power: int
+    downlink_rssi: int
+    downlink_link_quality: int
+    downlink_snr: int
+
+
+class RcChannels(NamedTuple):
+    """
+    Кадр упакованных каналов управления (RC_CHANNELS_PACKED)
+
+    Attributes:
+        address (int): Адрес кадра
+        channels (Tuple[int, ...]): Значения 16 каналов (11 бит)
+    """
+
+    address: int
+    channels: Tuple[int, ...]
+
+
+class CrsfDeviceInfo(NamedTuple):
+    """
+    Кадр сведений об устройстве (DEVICE_INFO)
+    """
+
+    address: int
+    destination: int
+    origin: int
+    name: str
+    serial_number: int
+    hardware_id: int
+    software_id: int
+    parameters_count: int
+    parameter_version: int
+
+
+def _decode_rc_channels(view: memoryview, start: int) -> Tuple[int, ...]:
+    """
+    Распаковка 16 каналов по 11 бит
+
+    Args:
+        view (memoryview): Данные потока
+        start (int): Индекс начала полезной нагрузки
+    Returns:
+        Tuple[int, ...]: Значения каналов
+    """
+
+    packed = int.from_bytes(view[start:start + 22], "little")
+    mask = (1 << CRSF_RC_CHANNEL_BITS) - 1
+
+    return tuple((packed >> (CRSF_RC_CHANNEL_BITS * index)) & mask for index in range(CRSF_RC_CHANNELS_COUNT))
+
+
+def decode_frame(view: memoryview, start: int, length: int):
+    """
+    Декодирование одного проверенного кадра в типизированный объект
+
+    Args:
+        view (memoryview): Данные потока
+        start (int): Индекс адреса кадра
+        length (int): Значение поля длины кадра
+    Returns:
+        LinkStatistics | RcChannels | CrsfDeviceInfo | CrsfFrame: Декодированный кадр
+    """
+
+    address = view[start]
+    frame_type = view[start + 2]
+    payload_start = start + 3
+    payload_size = length - 2
+
+    if frame_type == CRSF_FRAMETYPE_RC_CHANNELS_PACKED and payload_size == 22:
+        return RcChannels(address, _decode_rc_channels(view, payload_start))
+    if frame_type == CRSF_FRAMETYPE_LINK_STATISTICS and payload_size == _LINK_STATISTICS.size:
+        return LinkStatistics(address, *_LINK_STATISTICS.unpack_from(view, payload_start))
+    if frame_type == CRSF_FRAMETYPE_DEVICE_INFO and payload_size > 2:
+        payload_end = payload_start + payload_size
+        name_end = payload_start + 2
+        while name_end < payload_end and view[name_end]:  # Имя - строка с завершающим нулём
+            name_end += 1
+        if payload_end - (name_end + 1) >= _DEVICE_INFO_TAIL.size:
+            return CrsfDeviceInfo(
+                address,
+                view[payload_start],
+                view[payload_start + 1],
+                bytes(view[payload_start + 2:name_end]).decode("utf-8", errors="replace"),
+                *_DEVICE_INFO_TAIL.unpack_from(view, name_end + 1)
+            )
+
+    return CrsfFrame(address, frame_type, bytes(view[payload_start:payload_start + payload_size]))
+
+
+def build_frame(frame_type: int, payload: bytes = b"", address: int = CRSF_ADDRESS_TRANSMITTER) -> bytes:
+    """
+    Сборка кадра CRSF
+
+    Args:
+        frame_type (int): Тип кадра
+        payload (bytes): Полезная нагрузка
+        address (int): Адрес кадра
+    Returns:
+        bytes: Кадр вместе с адресом, длиной и CRC
+    """
+
+    body = bytes((frame_type,)) + payload
+
+    return bytes((address, len(body) + 1)) + body + bytes((crc8_dvb_s2(body),))
+
+
+def build_extended_frame(
+        frame_type: int,
+        destination: int,
+        origin: int,
+        payload: bytes = b"",
+        address: int = CRSF_ADDRESS_TRANSMITTER
+    ) -> bytes:
+    """
+    Сборка расширенного кадра CRSF (с адресами получателя и отправителя)
+
+    Args:
+        frame_type (int): Тип кадра
+        destination (int): Адрес получателя
+        origin (int): Адрес отправителя
+        payload (bytes): Полезная нагрузка
+        address (int): Адрес кадра
+    Returns:
+        bytes: Кадр вместе с адресом, длиной и CRC
+    """
+
+    return build_frame(frame_type, bytes((destination, origin)) + payload, address)
+
+
+class CrsfParser:
+    """
+    Потоковый разборщик кадров CRSF.
+
+    Работает напрямую с представлением данных буфера приёма без копирования:
+    пропускает байты до адреса синхронизации, проверяет длину и CRC8 DVB-S2,
+    при ошибке сдвигается на один байт и ищет следующий кадр
+    """
+
+    def __init__(self, sync_bytes: frozenset = CRSF_SYNC_BYTES):
+        """
+        Инициализация разборщика
+
+        Args:
+            sync_bytes (frozenset): Допустимые адреса начала кадра
+        """
+
+        self.sync_bytes = sync_bytes
+        self.frames_count = 0  # Количество разобранных кадров
+        self.crc_errors = 0  # Количество кадров с ошибкой CRC
+        self.skipped_bytes = 0  # Количество пропущенных при синхронизации байт
+
+
+    def parse(self, data: bytes | bytearray | memoryview, decode: bool = True) -> Tuple[list, int]:
+        """
+        Разбор всех полных кадров из данных
+
+        Args:
+            data (bytes | bytearray | memoryview): Данные потока
+            decode (bool): Декодировать ли кадры (`False` - возвращать позиции кадров)
+        Returns:
+            Tuple[list, int]:
+                Список кадров (или пар (начало, длина), если `decode=False`)
+                и количество обработанных байт, которые можно удалить из буфера
+        """
+
+        view = memoryview(data)
+        size = len(view)
+        sync_bytes = self.sync_bytes
+        table = CRC8_DVB_S2_TABLE
+        frames: list = []
+        position = 0
+
+        while position + 1 < size:
+            if view[position] not in sync_bytes:  # Ищем байт синхронизации
+                position += 1
+                self.skipped_bytes += 1
+                continue
+
+            length = view[position + 1]
+            if length < CRSF_FRAME_LENGTH_MIN or length > CRSF_FRAME_LENGTH_MAX:  # Неверная длина
+                position += 1
+                self.skipped_bytes += 1
+                continue
+            if position + 2 + length > size:  # Кадр ещё не принят полностью
+                break
+
+            crc = 0
+            crc_position = position + 1 + length
+            for index in range(position + 2, crc_position):
+                crc = table[crc ^ view[index]]
+            if crc != view[crc_position]:  # Повреждённый кадр - ресинхронизация со следующего байта
+                self.crc_errors += 1
+                self.skipped_bytes += 1
+                position += 1
+                continue
+
+            frames.append(decode_frame(view, position, length) if decode else (position, length))
+            position += length + 2
+
+        if position + 1 == size and view[position] not in sync_bytes:  # Последний байт - не начало кадра
+            position += 1
+            self.skipped_bytes += 1
+
+        self.frames_count += len(frames)
+
+        return frames, position
+
+
+    def feed_from(self, buffer: ReportBuffer) -> list:
+        """
+        Разбор кадров прямо из буфера приёма с удалением обработанных данных
+
+        Args:
+            buffer (ReportBuffer): Буфер приёма (например, `BaseHid.buffer`)
+        Returns:
+            list: Декодированные кадры
+        """
+
+        frames, consumed = self.parse(buffer.view())
+        buffer.skip(consumed)  # Неполный кадр остаётся в буфере до следующего приёма
+
+        return frames
+
+
+    def read_frames(self, device) -> list:
+        """
+        Приём доступных данных устройства и разбор кадров
+
+        Args:
+            device (BaseHid): Открытое устройство
+        Returns:
+            list: Декодированные кадры
+        """
+
+        if not device.in_waiting:  # Принимаем данные в буфер
+            return []
+
+        return self.feed_from(device.buffer)
+
+
+    def parse_batch(self, data: bytes | bytearray | memoryview) -> list:
+        """
+        Пакетный разбор записанного журнала с векторизованной проверкой CRC (NumPy).
+        Границы кадров находятся по полям длины, затем CRC всех кадров
+        проверяется одной операцией. С первого повреждённого кадра
+        разбор продолжается обычным потоковым способом
+
+        Args:
+            data (bytes | bytearray | memoryview): Записанные данные потока
+        Returns:
+            list: Декодированные кадры
+        Raises:
+            ImportError: Если NumPy не установлен
+        """
+
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        view = memoryview(data)
+        size = len(view)
+
+        # Последовательно проходим по полям длины, предполагая корректный поток:
+        starts: List[int] = []
+        position = 0
+        while position + 1 < size and view[position] in self.sync_bytes:
+            length = view[position + 1]
+            if length < CRSF_FRAME_LENGTH_MIN or length > CRSF_FRAME_LENGTH_MAX or position + 2 + length > size:
+                break
+            starts.append(position)
+            position += length + 2
+
+        frames: list = []
+        bad_index: Optional[int] = None
+        if starts:
+            stream = np.frombuffer(view, dtype=np.uint8)
+            start_array = np.asarray(starts, dtype=np.int64)
+            lengths = stream[start_array + 1].astype(np.int64)
+            table = np.frombuffer(CRC8_DVB_S2_TABLE, dtype=np.uint8)
+
+            # CRC всех кадров считается столбцами: j-й байт тела каждого кадра за один шаг
+            crc = np.zeros(len(starts), dtype=np.uint8)
+            for column in range(int(lengths.max()) - 1):
+                active = column < lengths - 1
+                indexes = np.minimum(start_array + 2 + column, size - 1)
+                updated = table[crc ^ stream[indexes]]
+                crc = np.where(active, updated, crc)
+            valid = crc == stream[start_array + 1 + lengths]
+
+            invalid = np.flatnonzero(~valid)
+            bad_index = int(invalid[0]) if len(invalid) else None
+            good_count = bad_index if bad_index is not None else len(starts)
+            frames = [decode_frame(view, starts[index], view[starts[index] + 1]) for index in range(good_count)]
+            self.frames_count += good_count
+
+        # Остаток потока (после повреждения или рассинхронизации) разбираем потоково:
+        rest_start = starts[bad_index] if bad_index is not None else position
+        if rest_start < size:
+            rest_frames, _ = self.parse(view[rest_start:])
+            frames.extend(rest_frames)
+
+        return frames
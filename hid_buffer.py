@@ -0,0 +1,271 @@
+from typing import List, Optional
+
+DEFAULT_BUFFER_CAPACITY = 64 * 1024  # Начальная байтовая ёмкость буфера приёма
+
+
+class ReportBuffer:
+    """
+    Растущий кольцевой буфер принятых данных HID.
+
+    Данные хранятся в заранее выделенном `bytearray` между индексами
+    начала и конца. Добавление и извлечение выполняются за амортизированное
+    O(1): при нехватке места в конце буфера данные либо сдвигаются в начало
+    (если занято не больше половины ёмкости), либо буфер удваивается
+    """
+
+    __slots__ = ("_data", "_view", "_start", "_end")
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_CAPACITY):
+        """
+        Инициализация буфера
+
+        Args:
+            capacity (int): Начальная ёмкость буфера в байтах
+        """
+
+        self._data = bytearray(max(capacity, 1))  # Заранее выделенное хранилище
+        self._view = memoryview(self._data)  # Представление хранилища без копирования
+        self._start = 0  # Индекс первого непрочитанного байта
+        self._end = 0  # Индекс, следующий за последним записанным байтом
+
+
+    def __len__(self) -> int:
+        """
+        Количество байт, ожидающих чтения
+
+        Returns:
+            int: Количество байт в буфере
+        """
+
+        return self._end - self._start
+
+
+    @property
+    def capacity(self) -> int:
+        """
+        Текущая ёмкость буфера
+
+        Returns:
+            int: Размер хранилища в байтах
+        """
+
+        return len(self._data)
+
+
+    def _make_room(self, size: int):
+        """
+        Освобождение места под запись указанного количества байт
+
+        Args:
+            size (int): Количество байт, которое необходимо дописать
+        """
+
+        used = self._end - self._start  # Количество занятых байт
+        capacity = len(self._data)
+
+        # Если после сдвига в начало освободится хотя бы половина буфера
+        # и области не перекрываются - сдвигаем данные на месте:
+        if used + size <= capacity and used <= capacity // 2 and self._start >= used:
+            self._view[:used] = self._view[self._start:self._end]
+        else:  # Иначе выделяем новое хранилище удвоенного размера
+            while used + size > capacity // 2:
+                capacity *= 2
+            data = bytearray(capacity)
+            data[:used] = self._view[self._start:self._end]
+            self._data = data
+            self._view = memoryview(data)
+
+        self._start = 0
+        self._end = used
+
+
+    def append(self, data: bytes | bytearray | memoryview):
+        """
+        Добавление данных в конец буфера
+
+        Args:
+            data (bytes | bytearray | memoryview): Данные для добавления
+        """
+
+        size = len(data)
+        if self._end + size > len(self._data):  # Если данные не помещаются в хвост
+            self._make_room(size)  # Освобождаем место
+        self._view[self._end:self._end + size] = data  # Копируем данные в хранилище
+        self._end += size
+
+
+    def reserve(self, size: int) -> memoryview:
+        """
+        Получение области хвоста буфера для записи данных напрямую,
+        например через `os.readv`. Записанные данные подтверждаются `commit`
+
+        Args:
+            size (int): Необходимый размер области в байтах
+        Returns:
+            memoryview: Записываемая область хвоста буфера
+        """
+
+        if self._end + size > len(self._data):  # Если область не помещается в хвост
+            self._make_room(size)  # Освобождаем место
+
+        return self._view[self._end:self._end + size]
+
+
+    def commit(self, size: int):
+        """
+        Подтверждение записи данных в область, полученную через `reserve`
+
+        Args:
+            size (int): Количество записанных байт
+        """
+
+        self._end += size
+
+
+    def _advance(self, size: int):
+        """
+        Сдвиг начала буфера на указанное количество байт
+
+        Args:
+            size (int): Количество извлечённых байт
+        """
+
+        self._start += size
+        if self._start == self._end:  # Если буфер опустел - возвращаемся в начало хранилища
+            self._start = 0
+            self._end = 0
+
+
+    def consume(self, size: Optional[int] = None) -> bytes:
+        """
+        Извлечение данных из начала буфера
+
+        Args:
+            size (Optional[int]):
+                Количество байт для извлечения (`None` - все данные)
+        Returns:
+            bytes: Извлечённые данные
+        """
+
+        available = self._end - self._start
+        size = available if size is None else min(size, available)
+        if size <= 0:
+            return b""
+
+        data = bytes(self._view[self._start:self._start + size])  # Единственная копия данных
+        self._advance(size)
+
+        return data
+
+
+    def consume_into(self, buffer: bytearray | memoryview) -> int:
+        """
+        Извлечение данных из начала буфера в переданный буфер
+
+        Args:
+            buffer (bytearray | memoryview): Буфер для записи данных
+        Returns:
+            int: Количество записанных байт
+        """
+
+        size = min(len(buffer), self._end - self._start)
+        if size <= 0:
+            return 0
+
+        buffer[:size] = self._view[self._start:self._start + size]  # Копируем без промежуточных объектов
+        self._advance(size)
+
+        return size
+
+
+    def skip(self, size: int) -> int:
+        """
+        Удаление данных из начала буфера без копирования
+
+        Args:
+            size (int): Количество байт для удаления
+        Returns:
+            int: Количество фактически удалённых байт
+        """
+
+        size = max(min(size, self._end - self._start), 0)
+        self._advance(size)
+
+        return size
+
+
+    def view(self) -> memoryview:
+        """
+        Представление всех данных буфера без копирования.
+        Действительно до следующего изменения буфера
+
+        Returns:
+            memoryview: Представление данных буфера
+        """
+
+        return self._view[self._start:self._end]
+
+
+    def clear(self):
+        """
+        Удаление всех данных из буфера
+        """
+
+        self._start = 0
+        self._end = 0
+
+
+RECV_ARENA_COUNT = 4  # Количество арен пакетного приёма, выдаваемых по кругу
+
+
+class ReportArena:
+    """
+    Пул буферов пакетного приёма отчётов.
+
+    Каждая арена - непрерывный `bytearray` на заданное количество слотов
+    фиксированного размера, отчёт принимается прямо в свой слот.
+    Арены выдаются по кругу, поэтому представления отчётов одного пакета
+    остаются действительными, пока не выданы следующие `arena_count - 1` пакетов.
+    Арены перевыделяются только при росте размера слота или количества слотов
+    """
+
+    __slots__ = ("_arenas", "_index", "_slot_size", "_slot_count")
+
+    def __init__(self, arena_count: int = RECV_ARENA_COUNT):
+        """
+        Инициализация пула
+
+        Args:
+            arena_count (int): Количество арен
+        """
+
+        self._arenas: List[Optional[memoryview]] = [None] * max(arena_count, 1)  # Представления арен
+        self._index = 0  # Номер следующей выдаваемой арены
+        self._slot_size = 0
+        self._slot_count = 0
+
+
+    def acquire(self, slot_size: int, slot_count: int) -> memoryview:
+        """
+        Получение очередной арены
+
+        Args:
+            slot_size (int): Размер слота (длина входного отчёта)
+            slot_count (int): Количество слотов
+        Returns:
+            memoryview: Представление арены не меньше `slot_size * slot_count` байт
+        """
+
+        if slot_size != self._slot_size or slot_count > self._slot_count:  # Прежние арены не подходят
+            self._arenas = [None] * len(self._arenas)
+            self._slot_size = slot_size
+            self._slot_count = max(slot_count, self._slot_count)
+
+        index = self._index
+        self._index = (index + 1) % len(self._arenas)
+        arena = self._arenas[index]
+        if arena is None:  # Арена выделяется при первой выдаче
+            arena = memoryview(bytearray(self._slot_size * self._slot_count))
+            self._arenas[index] = arena
+
+        return arena
@@ -0,0 +1,104 @@
+import marshal
+import os
+from typing import Any, Optional, Tuple
+
+CACHE_VERSION = 1  # Версия формата файлов кэша
+CACHE_DISABLE_ENV = "MYHID_NO_CACHE"  # Переменная окружения, отключающая кэш на диске
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"  # Идентификатор текущей загрузки системы
+
+DeviceSignature = Tuple[str, int]
+"""Признак актуальности набора устройств: идентификатор загрузки и время изменения `/dev`"""
+
+
+def cache_dir() -> str:
+    """
+    Каталог кэша на диске (`$XDG_CACHE_HOME/myhid` или `~/.cache/myhid`)
+
+    Returns:
+        str: Путь до каталога кэша
+    """
+
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+    return os.path.join(root, "myhid")
+
+
+def device_signature(dev_root: str = "/dev") -> Optional[DeviceSignature]:
+    """
+    Получение признака актуальности набора устройств.
+    Время изменения `/dev` меняется при создании и удалении узлов,
+    идентификатор загрузки отличает одинаковые времена разных загрузок
+
+    Args:
+        dev_root (str): Каталог файлов устройств
+    Returns:
+        Optional[DeviceSignature]: Признак или `None`, если каталог недоступен
+    """
+
+    try:
+        mtime = os.stat(dev_root).st_mtime_ns
+    except OSError:
+        return None
+
+    try:
+        with open(BOOT_ID_PATH, "r", encoding="ascii") as file:
+            boot_id = file.read().strip()
+    except OSError:
+        boot_id = ""
+
+    return boot_id, mtime
+
+
+def load_cache(name: str, signature: Optional[DeviceSignature]) -> Optional[Any]:
+    """
+    Чтение данных из кэша на диске
+
+    Args:
+        name (str): Имя записи кэша
+        signature (Optional[DeviceSignature]): Ожидаемый признак актуальности
+    Returns:
+        Optional[Any]: Сохранённые данные, `None` - если записи нет или она устарела
+    """
+
+    if signature is None or os.environ.get(CACHE_DISABLE_ENV):
+        return None
+
+    try:
+        with open(os.path.join(cache_dir(), name), "rb") as file:
+            version, stored_signature, data = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):  # Записи нет или она повреждена
+        return None
+
+    if version != CACHE_VERSION or tuple(stored_signature) != signature:
+        return None
+
+    return data
+
+
+def store_cache(name: str, signature: Optional[DeviceSignature], data: Any):
+    """
+    Сохранение данных в кэш на диске. Запись заменяется атомарно,
+    ошибки записи игнорируются: кэш лишь ускоряет запуск
+
+    Args:
+        name (str): Имя записи кэша
+        signature (Optional[DeviceSignature]): Признак актуальности данных
+        data (Any): Данные (значения, поддерживаемые `marshal`)
+    """
+
+    if signature is None or os.environ.get(CACHE_DISABLE_ENV):
+        return
+
+    directory = cache_dir()
+    path = os.path.join(directory, name)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(temporary, "wb") as file:
+            marshal.dump((CACHE_VERSION, signature, data), file)
+        os.replace(temporary, path)
+    except (OSError, ValueError):
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
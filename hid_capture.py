@@ -0,0 +1,227 @@
+import mmap
+import struct
+from threading import Lock
+from time import monotonic_ns, time_ns
+from typing import Iterator, NamedTuple, Optional
+
+CAPTURE_MAGIC = b"HIDCAP\x00\x01"  # Сигнатура и версия формата журнала
+CAPTURE_HEADER = struct.Struct("<8sQ")  # Сигнатура и момент начала записи (время UNIX, нс)
+CAPTURE_RECORD = struct.Struct("<QBBH")  # Момент (monotonic, нс), направление, ID отчёта, длина данных
+CAPTURE_INITIAL_SIZE = 1 << 20  # Начальный размер файла журнала
+
+CAPTURE_INPUT = 0  # Входной отчёт (от устройства)
+CAPTURE_OUTPUT = 1  # Выходной отчёт (к устройству)
+
+
+class CaptureRecord(NamedTuple):
+    """
+    Запись журнала отчётов
+
+    Attributes:
+        timestamp (int): Момент приёма или отправки (monotonic, нс)
+        direction (int): Направление (`CAPTURE_INPUT`, `CAPTURE_OUTPUT`)
+        report_id (int): ID отчёта (`0` - отчёты без нумерации)
+        payload (memoryview): Данные отчёта в том виде, в котором они переданы
+    """
+
+    timestamp: int
+    direction: int
+    report_id: int
+    payload: memoryview
+
+
+class CaptureWriter:
+    """
+    Запись потока отчётов в отображённый в память журнал только на добавление.
+
+    Каждая запись - заголовок `CAPTURE_RECORD` и данные отчёта, которые
+    упаковываются прямо в отображение файла без создания промежуточных объектов.
+    При нехватке места файл удваивается, при закрытии обрезается
+    до фактического размера. Незавершённый журнал (например, после падения процесса)
+    читается до первой нулевой записи
+    """
+
+    def __init__(self, path: str, initial_size: int = CAPTURE_INITIAL_SIZE):
+        """
+        Создание журнала
+
+        Args:
+            path (str): Путь до файла журнала (перезаписывается)
+            initial_size (int): Начальный размер файла журнала
+        """
+
+        self.path = path
+        self._file = open(path, "w+b")  # pylint: disable=consider-using-with
+        self._file.truncate(max(initial_size, CAPTURE_HEADER.size + CAPTURE_RECORD.size))
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        CAPTURE_HEADER.pack_into(self._map, 0, CAPTURE_MAGIC, time_ns())
+        self._position = CAPTURE_HEADER.size  # Позиция следующей записи
+        self._lock = Lock()  # Отчёты записываются из потоков приёма и отправки
+        self.records_count = 0  # Количество записанных отчётов
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    @property
+    def size(self) -> int:
+        """
+        Возвращает объём записанных данных
+
+        Returns:
+            int: Объём записанных данных в байтах вместе с заголовком журнала
+        """
+
+        return self._position
+
+
+    def append(
+            self,
+            direction: int,
+            report_id: int,
+            payload: bytes | bytearray | memoryview,
+            timestamp: Optional[int] = None
+        ):
+        """
+        Добавление отчёта в журнал
+
+        Args:
+            direction (int): Направление (`CAPTURE_INPUT`, `CAPTURE_OUTPUT`)
+            report_id (int): ID отчёта
+            payload (bytes | bytearray | memoryview): Данные отчёта
+            timestamp (Optional[int]): Момент отчёта (monotonic, нс), `None` - текущий
+        """
+
+        size = len(payload)
+        with self._lock:
+            start = self._position
+            data_start = start + CAPTURE_RECORD.size
+            end = data_start + size
+            if end > len(self._map):
+                self._grow(end)
+            # Данные записываем раньше заголовка: запись с нулевым моментом считается концом журнала
+            self._map[data_start:end] = payload
+            CAPTURE_RECORD.pack_into(
+                self._map, start, monotonic_ns() if timestamp is None else timestamp, direction, report_id, size
+            )
+            self._position = end
+            self.records_count += 1
+
+
+    def _grow(self, required: int):
+        """
+        Увеличение файла журнала
+
+        Args:
+            required (int): Необходимый размер файла
+        """
+
+        size = len(self._map)
+        while size < required:
+            size *= 2
+        self._map.resize(size)  # Изменяет размер и отображения, и файла
+
+
+    def flush(self):
+        """
+        Сброс записанных данных на диск
+        """
+
+        with self._lock:
+            self._map.flush(0, self._position)
+
+
+    def close(self):
+        """
+        Закрытие журнала с обрезкой файла до фактического размера
+        """
+
+        with self._lock:
+            if self._map.closed:
+                return
+            self._map.flush()
+            self._map.close()
+            self._file.truncate(self._position)
+            self._file.close()
+
+
+class CaptureReader:
+    """
+    Чтение журнала отчётов через отображение файла в память.
+    Данные записей возвращаются как представления отображения без копирования
+    и действительны до закрытия журнала
+    """
+
+    def __init__(self, path: str):
+        """
+        Открытие журнала
+
+        Args:
+            path (str): Путь до файла журнала
+        Raises:
+            ValueError: Если файл не является журналом отчётов
+        """
+
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if len(self._map) < CAPTURE_HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a report capture")
+        magic, self.started_at = CAPTURE_HEADER.unpack_from(self._map, 0)
+        if magic != CAPTURE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a report capture")
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return self.records()
+
+
+    def records(self, direction: Optional[int] = None) -> Iterator[CaptureRecord]:
+        """
+        Перебор записей журнала
+
+        Args:
+            direction (Optional[int]): Направление отчётов (`None` - все)
+        Yields:
+            CaptureRecord: Записи журнала в порядке добавления
+        """
+
+        view = self._view
+        end = len(view)
+        position = CAPTURE_HEADER.size
+        while position + CAPTURE_RECORD.size <= end:
+            timestamp, record_direction, report_id, size = CAPTURE_RECORD.unpack_from(view, position)
+            data_start = position + CAPTURE_RECORD.size
+            if not timestamp or data_start + size > end:  # Конец незавершённого журнала
+                break
+            position = data_start + size
+            if direction is None or record_direction == direction:
+                yield CaptureRecord(timestamp, record_direction, report_id, view[data_start:position])
+
+
+    def close(self):
+        """
+        Закрытие журнала. Представления данных записей должны быть освобождены
+        """
+
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:  # Остались представления записей - отображение закроется сборщиком мусора
+            pass
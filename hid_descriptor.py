@@ -0,0 +1,381 @@
+import struct
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+INPUT = "input"  # Входной отчёт
+OUTPUT = "output"  # Выходной отчёт
+FEATURE = "feature"  # Отчёт функций
+
+_MAIN_ITEM_KINDS = {0x8: INPUT, 0x9: OUTPUT, 0xB: FEATURE}  # Теги основных элементов отчётов
+_MAIN_COLLECTION = 0xA  # Тег начала коллекции
+_MAIN_END_COLLECTION = 0xC  # Тег конца коллекции
+
+_TYPE_MAIN = 0
+_TYPE_GLOBAL = 1
+_TYPE_LOCAL = 2
+
+_GLOBAL_USAGE_PAGE = 0x0
+_GLOBAL_LOGICAL_MINIMUM = 0x1
+_GLOBAL_LOGICAL_MAXIMUM = 0x2
+_GLOBAL_REPORT_SIZE = 0x7
+_GLOBAL_REPORT_ID = 0x8
+_GLOBAL_REPORT_COUNT = 0x9
+_GLOBAL_PUSH = 0xA
+_GLOBAL_POP = 0xB
+
+_LOCAL_USAGE = 0x0
+_LOCAL_USAGE_MINIMUM = 0x1
+_LOCAL_USAGE_MAXIMUM = 0x2
+
+_FLAG_CONSTANT = 0x01  # Поле-заполнитель
+_FLAG_VARIABLE = 0x02  # Поле-переменная (иначе массив)
+
+_LONG_ITEM_PREFIX = 0xFE  # Префикс длинного элемента
+
+# Форматы struct для выровненных по байту полей: (размер в битах, знаковое) -> формат
+_STRUCT_FORMATS = {(8, False): "B", (8, True): "b", (16, False): "H", (16, True): "h", (32, False): "I", (32, True): "i"}
+
+
+class ReportField(NamedTuple):
+    """
+    Поле отчёта, описанное одним основным элементом дескриптора
+
+    Attributes:
+        bit_offset (int): Смещение первого элемента поля в битах от начала данных отчёта
+        bit_size (int): Размер одного элемента в битах
+        count (int): Количество элементов
+        usage_page (int): Страница использования
+        usages (Tuple[int, ...]): Использования элементов
+        logical_minimum (int): Логический минимум
+        logical_maximum (int): Логический максимум
+        flags (int): Флаги основного элемента
+    """
+
+    bit_offset: int  # Смещение в битах
+    bit_size: int  # Размер элемента в битах
+    count: int  # Количество элементов
+    usage_page: int  # Страница использования
+    usages: Tuple[int, ...]  # Использования элементов
+    logical_minimum: int  # Логический минимум
+    logical_maximum: int  # Логический максимум
+    flags: int  # Флаги основного элемента
+
+    @property
+    def is_constant(self) -> bool:
+        return bool(self.flags & _FLAG_CONSTANT)
+
+    @property
+    def is_signed(self) -> bool:
+        return self.logical_minimum < 0
+
+
+class ReportLayout:
+    """
+    Раскладка одного отчёта: его ID, тип, поля и размер
+    """
+
+    __slots__ = ("report_id", "kind", "fields", "bit_length")
+
+    def __init__(self, report_id: int, kind: str):
+        self.report_id = report_id
+        self.kind = kind
+        self.fields: List[ReportField] = []
+        self.bit_length = 0
+
+
+    @property
+    def size(self) -> int:
+        """
+        Размер данных отчёта в байтах без Report ID
+
+        Returns:
+            int: Размер данных отчёта
+        """
+
+        return (self.bit_length + 7) // 8
+
+
+class ReportDescriptor:
+    """
+    Разобранный дескриптор отчётов HID устройства
+    """
+
+    __slots__ = ("raw", "reports", "uses_report_ids", "usage_page", "usage")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw  # Исходный дескриптор
+        self.reports: Dict[Tuple[str, int], ReportLayout] = {}  # Раскладки по (тип, ID отчёта)
+        self.uses_report_ids = False  # Используются ли нумерованные отчёты
+        self.usage_page = 0  # Страница использования первой коллекции
+        self.usage = 0  # Использование первой коллекции
+
+
+    def report(self, kind: str, report_id: int = 0) -> Optional[ReportLayout]:
+        """
+        Получение раскладки отчёта
+
+        Args:
+            kind (str): Тип отчёта (`INPUT`, `OUTPUT`, `FEATURE`)
+            report_id (int): ID отчёта
+        Returns:
+            Optional[ReportLayout]: Раскладка, `None` - если отчёт не описан
+        """
+
+        return self.reports.get((kind, report_id))
+
+
+    def report_size(self, kind: str, report_id: int = 0) -> int:
+        """
+        Размер данных отчёта в байтах без Report ID
+
+        Args:
+            kind (str): Тип отчёта
+            report_id (int): ID отчёта
+        Returns:
+            int: Размер данных, `0` - если отчёт не описан
+        """
+
+        layout = self.reports.get((kind, report_id))
+
+        return layout.size if layout is not None else 0
+
+
+    def max_report_size(self, kind: str) -> int:
+        """
+        Максимальный размер данных отчётов указанного типа без Report ID
+
+        Args:
+            kind (str): Тип отчёта
+        Returns:
+            int: Максимальный размер данных, `0` - если отчётов нет
+        """
+
+        return max((layout.size for (layout_kind, _), layout in self.reports.items() if layout_kind == kind), default=0)
+
+
+def _item_value(data: bytes, signed: bool) -> int:
+    """
+    Значение данных элемента дескриптора
+
+    Args:
+        data (bytes): Данные элемента (0, 1, 2 или 4 байта)
+        signed (bool): Знаковое ли значение
+    Returns:
+        int: Значение элемента
+    """
+
+    return int.from_bytes(data, "little", signed=signed) if data else 0
+
+
+def parse_report_descriptor(raw: bytes) -> ReportDescriptor:
+    """
+    Разбор дескриптора отчётов HID
+
+    Args:
+        raw (bytes): Дескриптор отчётов
+    Returns:
+        ReportDescriptor: Раскладки всех описанных отчётов
+    Raises:
+        ValueError: Если дескриптор обрывается посреди элемента
+    """
+
+    descriptor = ReportDescriptor(bytes(raw))
+    global_state = {"usage_page": 0, "logical_minimum": 0, "logical_maximum": 0, "report_size": 0, "report_id": 0, "report_count": 0}
+    global_stack: List[Dict[str, int]] = []
+    usages: List[int] = []
+    usage_minimum: Optional[int] = None
+    collection_depth = 0
+    bit_offsets: Dict[Tuple[str, int], int] = {}
+
+    position = 0
+    while position < len(raw):
+        prefix = raw[position]
+        if prefix == _LONG_ITEM_PREFIX:  # Длинные элементы не несут информации о раскладке
+            if position + 1 >= len(raw):
+                raise ValueError("Truncated long item in report descriptor")
+            position += 3 + raw[position + 1]
+            continue
+
+        size = (0, 1, 2, 4)[prefix & 0x3]
+        item_type = (prefix >> 2) & 0x3
+        tag = prefix >> 4
+        data = raw[position + 1:position + 1 + size]
+        if len(data) != size:
+            raise ValueError(f"Truncated item at offset {position} in report descriptor")
+        position += 1 + size
+
+        if item_type == _TYPE_MAIN:
+            if tag in _MAIN_ITEM_KINDS:
+                kind = _MAIN_ITEM_KINDS[tag]
+                report_id = global_state["report_id"]
+                key = (kind, report_id)
+                layout = descriptor.reports.get(key)
+                if layout is None:
+                    layout = descriptor.reports[key] = ReportLayout(report_id, kind)
+                bit_offset = bit_offsets.get(key, 0)
+                field = ReportField(
+                    bit_offset = bit_offset,
+                    bit_size = global_state["report_size"],
+                    count = global_state["report_count"],
+                    usage_page = global_state["usage_page"],
+                    usages = tuple(usages),
+                    logical_minimum = global_state["logical_minimum"],
+                    logical_maximum = global_state["logical_maximum"],
+                    flags = _item_value(data, False)
+                )
+                layout.fields.append(field)
+                bit_offsets[key] = bit_offset + field.bit_size * field.count
+                layout.bit_length = bit_offsets[key]
+            elif tag == _MAIN_COLLECTION:
+                if collection_depth == 0 and descriptor.usage_page == 0:  # Использование верхнего уровня
+                    descriptor.usage_page = global_state["usage_page"]
+                    descriptor.usage = usages[0] if usages else 0
+                collection_depth += 1
+            elif tag == _MAIN_END_COLLECTION:
+                collection_depth = max(collection_depth - 1, 0)
+            usages = []  # Локальные элементы действуют до следующего основного
+            usage_minimum = None
+
+        elif item_type == _TYPE_GLOBAL:
+            if tag == _GLOBAL_USAGE_PAGE:
+                global_state["usage_page"] = _item_value(data, False)
+            elif tag == _GLOBAL_LOGICAL_MINIMUM:
+                global_state["logical_minimum"] = _item_value(data, True)
+            elif tag == _GLOBAL_LOGICAL_MAXIMUM:
+                global_state["logical_maximum"] = _item_value(data, global_state["logical_minimum"] < 0)
+            elif tag == _GLOBAL_REPORT_SIZE:
+                global_state["report_size"] = _item_value(data, False)
+            elif tag == _GLOBAL_REPORT_ID:
+                global_state["report_id"] = _item_value(data, False)
+                descriptor.uses_report_ids = True
+            elif tag == _GLOBAL_REPORT_COUNT:
+                global_state["report_count"] = _item_value(data, False)
+            elif tag == _GLOBAL_PUSH:
+                global_stack.append(dict(global_state))
+            elif tag == _GLOBAL_POP and global_stack:
+                global_state = global_stack.pop()
+
+        elif item_type == _TYPE_LOCAL:
+            value = _item_value(data, False)
+            if tag == _LOCAL_USAGE:
+                usages.append(value)
+            elif tag == _LOCAL_USAGE_MINIMUM:
+                usage_minimum = value
+            elif tag == _LOCAL_USAGE_MAXIMUM and usage_minimum is not None:
+                usages.extend(range(usage_minimum, value + 1))
+
+    return descriptor
+
+
+class ReportDecoder:
+    """
+    Предкомпилированный декодер данных отчёта.
+
+    Все выровненные по байту поля размером 8, 16 и 32 бит читаются одним
+    вызовом `struct.Struct.unpack_from`, остальные поля извлекаются сдвигом
+    и маской из целого числа, построенного по данным отчёта один раз
+    """
+
+    __slots__ = ("layout", "offset", "size", "_struct", "_bit_fields", "_order")
+
+    def __init__(self, layout: ReportLayout, offset: int = 0):
+        """
+        Компиляция декодера
+
+        Args:
+            layout (ReportLayout): Раскладка отчёта
+            offset (int): Смещение данных отчёта в буфере (`1` - если первым идёт Report ID)
+        """
+
+        self.layout = layout
+        self.offset = offset
+        self.size = layout.size
+
+        aligned: List[Tuple[int, str, int]] = []  # (смещение в байтах, формат, порядковый номер)
+        bit_fields: List[Tuple[int, int, int, int]] = []  # (смещение в битах, маска, знаковый бит, номер)
+        index = 0
+        for field in layout.fields:
+            if field.is_constant:  # Поля-заполнители не декодируются
+                continue
+            struct_format = _STRUCT_FORMATS.get((field.bit_size, field.is_signed))
+            for element in range(field.count):
+                bit_offset = field.bit_offset + element * field.bit_size
+                if struct_format is not None and bit_offset % 8 == 0:
+                    aligned.append((bit_offset // 8, struct_format, index))
+                else:
+                    sign_bit = 1 << (field.bit_size - 1) if field.is_signed else 0
+                    bit_fields.append((bit_offset, (1 << field.bit_size) - 1, sign_bit, index))
+                index += 1
+
+        # Собираем единый формат struct с пропуском байт между полями:
+        struct_format = "<"
+        position = 0
+        for byte_offset, element_format, _ in aligned:
+            if byte_offset > position:
+                struct_format += f"{byte_offset - position}x"
+            struct_format += element_format
+            position = byte_offset + struct.calcsize("<" + element_format)
+        self._struct = struct.Struct(struct_format) if aligned else None
+        self._bit_fields = tuple(bit_field[:3] for bit_field in bit_fields)
+
+        # Порядок значений: сначала результаты struct, затем битовые поля
+        positions = [item[2] for item in aligned] + [bit_field[3] for bit_field in bit_fields]
+        order = [0] * len(positions)
+        for source, target in enumerate(positions):
+            order[target] = source
+        self._order = tuple(order)
+
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Tuple[int, ...]:
+        """
+        Декодирование данных отчёта
+
+        Args:
+            data (bytes | bytearray | memoryview): Данные отчёта (с Report ID, если `offset` = 1)
+        Returns:
+            Tuple[int, ...]: Значения всех элементов полей отчёта в порядке дескриптора
+        """
+
+        values = list(self._struct.unpack_from(data, self.offset)) if self._struct is not None else []
+        if self._bit_fields:
+            number = int.from_bytes(data[self.offset:self.offset + self.size], "little")
+            for bit_offset, mask, sign_bit in self._bit_fields:
+                value = (number >> bit_offset) & mask
+                if value & sign_bit:  # Расширяем знак
+                    value -= mask + 1
+                values.append(value)
+
+        return tuple(values[source] for source in self._order)
+
+
+_cache_lock = Lock()
+_descriptor_cache: Dict[bytes, Tuple[ReportDescriptor, Dict[Tuple[str, int], ReportDecoder]]] = {}  # Кэш по содержимому дескриптора
+
+
+def compile_descriptor(raw: bytes) -> Tuple[ReportDescriptor, Dict[Tuple[str, int], ReportDecoder]]:
+    """
+    Разбор дескриптора и компиляция декодеров всех его отчётов.
+    Результат кэшируется по содержимому дескриптора (не больше 4 КБ,
+    поэтому сам дескриптор - дешёвый ключ и хэш-функция не нужна)
+
+    Args:
+        raw (bytes): Дескриптор отчётов
+    Returns:
+        Tuple[ReportDescriptor, Dict[Tuple[str, int], ReportDecoder]]:
+            Разобранный дескриптор и декодеры по (тип, ID отчёта)
+    """
+
+    key = bytes(raw)
+    with _cache_lock:
+        cached = _descriptor_cache.get(key)
+    if cached is not None:
+        return cached
+
+    descriptor = parse_report_descriptor(raw)
+    offset = 1 if descriptor.uses_report_ids else 0  # Нумерованные отчёты начинаются с Report ID
+    decoders = {key: ReportDecoder(layout, offset) for key, layout in descriptor.reports.items()}
+    compiled = (descriptor, decoders)
+    with _cache_lock:
+        _descriptor_cache[key] = compiled
+
+    return compiled
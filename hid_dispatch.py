@@ -0,0 +1,172 @@
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPORT_ID_COUNT = 256  # Количество возможных ID отчёта
+CRSF_TYPE_OFFSET = 2  # Смещение типа кадра CRSF от байта синхронизации
+
+ReportHandler = Callable[[memoryview | bytes], Any]
+"""Обработчик отчёта: отчёт в том виде, в котором он принят (действителен только во время вызова)"""
+
+_Checks = Tuple[Tuple[int, int], ...]  # Пары (смещение от начала данных отчёта, значение байта)
+_Route = Tuple[_Checks, Optional[ReportHandler]]
+
+
+class DispatchTable:
+    """
+    Таблица маршрутизации входных отчётов.
+
+    Маршрут выбирает отчёты по ID отчёта и/или байтам данных отчёта
+    (префиксу или типу кадра CRSF) и передаёт их обработчику либо
+    во внутренний буфер устройства. Маршруты компилируются в таблицу
+    из 256 кортежей по ID отчёта, поэтому отчёт без подходящего
+    маршрута отбрасывается после одного обращения по индексу
+    и сравнения нескольких байт, до буферизации и создания объектов
+    """
+
+    def __init__(self, buffer_unmatched: bool = False):
+        """
+        Инициализация таблицы
+
+        Args:
+            buffer_unmatched (bool):
+                Передавать ли в буфер отчёты без подходящего маршрута (`False` - отбрасывать)
+        """
+
+        self.buffer_unmatched = buffer_unmatched
+        self._routes: Dict[int, Tuple[Optional[int], _Checks, Optional[ReportHandler]]] = {}  # Маршруты по номеру
+        self._next_route = 0
+        self._lock = Lock()
+        self._table: List[Tuple[_Route, ...]] = [()] * REPORT_ID_COUNT  # Заменяется целиком при изменении
+
+        self.handled_count = 0  # Количество отчётов, переданных обработчикам
+        self.buffered_count = 0  # Количество отчётов, переданных в буфер
+        self.dropped_count = 0  # Количество отброшенных отчётов
+
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+
+    def add(
+            self,
+            handler: Optional[ReportHandler] = None,
+            report_id: Optional[int] = None,
+            prefix: bytes = b"",
+            offset: int = 0,
+            crsf_type: Optional[int] = None
+        ) -> int:
+        """
+        Добавление маршрута. Отчёт передаётся первому подходящему маршруту
+        в порядке добавления
+
+        Args:
+            handler (Optional[ReportHandler]): Обработчик отчётов (`None` - передавать в буфер)
+            report_id (Optional[int]):
+                ID отчёта (`None` - любой, `0` - ненумерованные отчёты)
+            prefix (bytes): Ожидаемые байты данных отчёта (без Report ID) начиная с `offset`
+            offset (int): Смещение префикса или начала кадра CRSF в данных отчёта
+            crsf_type (Optional[int]): Тип кадра CRSF, начинающегося со смещения `offset`
+        Returns:
+            int: Номер маршрута для `remove`
+        Raises:
+            ValueError: Если указаны и префикс, и тип кадра CRSF, или ID отчёта вне диапазона
+        """
+
+        if crsf_type is not None:
+            if prefix:
+                raise ValueError("Route accepts either a prefix or a CRSF frame type")
+            prefix = bytes((crsf_type,))
+            offset += CRSF_TYPE_OFFSET
+        if report_id is not None and not 0 <= report_id < REPORT_ID_COUNT:
+            raise ValueError(f"Invalid report ID {report_id}")
+        checks = tuple((offset + index, value) for index, value in enumerate(prefix))
+
+        with self._lock:
+            route = self._next_route
+            self._next_route += 1
+            self._routes[route] = (report_id, checks, handler)
+            self._compile()
+
+        return route
+
+
+    def remove(self, route: int):
+        """
+        Удаление маршрута
+
+        Args:
+            route (int): Номер маршрута
+        """
+
+        with self._lock:
+            if self._routes.pop(route, None) is not None:
+                self._compile()
+
+
+    def _compile(self):
+        """
+        Сборка таблицы маршрутов по ID отчёта, вызывается под блокировкой
+        """
+
+        table: List[List[_Route]] = [[] for _ in range(REPORT_ID_COUNT)]
+        for report_id, checks, handler in self._routes.values():
+            for routes in table if report_id is None else (table[report_id],):
+                routes.append((checks, handler))
+
+        self._table = [tuple(routes) for routes in table]  # Поток чтения видит старую или новую таблицу целиком
+
+
+    def dispatch(self, report: bytes | bytearray | memoryview, size: int, has_report_id: bool) -> bool:
+        """
+        Маршрутизация принятого отчёта
+
+        Args:
+            report (bytes | bytearray | memoryview): Отчёт в том виде, в котором он принят
+            size (int): Размер отчёта
+            has_report_id (bool): Начинается ли отчёт с Report ID
+        Returns:
+            bool: Следует ли передать отчёт в буфер
+        """
+
+        if has_report_id:
+            routes = self._table[report[0]]
+            start = 1
+        else:
+            routes = self._table[0]
+            start = 0
+
+        for checks, handler in routes:
+            for position, value in checks:
+                position += start
+                if position >= size or report[position] != value:
+                    break
+            else:
+                if handler is None:
+                    self.buffered_count += 1
+                    return True
+                self.handled_count += 1
+                handler(report[:size])
+                return False
+
+        if self.buffer_unmatched:
+            self.buffered_count += 1
+            return True
+        self.dropped_count += 1
+
+        return False
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Получение счётчиков таблицы
+
+        Returns:
+            Dict[str, int]: Счётчики таблицы
+        """
+
+        return {
+            "routes": len(self._routes),
+            "handled": self.handled_count,
+            "buffered": self.buffered_count,
+            "dropped": self.dropped_count
+        }
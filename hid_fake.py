@@ -0,0 +1,276 @@
+import random
+import socket
+import struct
+from select import POLLIN, poll
+from threading import Event, Thread
+from time import monotonic, monotonic_ns
+from typing import Optional
+
+from base_hid import HIR_REPORT_SIZE
+from HID import Hid
+
+FAKE_DEVICE_PATH = b"fake"  # Путь фиктивного устройства
+FAKE_SOCKET_BUFFER_SIZE = 1 << 20  # Размер буферов сокетов фиктивного устройства
+FAKE_POLL_INTERVAL = 0.05  # Максимальный интервал ожидания потока устройства
+
+REPORT_HEADER = struct.Struct("<QQ")  # Номер отчёта и момент отправки (monotonic, нс)
+
+
+class FakeHid(Hid):
+    """
+    Фиктивное HID устройство для проверок и измерений без оборудования.
+
+    Вместо узла hidraw используется пара сокетов `SOCK_SEQPACKET`, которая,
+    как и hidraw, сохраняет границы отчётов, поэтому чтение, запись, epoll,
+    пробуждение и обработка отключения проходят через те же пути, что и в `Hid`.
+    Поток устройства генерирует входные отчёты с заданной частотой и пачками,
+    возвращает выходные отчёты обратно (loopback) и может имитировать
+    EAGAIN при готовности дескриптора и отключение устройства (HUP).
+
+    Первые байты полезной нагрузки сгенерированного отчёта содержат
+    номер отчёта и момент его отправки (`REPORT_HEADER`), что позволяет
+    измерять задержку приёма
+    """
+
+    _input_has_report_id = True  # Отчёты устройства всегда начинаются с Report ID
+
+    def __init__(
+            self,
+            report_size: int = HIR_REPORT_SIZE,
+            rate: float = 0.0,
+            burst: int = 1,
+            loopback: bool = True,
+            eagain_ratio: float = 0.0,
+            hup_after: Optional[int] = None,
+            report_descriptor: Optional[bytes] = None,
+            send_report_id: int = 0,
+            seed: Optional[int] = None
+        ):
+        """
+        Инициализация фиктивного устройства
+
+        Args:
+            report_size (int): Размер полезной нагрузки отчёта (без Report ID)
+            rate (float): Частота генерации входных отчётов в секунду (`0` - не генерировать)
+            burst (int): Количество отчётов, отправляемых одной пачкой
+            loopback (bool): Возвращать ли выходные отчёты как входные
+            eagain_ratio (float): Доля пробуждений, на которых чтение завершается EAGAIN
+            hup_after (Optional[int]):
+                Количество отправленных отчётов, после которого устройство отключается
+            report_descriptor (Optional[bytes]): Дескриптор отчётов устройства
+            send_report_id (int): ID отчёта по-умолчанию при отправке отчёта
+            seed (Optional[int]): Начальное значение генератора случайных чисел
+        """
+
+        self.report_size = report_size
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.loopback = loopback
+        self.eagain_ratio = eagain_ratio
+        self.hup_after = hup_after
+        self.fake_report_descriptor = report_descriptor
+        self.peer: Optional[socket.socket] = None  # Сокет на стороне устройства
+        self._random = random.Random(seed)
+        self._device_thread: Optional[Thread] = None  # Поток устройства
+        self._device_stop = Event()  # Сигнал остановки потока устройства
+
+        self.sent_count = 0  # Количество отправленных устройством отчётов
+        self.received_count = 0  # Количество принятых устройством отчётов
+        self.dropped_count = 0  # Количество отчётов, не поместившихся в буфер хоста
+        self.eagain_count = 0  # Количество имитированных EAGAIN
+
+        super().__init__(FAKE_DEVICE_PATH, send_report_id)
+        self.input_report_length = report_size + 1  # Добавляем байт для Report ID
+        self.output_report_length = report_size + 1  # Добавляем байт для Report ID
+        self.feature_report_length = report_size + 1  # Добавляем байт для Report ID
+        self._init_output_buffer()
+
+
+    def _open_path(self, path):
+        self.path = path if isinstance(path, bytes) else path.encode()
+        self._open_node(None)
+
+
+    def _find_reconnect_node(self):
+        return self.path  # Фиктивное устройство всегда доступно для переподключения
+
+
+    def _open_node(self, node):
+        # Сторона хоста - неблокирующий дескриптор, как у узла hidraw
+        self._stop_device()  # Поток предыдущего подключения уже завершён при отключении
+        host, peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        for sock in (host, peer):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, FAKE_SOCKET_BUFFER_SIZE)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, FAKE_SOCKET_BUFFER_SIZE)
+        host.setblocking(False)
+        peer.setblocking(False)
+
+        self.hidraw_node = None
+        self.fd = host.detach()  # Дескриптор закрывается через `os.close`, как и у hidraw
+        self.peer = peer
+        if self.fake_report_descriptor:
+            self.set_report_descriptor(self.fake_report_descriptor)
+
+        self._device_stop.clear()
+        self._device_thread = Thread(target=self._device_loop, args=(peer,), name="FakeHidDevice", daemon=True)
+        self._device_thread.start()
+        self._attach_fd()
+
+
+    def _stop_device(self):
+        """
+        Остановка потока устройства и закрытие сокета устройства
+        """
+
+        self._device_stop.set()
+        if self._device_thread is not None:
+            self._device_thread.join()
+            self._device_thread = None
+        if self.peer is not None:
+            self.peer.close()
+            self.peer = None
+
+
+    def disconnect(self):
+        """
+        Имитация отключения устройства: хост получает EPOLLHUP
+        """
+
+        self._stop_device()
+
+
+    def _make_report(self, sequence: int) -> bytearray:
+        """
+        Формирование входного отчёта с номером и моментом отправки
+
+        Args:
+            sequence (int): Номер отчёта
+        Returns:
+            bytearray: Отчёт вместе с Report ID
+        """
+
+        report = bytearray(self.input_report_length)
+        report[0] = self._send_report_id
+        if self.report_size >= REPORT_HEADER.size:
+            REPORT_HEADER.pack_into(report, 1, sequence, monotonic_ns())
+
+        return report
+
+
+    def _send(self, peer: socket.socket, report: bytes | bytearray | memoryview) -> bool:
+        """
+        Отправка отчёта хосту
+
+        Args:
+            peer (socket.socket): Сокет устройства
+            report (bytes | bytearray | memoryview): Отчёт
+        Returns:
+            bool: Продолжать ли работу устройства
+        """
+
+        try:
+            peer.send(report)
+        except BlockingIOError:  # Хост не успевает читать - отчёт теряется, как при переполнении hidraw
+            self.dropped_count += 1
+            return True
+        except OSError:  # Хост закрыл устройство
+            return False
+
+        self.sent_count += 1
+        if self.hup_after is not None and self.sent_count >= self.hup_after:
+            return False
+
+        return True
+
+
+    def _device_loop(self, peer: socket.socket):
+        """
+        Цикл потока устройства: генерация входных отчётов и loopback выходных
+        """
+
+        poller = poll()
+        poller.register(peer.fileno(), POLLIN)
+        buffer = bytearray(max(self.output_report_length, self.input_report_length))
+        interval = self.burst / self.rate if self.rate else None
+        next_burst = monotonic()
+        sequence = 0
+        running = True
+
+        while running and not self._device_stop.is_set():
+            if interval is not None:
+                now = monotonic()
+                if now >= next_burst:
+                    for _ in range(self.burst):
+                        running = self._send(peer, self._make_report(sequence))
+                        sequence += 1
+                        if not running:
+                            break
+                    next_burst += interval
+                    if next_burst < now:  # Генерация отстала - не догоняем пропущенные пачки
+                        next_burst = now + interval
+                timeout = min(max(next_burst - monotonic(), 0), FAKE_POLL_INTERVAL)
+            else:
+                timeout = FAKE_POLL_INTERVAL
+
+            if not running or not poller.poll(timeout * 1000):
+                continue
+
+            while running:  # Принимаем все выходные отчёты хоста
+                try:
+                    size = peer.recv_into(buffer)
+                except BlockingIOError:
+                    break
+                except OSError:
+                    running = False
+                    break
+                if not size:
+                    running = False
+                    break
+                self.received_count += 1
+                if self.loopback:
+                    running = self._send(peer, memoryview(buffer)[:size])
+
+        if not self._device_stop.is_set():  # Имитация отключения: хост получает EPOLLHUP
+            peer.close()
+            self.peer = None
+
+
+    def _inject_eagain(self) -> bool:
+        """
+        Определение, нужно ли имитировать EAGAIN при очередном чтении
+
+        Returns:
+            bool: Нужно ли имитировать EAGAIN
+        """
+
+        if self.eagain_ratio and self._random.random() < self.eagain_ratio:
+            self.eagain_count += 1
+            return True
+
+        return False
+
+
+    def recv_report(self):
+        if self._inject_eagain():
+            return b''
+        return Hid.recv_report(self)
+
+
+    def _recv_report_into(self, slot):
+        if self._inject_eagain():
+            return 0
+        return Hid._recv_report_into(self, slot)
+
+
+    def _drain(self):
+        # Имитируем ложную готовность: первое чтение пробуждения завершается EAGAIN
+        if self._inject_eagain():
+            if self.metrics is not None:
+                self.metrics.record_input(0, 0)
+            return 0
+        return Hid._drain(self)
+
+
+    def close(self):
+        self._stop_device()
+        Hid.close(self)
@@ -0,0 +1,488 @@
+import ctypes
+import ctypes.util
+import os
+import socket
+import struct
+from abc import abstractmethod
+from select import poll, POLLIN
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from hidraw_index import hidraw_index
+
+NETLINK_KOBJECT_UEVENT = 15  # Протокол netlink для событий uevent ядра
+UEVENT_KERNEL_GROUP = 1  # Группа рассылки событий ядра (до обработки udev)
+UEVENT_UDEV_GROUP = 2  # Группа рассылки событий udev (права и ссылки узла уже применены)
+UEVENT_BUFFER_SIZE = 64 * 1024  # Размер буфера приёма событий
+UDEV_CONTROL_PATH = "/run/udev/control"  # Сокет управления udev: есть, если udev запущен
+UDEV_MESSAGE_PREFIX = b"libudev\0"  # Начало сообщения udev
+UDEV_HEADER = struct.Struct("8sIIII")  # Префикс, magic, размер заголовка, смещение и длина свойств
+
+RECONNECT_RETRY_DELAY = 0.05  # Задержка первого повтора неудачного переподключения, с
+RECONNECT_RETRY_MAX_DELAY = 2.0  # Максимальная задержка между повторами, с
+RECONNECT_RETRY_LIMIT = 10  # Количество попыток переподключения на одно событие
+WATCHER_POLL_INTERVAL = 0.1  # Максимальный интервал ожидания событий потоком наблюдателя, с
+
+IN_NONBLOCK = os.O_NONBLOCK  # Флаг неблокирующего дескриптора inotify
+IN_CLOEXEC = os.O_CLOEXEC  # Флаг закрытия дескриптора inotify при exec
+IN_CREATE = 0x00000100  # Событие создания файла
+IN_DELETE = 0x00000200  # Событие удаления файла
+INOTIFY_EVENT = struct.Struct("iIII")  # Заголовок struct inotify_event
+
+HIDRAW_PREFIX = "hidraw"  # Префикс имён узлов hidraw
+
+
+class HotplugEvent(NamedTuple):
+    """
+    Событие подключения или отключения узла hidraw
+
+    Attributes:
+        action (str): Действие (`add` или `remove`)
+        devname (str): Имя узла (`hidrawN`)
+    """
+
+    action: str  # Действие
+    devname: str  # Имя узла
+
+
+class BaseHotplugSource:
+    """
+    Базовый класс источников событий подключения устройств
+    """
+
+    @abstractmethod
+    def fileno(self) -> int:
+        """
+        Получение дескриптора источника для ожидания событий
+
+        Returns:
+            int: Файловый дескриптор
+        """
+
+
+    @abstractmethod
+    def read_events(self) -> List[HotplugEvent]:
+        """
+        Неблокирующее чтение всех накопленных событий об узлах hidraw
+
+        Returns:
+            List[HotplugEvent]: Список событий
+        """
+
+
+    @abstractmethod
+    def close(self):
+        """
+        Закрытие источника событий
+        """
+
+
+class NetlinkUeventSource(BaseHotplugSource):
+    """
+    Источник событий на основе сокета netlink событий uevent.
+    По умолчанию события принимаются от udev, когда права и ссылки
+    узла уже применены, а без udev - напрямую от ядра
+    """
+
+    def __init__(self, group: Optional[int] = None):
+        """
+        Инициализация источника
+
+        Args:
+            group (Optional[int]):
+                Группа рассылки (`None` - udev, если он запущен, иначе ядро)
+        """
+
+        if group is None:
+            group = UEVENT_UDEV_GROUP if os.path.exists(UDEV_CONTROL_PATH) else UEVENT_KERNEL_GROUP
+        self.group = group
+        self._socket = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        self._socket.setblocking(False)
+        self._socket.bind((0, group))
+
+
+    def fileno(self) -> int:
+        return self._socket.fileno()
+
+
+    @staticmethod
+    def parse_message(message: bytes) -> Optional[HotplugEvent]:
+        """
+        Разбор сообщения uevent ядра (`action@devpath\\0KEY=VALUE\\0...`)
+        или udev (заголовок `libudev` и свойства `KEY=VALUE\\0...`)
+
+        Args:
+            message (bytes): Сообщение
+        Returns:
+            Optional[HotplugEvent]:
+                Событие, `None` - если сообщение не относится к hidraw
+        """
+
+        if message.startswith(UDEV_MESSAGE_PREFIX):
+            if len(message) < UDEV_HEADER.size:
+                return None
+            _, _, _, properties_offset, properties_length = UDEV_HEADER.unpack_from(message)
+            properties = message[properties_offset:properties_offset + properties_length].split(b"\0")
+        else:
+            properties = message.split(b"\0")[1:]  # Первое поле - `action@devpath`
+
+        fields = {}
+        for field in properties:
+            key, _, value = field.partition(b"=")
+            fields[key] = value
+
+        if fields.get(b"SUBSYSTEM") != b"hidraw":
+            return None
+
+        devname = os.path.basename(fields.get(b"DEVNAME", b"").decode())
+
+        return HotplugEvent(fields.get(b"ACTION", b"").decode(), devname)
+
+
+    def read_events(self) -> List[HotplugEvent]:
+        events = []
+        while True:
+            try:
+                message = self._socket.recv(UEVENT_BUFFER_SIZE)
+            except BlockingIOError:
+                break
+            event = self.parse_message(message)
+            if event is not None:
+                events.append(event)
+
+        return events
+
+
+    def close(self):
+        self._socket.close()
+
+
+class InotifyDevSource(BaseHotplugSource):
+    """
+    Запасной источник событий: inotify на каталоге `/dev`
+    """
+
+    def __init__(self, dev_root: str = "/dev"):
+        """
+        Инициализация источника
+
+        Args:
+            dev_root (str): Каталог файлов устройств
+        Raises:
+            OSError: Если inotify недоступен
+        """
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, dev_root.encode(), IN_CREATE | IN_DELETE) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch on {dev_root} failed")
+
+
+    def fileno(self) -> int:
+        return self._fd
+
+
+    def read_events(self) -> List[HotplugEvent]:
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, UEVENT_BUFFER_SIZE)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):  # Разбираем последовательность struct inotify_event
+                _, mask, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + name_length].rstrip(b"\0").decode()
+                offset += name_length
+                if name.startswith(HIDRAW_PREFIX):
+                    events.append(HotplugEvent("add" if mask & IN_CREATE else "remove", name))
+
+        return events
+
+
+    def close(self):
+        os.close(self._fd)
+
+
+class ManualHotplugSource(BaseHotplugSource):
+    """
+    Источник событий, управляемый вручную (для тестирования без оборудования)
+    """
+
+    def __init__(self):
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        self._lock = Lock()
+        self._events: List[HotplugEvent] = []
+
+
+    def push(self, action: str, devname: str):
+        """
+        Добавление события
+
+        Args:
+            action (str): Действие (`add` или `remove`)
+            devname (str): Имя узла (`hidrawN`)
+        """
+
+        with self._lock:
+            self._events.append(HotplugEvent(action, devname))
+        os.write(self._write_fd, b"\0")  # Пробуждаем ожидающего наблюдателя
+
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+
+    def read_events(self) -> List[HotplugEvent]:
+        try:
+            os.read(self._read_fd, UEVENT_BUFFER_SIZE)
+        except BlockingIOError:
+            pass
+        with self._lock:
+            events, self._events = self._events, []
+
+        return events
+
+
+    def close(self):
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+
+def open_default_source() -> BaseHotplugSource:
+    """
+    Открытие источника событий: netlink, а при его недоступности - inotify на `/dev`
+
+    Returns:
+        BaseHotplugSource: Открытый источник событий
+    """
+
+    try:
+        return NetlinkUeventSource()
+    except OSError:
+        return InotifyDevSource()
+
+
+class HotplugWatcher:
+    """
+    Наблюдатель за подключением HID устройств.
+    При отключении узла hidraw закрывает дескриптор соответствующего
+    устройства, при появлении нового узла переоткрывает отключённые
+    устройства, повторяя неудачные попытки с растущей задержкой
+    (узел может быть ещё недоступен). Закрытие и открытие дескриптора
+    выполняет поток-владелец устройства (`call_owner`).
+    Внутренний буфер устройств при этом сохраняется
+    """
+
+    def __init__(
+            self,
+            source: Optional[BaseHotplugSource] = None,
+            on_reconnect: Optional[Callable[[Any, int], None]] = None
+        ):
+        """
+        Инициализация наблюдателя
+
+        Args:
+            source (Optional[BaseHotplugSource]):
+                Источник событий (`None` - netlink или inotify)
+            on_reconnect (Optional[Callable[[Any, int], None]]):
+                Обработчик переподключения: устройство и задержка в наносекундах.
+                Вызывается потоком-владельцем устройства
+        """
+
+        self._source = source if source is not None else open_default_source()
+        self._on_reconnect = on_reconnect
+        self._devices: List[Any] = []  # Наблюдаемые устройства
+        self._retries: Dict[int, List] = {}  # Переподключения по id устройства: [устройство, попытки, момент]
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+
+    def watch(self, device):
+        """
+        Добавление устройства под наблюдение
+
+        Args:
+            device (Hid): Открытое устройство
+        """
+
+        with self._lock:
+            if device not in self._devices:
+                self._devices.append(device)
+
+
+    def unwatch(self, device):
+        """
+        Удаление устройства из-под наблюдения
+
+        Args:
+            device (Hid): Наблюдаемое устройство
+        """
+
+        with self._lock:
+            if device in self._devices:
+                self._devices.remove(device)
+            self._retries.pop(id(device), None)
+
+
+    def handle_event(self, event: HotplugEvent):
+        """
+        Обработка одного события подключения
+
+        Args:
+            event (HotplugEvent): Событие
+        """
+
+        hidraw_index.invalidate()  # Набор узлов изменился
+        with self._lock:
+            devices = list(self._devices)
+
+        for device in devices:
+            if event.action == "remove":
+                device.call_owner(lambda device=device: self._disconnect(device, event.devname))
+            elif event.action == "add" and not device.is_connected:
+                with self._lock:
+                    retry = self._retries.get(id(device))
+                    if retry is None:
+                        self._retries[id(device)] = [device, 0, 0.0]
+                    elif retry[2] is not None:  # Новое событие - попытка сразу и заново
+                        retry[1] = 0
+                        retry[2] = 0.0
+        self._process_retries()
+
+
+    @staticmethod
+    def _disconnect(device, devname: str):
+        """
+        Закрытие дескриптора устройства, если пропал его узел (в потоке-владельце)
+
+        Args:
+            device (Hid): Устройство
+            devname (str): Имя пропавшего узла
+        """
+
+        node = device.hidraw_node
+        if device.is_connected and node is not None and node.name == devname:
+            device._handle_disconnect()  # pylint: disable=protected-access
+
+
+    def _process_retries(self) -> Optional[float]:
+        """
+        Запуск наступивших попыток переподключения
+
+        Returns:
+            Optional[float]: Время до следующей попытки в секундах, `None` - если попыток нет
+        """
+
+        now = monotonic()
+        due = []
+        next_delay = None
+        with self._lock:
+            for retry in self._retries.values():
+                if retry[2] is None:  # Попытка уже передана потоку-владельцу
+                    continue
+                if retry[2] <= now:
+                    retry[2] = None
+                    due.append(retry[0])
+                elif next_delay is None or retry[2] - now < next_delay:
+                    next_delay = retry[2] - now
+
+        for device in due:
+            device.call_owner(lambda device=device: self._attempt(device))
+
+        return next_delay
+
+
+    def _attempt(self, device):
+        """
+        Попытка переподключения устройства (в потоке-владельце)
+
+        Args:
+            device (Hid): Устройство
+        """
+
+        reconnected = not device.is_connected and device.reconnect()
+        connected = reconnected or device.is_connected
+        with self._lock:
+            retry = self._retries.get(id(device))
+            if retry is None:  # Устройство снято с наблюдения
+                return
+            if connected:
+                del self._retries[id(device)]
+            else:
+                retry[1] += 1
+                if retry[1] >= RECONNECT_RETRY_LIMIT:  # Ждём следующего события подключения
+                    del self._retries[id(device)]
+                else:
+                    retry[2] = monotonic() + min(
+                        RECONNECT_RETRY_DELAY * 2 ** (retry[1] - 1), RECONNECT_RETRY_MAX_DELAY
+                    )
+
+        if reconnected and self._on_reconnect is not None:
+            self._on_reconnect(device, device.reconnect_latency_ns)
+
+
+    def poll(self, timeout: Optional[float] = None) -> int:
+        """
+        Ожидание и обработка событий
+
+        Args:
+            timeout (Optional[float]):
+                Таймаут ожидания в секундах (`None` - бесконечное ожидание)
+        Returns:
+            int: Количество обработанных событий
+        """
+
+        poller = poll()
+        poller.register(self._source.fileno(), POLLIN)
+        if not poller.poll(None if timeout is None else timeout * 1000):
+            self._process_retries()
+            return 0
+
+        events = self._source.read_events()
+        for event in events:
+            self.handle_event(event)
+
+        return len(events)
+
+
+    def _run(self):
+        """
+        Цикл обработки событий фонового потока
+        """
+
+        while not self._stop_event.is_set():
+            delay = self._process_retries()
+            self.poll(WATCHER_POLL_INTERVAL if delay is None else min(delay, WATCHER_POLL_INTERVAL))
+
+
+    def start(self):
+        """
+        Запуск фонового потока наблюдения
+        """
+
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = Thread(target=self._run, name="HidHotplugWatcher", daemon=True)
+            self._thread.start()
+
+
+    def stop(self):
+        """
+        Остановка фонового потока наблюдения и закрытие источника событий
+        """
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._source.close()
@@ -0,0 +1,231 @@
+from time import monotonic_ns
+from typing import Any, Dict, List, Optional
+
+HISTOGRAM_SUB_BUCKET_BITS = 4  # Разрядность поддиапазонов: 16 корзин на каждую степень двойки (точность ~6%)
+HISTOGRAM_SUB_BUCKET_COUNT = 1 << HISTOGRAM_SUB_BUCKET_BITS
+HISTOGRAM_BUCKET_COUNT = (64 - HISTOGRAM_SUB_BUCKET_BITS + 1) * HISTOGRAM_SUB_BUCKET_COUNT  # Значения до 2^64 нс
+HISTOGRAM_PERCENTILES = (50.0, 90.0, 99.0, 99.9)  # Перцентили в снимке гистограммы
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в стиле HDR Histogram.
+
+    Значения (в наносекундах) раскладываются по логарифмически-линейным
+    корзинам: каждая степень двойки делится на 16 равных поддиапазонов,
+    поэтому относительная погрешность не превышает ~6% во всём диапазоне,
+    а запись значения - это несколько целочисленных операций без выделения памяти
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        """
+        Инициализация пустой гистограммы
+        """
+
+        self.counts: List[int] = [0] * HISTOGRAM_BUCKET_COUNT  # Количество значений в корзинах
+        self.count = 0  # Количество записанных значений
+        self.total = 0  # Сумма записанных значений
+        self.min: Optional[int] = None  # Минимальное значение
+        self.max = 0  # Максимальное значение
+
+
+    def record(self, value: int):
+        """
+        Запись значения
+
+        Args:
+            value (int): Значение в наносекундах
+        """
+
+        if value < HISTOGRAM_SUB_BUCKET_COUNT * 2:  # Малые значения хранятся точно
+            if value < 0:
+                value = 0
+            index = value
+        else:
+            shift = value.bit_length() - HISTOGRAM_SUB_BUCKET_BITS - 1
+            index = (shift + 1) * HISTOGRAM_SUB_BUCKET_COUNT + (value >> shift) - HISTOGRAM_SUB_BUCKET_COUNT
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> int:
+        """
+        Верхняя граница значений корзины
+
+        Args:
+            index (int): Номер корзины
+        Returns:
+            int: Наибольшее значение, попадающее в корзину
+        """
+
+        if index < HISTOGRAM_SUB_BUCKET_COUNT * 2:
+            return index
+        shift = index // HISTOGRAM_SUB_BUCKET_COUNT - 1
+        top = index % HISTOGRAM_SUB_BUCKET_COUNT + HISTOGRAM_SUB_BUCKET_COUNT
+
+        return ((top + 1) << shift) - 1
+
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Значение указанного перцентиля
+
+        Args:
+            percentile (float): Перцентиль от 0 до 100
+        Returns:
+            int: Верхняя граница корзины перцентиля (не больше максимума), `0` - если значений нет
+        """
+
+        if not self.count:
+            return 0
+
+        target = max(int(self.count * percentile / 100.0 + 0.5), 1)  # Номер значения по порядку
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.bucket_upper_bound(index), self.max)
+
+        return self.max
+
+
+    def reset(self):
+        """
+        Очистка гистограммы
+        """
+
+        self.counts = [0] * HISTOGRAM_BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок гистограммы
+
+        Returns:
+            Dict[str, Any]: Количество, минимум, максимум, среднее и перцентили в наносекундах
+        """
+
+        snapshot: Dict[str, Any] = {
+            "count": self.count,
+            "min": self.min or 0,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+        }
+        for percentile in HISTOGRAM_PERCENTILES:
+            snapshot[f"p{percentile:g}"] = self.percentile(percentile)
+
+        return snapshot
+
+
+class HidMetrics:
+    """
+    Счётчики и гистограммы задержек одного HID устройства.
+
+    Счётчики - это обычные целые атрибуты, которые обновляются на горячих путях
+    без блокировок: каждый счётчик увеличивается из одного потока (приёма или записи),
+    а снимок читается из любого потока.
+    Гистограммы требуют отметок времени на каждую запись и пробуждение,
+    поэтому включаются отдельно (`histograms=True`)
+    """
+
+    __slots__ = (
+        "reports_in", "bytes_in", "reports_out", "bytes_out",
+        "wakeups", "empty_wakeups", "eagain", "short_writes", "write_errors",
+        "queued_writes", "write_queue_peak", "poll_errors", "dropped_reports", "reconnects",
+        "write_to_response", "poll_wait", "last_write_ns", "histograms"
+    )
+
+    def __init__(self, histograms: bool = False):
+        """
+        Инициализация нулевых счётчиков
+
+        Args:
+            histograms (bool): Собирать ли гистограммы задержек `write_to_response` и `poll_wait`
+        """
+
+        self.reports_in = 0  # Принятые отчёты
+        self.bytes_in = 0  # Принятые байты
+        self.reports_out = 0  # Отправленные отчёты
+        self.bytes_out = 0  # Отправленные байты
+        self.wakeups = 0  # Пробуждения epoll
+        self.empty_wakeups = 0  # Ожидания, завершившиеся без данных (таймаут, внешнее пробуждение)
+        self.eagain = 0  # Чтения, завершившиеся EAGAIN без данных
+        self.short_writes = 0  # Отчёты, принятые устройством не полностью
+        self.write_errors = 0  # Отчёты, не принятые устройством
+        self.queued_writes = 0  # Отчёты, поставленные в очередь отправки (устройство занято, EAGAIN)
+        self.write_queue_peak = 0  # Наибольшая глубина очереди отправки
+        self.poll_errors = 0  # Ошибки epoll (EPOLLERR)
+        self.dropped_reports = 0  # Отброшенные отчёты
+        self.reconnects = 0  # Переподключения
+        self.write_to_response = LatencyHistogram()  # Задержка от записи до первого ответа, нс
+        self.poll_wait = LatencyHistogram()  # Время ожидания в epoll, нс
+        self.last_write_ns: Optional[int] = None  # Момент последней записи без ответа (monotonic, нс)
+        self.histograms = histograms  # Собираются ли гистограммы задержек
+
+
+    def record_input(self, reports_count: int, bytes_count: int):
+        """
+        Учёт результата приёма: принятых отчётов или чтения, завершившегося EAGAIN.
+        Первый ответ после записи фиксирует задержку запись-ответ
+
+        Args:
+            reports_count (int): Количество принятых отчётов (`0` - данных не было)
+            bytes_count (int): Количество принятых байт
+        """
+
+        if not reports_count:
+            self.eagain += 1
+            return
+
+        self.reports_in += reports_count
+        self.bytes_in += bytes_count
+        if self.last_write_ns is not None:
+            self.record_response()
+
+
+    def record_response(self):
+        """
+        Учёт первого ответа после записи: задержка запись-ответ.
+        Вызывается только при `last_write_ns`, отличном от `None`
+        """
+
+        self.write_to_response.record(monotonic_ns() - self.last_write_ns)
+        self.last_write_ns = None
+
+
+    def reset(self):
+        """
+        Обнуление всех счётчиков и гистограмм
+        """
+
+        self.__init__(self.histograms)  # pylint: disable=unnecessary-dunder-call
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок счётчиков и гистограмм
+
+        Returns:
+            Dict[str, Any]: Значения счётчиков и снимки гистограмм
+        """
+
+        snapshot: Dict[str, Any] = {
+            name: getattr(self, name) for name in self.__slots__
+            if name not in ("write_to_response", "poll_wait", "last_write_ns", "histograms")
+        }
+        snapshot["write_to_response"] = self.write_to_response.snapshot()
+        snapshot["poll_wait"] = self.poll_wait.snapshot()
+
+        return snapshot
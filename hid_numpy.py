@@ -0,0 +1,258 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from crsf import (
+    CRC8_DVB_S2_TABLE, CRSF_FRAMETYPE_RC_CHANNELS_PACKED, CRSF_RC_CHANNEL_BITS, CRSF_RC_CHANNELS_COUNT
+)
+from hid_descriptor import ReportDecoder, ReportLayout
+
+CRSF_RC_PAYLOAD_SIZE = CRSF_RC_CHANNELS_COUNT * CRSF_RC_CHANNEL_BITS // 8  # Размер упакованных каналов, байт
+CRSF_RC_FRAME_LENGTH = CRSF_RC_PAYLOAD_SIZE + 2  # Поле длины кадра каналов: тип, каналы и CRC
+
+_INT_SIZES = (1, 2, 4, 8)  # Размеры целых, читаемых представлением без копирования
+
+# Байт и сдвиг начала каждого канала в упакованных данных:
+_CHANNEL_BITS = np.arange(CRSF_RC_CHANNELS_COUNT) * CRSF_RC_CHANNEL_BITS
+_CHANNEL_BYTES = _CHANNEL_BITS // 8
+_CHANNEL_SHIFTS = (_CHANNEL_BITS % 8).astype(np.uint32)
+_CHANNEL_MASK = (1 << CRSF_RC_CHANNEL_BITS) - 1
+_CRC_TABLE = np.frombuffer(CRC8_DVB_S2_TABLE, dtype=np.uint8)
+
+
+def report_matrix(data: bytes | bytearray | memoryview, report_length: int) -> np.ndarray:
+    """
+    Представление непрерывного пакета отчётов фиксированной длины
+    двумерным массивом без копирования. Неполный отчёт в конце не входит в массив
+
+    Args:
+        data (bytes | bytearray | memoryview):
+            Отчёты подряд (например, `BaseHid.peek()` или содержимое журнала)
+        report_length (int): Длина отчёта вместе с Report ID, если он есть
+    Returns:
+        np.ndarray: Массив `uint8` формы (количество отчётов, `report_length`)
+    """
+
+    count = len(data) // report_length
+
+    return np.frombuffer(data, dtype=np.uint8, count=count * report_length).reshape(count, report_length)
+
+
+def layout_dtype(
+        layout: ReportLayout,
+        report_length: Optional[int] = None,
+        offset: int = 0
+    ) -> np.dtype:
+    """
+    Структурный тип NumPy по раскладке отчёта.
+
+    В тип входят выровненные по байту поля размером 8, 16 и 32 бит
+    (поле из нескольких элементов - подмассив), имена полей - `field<N>`,
+    где N - номер поля в раскладке. Остальные поля читаются через `read_bits`
+
+    Args:
+        layout (ReportLayout): Раскладка отчёта
+        report_length (Optional[int]): Шаг отчётов в пакете (`None` - `offset` + размер отчёта)
+        offset (int): Смещение данных отчёта (`1` - если первым идёт Report ID)
+    Returns:
+        np.dtype: Структурный тип с размером элемента, равным шагу отчётов
+    """
+
+    names: List[str] = []
+    formats: List = []
+    offsets: List[int] = []
+    for index, field in enumerate(layout.fields):
+        size = field.bit_size // 8
+        if field.is_constant or field.bit_size % 8 or field.bit_offset % 8 or size not in _INT_SIZES[:3]:
+            continue
+        scalar = np.dtype(f"<{'i' if field.is_signed else 'u'}{size}")
+        names.append(f"field{index}")
+        formats.append(scalar if field.count == 1 else (scalar, (field.count,)))
+        offsets.append(offset + field.bit_offset // 8)
+
+    itemsize = offset + layout.size if report_length is None else report_length
+
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": itemsize})
+
+
+def report_records(
+        data: bytes | bytearray | memoryview,
+        layout: ReportLayout,
+        report_length: int,
+        offset: int = 0
+    ) -> np.ndarray:
+    """
+    Представление пакета отчётов структурным массивом без копирования
+
+    Args:
+        data (bytes | bytearray | memoryview): Отчёты подряд
+        layout (ReportLayout): Раскладка отчёта
+        report_length (int): Длина отчёта вместе с Report ID, если он есть
+        offset (int): Смещение данных отчёта (`1` - если первым идёт Report ID)
+    Returns:
+        np.ndarray: Структурный массив из одного элемента на отчёт
+    """
+
+    return np.frombuffer(data, dtype=layout_dtype(layout, report_length, offset), count=len(data) // report_length)
+
+
+def read_int(
+        matrix: np.ndarray,
+        offset: int,
+        size: int,
+        byteorder: str = "little",
+        signed: bool = False
+    ) -> np.ndarray:
+    """
+    Чтение целого поля всех отчётов пакета.
+    Поля размером 1, 2, 4 и 8 байт читаются представлением без копирования
+
+    Args:
+        matrix (np.ndarray): Массив отчётов из `report_matrix`
+        offset (int): Смещение поля в отчёте, байт
+        size (int): Размер поля, байт (до 8)
+        byteorder (str): Порядок байт (`little` или `big`)
+        signed (bool): Знаковое ли поле
+    Returns:
+        np.ndarray: Значения поля, по одному на отчёт
+    """
+
+    columns = matrix[:, offset:offset + size]
+    if size in _INT_SIZES:
+        dtype = np.dtype(f"{'<' if byteorder == 'little' else '>'}{'i' if signed else 'u'}{size}")
+        return columns.view(dtype)[:, 0]
+
+    # Нестандартный размер: собираем значение из байт
+    order = range(size) if byteorder == "little" else range(size - 1, -1, -1)
+    values = np.zeros(len(matrix), dtype=np.uint64)
+    for shift, column in enumerate(order):
+        values |= columns[:, column].astype(np.uint64) << np.uint64(8 * shift)
+    if not signed:
+        return values
+    sign_bit = np.uint64(1 << (8 * size - 1))
+
+    return (values ^ sign_bit).astype(np.int64) - np.int64(sign_bit)
+
+
+def read_bits(matrix: np.ndarray, bit_offset: int, bit_size: int, signed: bool = False) -> np.ndarray:
+    """
+    Чтение битового поля (порядок бит HID: младшие биты - первые) всех отчётов пакета
+
+    Args:
+        matrix (np.ndarray): Массив отчётов из `report_matrix`, начиная с данных отчёта
+        bit_offset (int): Смещение поля в битах
+        bit_size (int): Размер поля в битах (поле занимает не больше 8 байт)
+        signed (bool): Знаковое ли поле
+    Returns:
+        np.ndarray: Значения поля, по одному на отчёт
+    Raises:
+        ValueError: Если поле занимает больше 8 байт
+    """
+
+    first = bit_offset // 8
+    last = (bit_offset + bit_size - 1) // 8
+    if last - first >= 8:
+        raise ValueError("Bit field spans more than 8 bytes")
+
+    values = read_int(matrix, first, last - first + 1) >> np.uint64(bit_offset % 8)
+    values = values & np.uint64((1 << bit_size) - 1)
+    if not signed:
+        return values
+    sign_bit = np.uint64(1 << (bit_size - 1))
+
+    return (values ^ sign_bit).astype(np.int64) - np.int64(sign_bit)
+
+
+def decode_batch(decoder: ReportDecoder, matrix: np.ndarray) -> np.ndarray:
+    """
+    Векторизованное декодирование пакета отчётов.
+    Результат совпадает с `ReportDecoder.decode` для каждого отчёта
+
+    Args:
+        decoder (ReportDecoder): Декодер отчёта
+        matrix (np.ndarray): Массив отчётов из `report_matrix`
+    Returns:
+        np.ndarray: Массив `int64` формы (количество отчётов, количество элементов полей)
+    """
+
+    data = matrix[:, decoder.offset:]
+    columns: List[np.ndarray] = []
+    for field in decoder.layout.fields:
+        if field.is_constant:  # Поля-заполнители не декодируются
+            continue
+        for element in range(field.count):
+            bit_offset = field.bit_offset + element * field.bit_size
+            if bit_offset % 8 == 0 and field.bit_size // 8 in _INT_SIZES and field.bit_size % 8 == 0:
+                columns.append(read_int(data, bit_offset // 8, field.bit_size // 8, signed=field.is_signed))
+            else:
+                columns.append(read_bits(data, bit_offset, field.bit_size, field.is_signed))
+
+    if not columns:
+        return np.zeros((len(matrix), 0), dtype=np.int64)
+
+    return np.stack([column.astype(np.int64) for column in columns], axis=1)
+
+
+def unpack_crsf_channels(payloads: np.ndarray) -> np.ndarray:
+    """
+    Распаковка каналов RC_CHANNELS_PACKED: 16 каналов по 11 бит
+
+    Args:
+        payloads (np.ndarray): Массив `uint8` формы (N, 22) - полезные нагрузки кадров
+    Returns:
+        np.ndarray: Массив `uint16` формы (N, 16) - значения каналов
+    """
+
+    data = payloads.astype(np.uint32)
+    last = data.shape[1] - 1  # Третий байт последнего канала за пределами данных, его биты отбрасываются маской
+    packed = (
+        data[:, _CHANNEL_BYTES]
+        | data[:, _CHANNEL_BYTES + 1] << 8
+        | data[:, np.minimum(_CHANNEL_BYTES + 2, last)] << 16
+    )
+
+    return ((packed >> _CHANNEL_SHIFTS) & _CHANNEL_MASK).astype(np.uint16)
+
+
+def crsf_rc_channels(matrix: np.ndarray, frame_offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Поиск кадров RC_CHANNELS_PACKED с верным CRC в пакете отчётов
+    (по одному кадру в начале каждого отчёта) и распаковка их каналов
+
+    Args:
+        matrix (np.ndarray): Массив отчётов из `report_matrix`
+        frame_offset (int): Смещение начала кадра (байт синхронизации) в отчёте
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            Номера отчётов с кадрами каналов и массив каналов формы (N, 16)
+    """
+
+    frames = matrix[:, frame_offset:frame_offset + CRSF_RC_FRAME_LENGTH + 2]
+    if frames.shape[1] < CRSF_RC_FRAME_LENGTH + 2:  # Кадр не помещается в отчёт
+        return np.zeros(0, dtype=np.int64), np.zeros((0, CRSF_RC_CHANNELS_COUNT), dtype=np.uint16)
+
+    candidates = np.flatnonzero(
+        (frames[:, 1] == CRSF_RC_FRAME_LENGTH) & (frames[:, 2] == CRSF_FRAMETYPE_RC_CHANNELS_PACKED)
+    )
+    body = frames[candidates, 2:]  # Тип, каналы и CRC
+
+    # CRC всех кадров считается столбцами: j-й байт тела каждого кадра за один шаг
+    crc = np.zeros(len(candidates), dtype=np.uint8)
+    for column in range(CRSF_RC_FRAME_LENGTH - 1):
+        crc = _CRC_TABLE[crc ^ body[:, column]]
+    valid = crc == body[:, CRSF_RC_FRAME_LENGTH - 1]
+
+    return candidates[valid], unpack_crsf_channels(body[valid, 1:1 + CRSF_RC_PAYLOAD_SIZE])
+
+
+def field_columns(records: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Поля структурного массива как отдельные массивы (представления без копирования)
+
+    Args:
+        records (np.ndarray): Структурный массив из `report_records`
+    Returns:
+        Dict[str, np.ndarray]: Массивы значений по имени поля
+    """
+
+    return {name: records[name] for name in records.dtype.names or ()}
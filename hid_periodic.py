@@ -0,0 +1,422 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+from select import epoll, EPOLLIN
+from threading import Lock, Thread
+from time import monotonic_ns
+from typing import Any, Dict, Optional
+
+from hid_metrics import LatencyHistogram
+
+CLOCK_MONOTONIC = 1  # Часы таймера, совпадают с `time.monotonic_ns`
+TFD_NONBLOCK = os.O_NONBLOCK  # Флаг неблокирующего дескриптора таймера
+TFD_CLOEXEC = os.O_CLOEXEC  # Флаг закрытия дескриптора таймера при exec
+TFD_TIMER_ABSTIME = 1  # Момент первого срабатывания задан абсолютным временем
+PR_SET_TIMERSLACK = 29  # prctl: допустимая задержка срабатывания таймеров потока
+PERIODIC_TIMER_SLACK_NS = 1  # Минимальная задержка таймеров потока отправки, нс
+TIMER_EXPIRATIONS = struct.Struct("=Q")  # Количество срабатываний, прочитанное из timerfd
+NANOSECONDS = 1_000_000_000
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class _Itimerspec(ctypes.Structure):
+    _fields_ = [("it_interval", _Timespec), ("it_value", _Timespec)]
+
+
+_libc: Optional[ctypes.CDLL] = None  # libc загружается при создании первого таймера
+
+
+def _get_libc() -> ctypes.CDLL:
+    """
+    Загрузка libc для вызовов timerfd и prctl
+
+    Returns:
+        ctypes.CDLL: Библиотека libc
+    """
+
+    global _libc  # pylint: disable=global-statement
+
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+    return _libc
+
+
+def _timespec(nanoseconds: int) -> _Timespec:
+    """
+    Преобразование наносекунд в struct timespec
+
+    Args:
+        nanoseconds (int): Время в наносекундах
+    Returns:
+        _Timespec: Структура timespec
+    """
+
+    return _Timespec(nanoseconds // NANOSECONDS, nanoseconds % NANOSECONDS)
+
+
+def timerfd_create() -> int:
+    """
+    Создание неблокирующего таймера на монотонных часах
+
+    Returns:
+        int: Дескриптор таймера
+    Raises:
+        OSError: Если таймер не создан
+    """
+
+    fd = _get_libc().timerfd_create(CLOCK_MONOTONIC, TFD_NONBLOCK | TFD_CLOEXEC)
+    if fd < 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error))
+
+    return fd
+
+
+def timerfd_settime(fd: int, start_ns: int, interval_ns: int):
+    """
+    Запуск периодического таймера
+
+    Args:
+        fd (int): Дескриптор таймера
+        start_ns (int): Момент первого срабатывания (monotonic, нс), `0` - остановить таймер
+        interval_ns (int): Период срабатываний, нс
+    Raises:
+        OSError: Если таймер не запущен
+    """
+
+    spec = _Itimerspec(_timespec(interval_ns), _timespec(start_ns))
+    if _get_libc().timerfd_settime(fd, TFD_TIMER_ABSTIME, ctypes.byref(spec), None) < 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error))
+
+
+class PeriodicStream:
+    """
+    Периодически отправляемый выходной отчёт.
+
+    Отчёт хранится в заранее выделенном буфере: приложение обновляет
+    данные на месте через `update` (или напрямую через `payload`),
+    а поток планировщика отправляет текущее содержимое буфера
+    в моменты срабатывания таймера. Для каждой отправки фиксируется
+    опоздание относительно расчётного момента, пропущенные периоды
+    (таймер сработал несколько раз до отправки) и ошибки записи
+    """
+
+    __slots__ = (
+        "device", "rate", "period_ns", "report", "payload", "lock", "fd",
+        "sent_count", "missed_count", "write_errors", "jitter",
+        "_start_ns", "_expirations", "_expirations_buffer"
+    )
+
+    def __init__(self, device, rate: float, report_id: Optional[int] = None):
+        """
+        Инициализация потока отчётов
+
+        Args:
+            device (BaseHid): Открытое устройство
+            rate (float): Частота отправки в герцах
+            report_id (Optional[int]): ID отчёта (`None` - ID отчёта устройства по-умолчанию)
+        Raises:
+            ValueError: Если частота не положительна
+        """
+
+        if rate <= 0:
+            raise ValueError("Stream rate must be positive")
+
+        self.device = device
+        self.rate = rate
+        self.period_ns = round(NANOSECONDS / rate)  # Период отправки, нс
+        self.report = bytearray(device.output_report_length)  # Буфер отчёта вместе с Report ID
+        self.report[0] = device._send_report_id if report_id is None else report_id  # pylint: disable=protected-access
+        self.payload = memoryview(self.report)[1:]  # Данные отчёта без Report ID
+        self.lock = Lock()  # Отправка не должна застать отчёт обновлённым частично
+        self.fd = timerfd_create()
+        self.sent_count = 0  # Отправленные отчёты
+        self.missed_count = 0  # Пропущенные периоды
+        self.write_errors = 0  # Отчёты, не принятые устройством
+        self.jitter = LatencyHistogram()  # Опоздание отправки относительно расчётного момента, нс
+        self._start_ns = 0  # Момент первого срабатывания (monotonic, нс)
+        self._expirations = 0  # Срабатывания таймера с момента запуска
+        self._expirations_buffer = bytearray(TIMER_EXPIRATIONS.size)  # Буфер чтения таймера
+
+
+    def update(self, data: bytes | bytearray | memoryview, offset: int = 0):
+        """
+        Обновление данных отчёта на месте
+
+        Args:
+            data (bytes | bytearray | memoryview): Новые данные
+            offset (int): Смещение в данных отчёта (без Report ID)
+        """
+
+        with self.lock:
+            self.payload[offset:offset + len(data)] = data
+
+
+    def arm(self, start_ns: Optional[int] = None):
+        """
+        Запуск таймера потока
+
+        Args:
+            start_ns (Optional[int]): Момент первой отправки (monotonic, нс), `None` - через период
+        """
+
+        self._start_ns = monotonic_ns() + self.period_ns if start_ns is None else start_ns
+        self._expirations = 0
+        timerfd_settime(self.fd, self._start_ns, self.period_ns)
+
+
+    def disarm(self):
+        """
+        Остановка таймера потока
+        """
+
+        timerfd_settime(self.fd, 0, 0)
+
+
+    def fire(self) -> bool:
+        """
+        Обработка срабатывания таймера: отправка текущего отчёта
+
+        Returns:
+            bool: Был ли отправлен отчёт
+        """
+
+        with self.lock:  # Поток может быть закрыт во время срабатывания
+            if self.fd is None:
+                return False
+            try:
+                os.readv(self.fd, (self._expirations_buffer,))
+            except BlockingIOError:  # Срабатывание уже обработано
+                return False
+            expirations, = TIMER_EXPIRATIONS.unpack_from(self._expirations_buffer)
+
+            now = monotonic_ns()
+            self._expirations += expirations
+            # Расчётный момент последнего срабатывания, предыдущие пропущены:
+            deadline = self._start_ns + (self._expirations - 1) * self.period_ns
+            self.missed_count += expirations - 1
+            self.jitter.record(now - deadline)
+
+            if self.device.fileno() is None:  # Устройство отключено - отчёт пропускается
+                self.write_errors += 1
+                return False
+            try:
+                written = self.device.write_report(self.report).reports_count
+            except (OSError, TypeError):  # Устройство закрыто или отключено во время отправки
+                written = 0
+        if not written:
+            self.write_errors += 1
+            return False
+        self.sent_count += 1
+
+        return True
+
+
+    def reset_stats(self):
+        """
+        Обнуление счётчиков и гистограммы опозданий
+        """
+
+        self.sent_count = 0
+        self.missed_count = 0
+        self.write_errors = 0
+        self.jitter.reset()
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок счётчиков потока
+
+        Returns:
+            Dict[str, Any]: Частота, счётчики и гистограмма опозданий в наносекундах
+        """
+
+        return {
+            "rate": self.rate,
+            "sent": self.sent_count,
+            "missed": self.missed_count,
+            "write_errors": self.write_errors,
+            "jitter": self.jitter.snapshot(),
+        }
+
+
+    def close(self):
+        """
+        Закрытие таймера потока
+        """
+
+        with self.lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+
+class PeriodicScheduler:
+    """
+    Планировщик периодической отправки выходных отчётов.
+
+    Таймеры потоков (timerfd) регистрируются в собственном epoll
+    планировщика, который обслуживается отдельным потоком с минимальной
+    задержкой таймеров (timer slack). Поток отправки не зависит
+    от ожидания входных отчётов, поэтому чтение устройства
+    не влияет на моменты отправки. Один планировщик обслуживает
+    любое количество потоков с разной частотой на одном или нескольких устройствах
+    """
+
+    def __init__(self):
+        """
+        Инициализация планировщика
+        """
+
+        self._epoll = epoll()
+        self._wakeup_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)  # Пробуждение для остановки
+        self._epoll.register(self._wakeup_fd, EPOLLIN)
+        self._streams: Dict[int, PeriodicStream] = {}  # Потоки по дескриптору таймера
+        self._lock = Lock()
+        self._running = False
+        self._thread: Optional[Thread] = None
+
+
+    def add_stream(
+            self,
+            device,
+            rate: float,
+            data: Optional[bytes | bytearray | memoryview] = None,
+            report_id: Optional[int] = None,
+            start_ns: Optional[int] = None
+        ) -> PeriodicStream:
+        """
+        Добавление потока периодических отчётов
+
+        Args:
+            device (BaseHid): Открытое устройство
+            rate (float): Частота отправки в герцах
+            data (Optional[bytes | bytearray | memoryview]): Начальные данные отчёта
+            report_id (Optional[int]): ID отчёта (`None` - ID отчёта устройства по-умолчанию)
+            start_ns (Optional[int]):
+                Момент первой отправки (monotonic, нс), `None` - через период.
+                Общий момент начала выравнивает потоки кратных частот
+        Returns:
+            PeriodicStream: Поток отчётов
+        """
+
+        stream = PeriodicStream(device, rate, report_id)
+        if data is not None:
+            stream.update(data)
+
+        with self._lock:
+            self._streams[stream.fd] = stream
+            self._epoll.register(stream.fd, EPOLLIN)
+        stream.arm(start_ns)
+
+        return stream
+
+
+    def remove_stream(self, stream: PeriodicStream):
+        """
+        Остановка и удаление потока отчётов
+
+        Args:
+            stream (PeriodicStream): Поток отчётов
+        """
+
+        with self._lock:
+            if self._streams.pop(stream.fd, None) is None:
+                return
+            self._epoll.unregister(stream.fd)
+        stream.close()
+
+
+    def poll(self, timeout: Optional[float] = None) -> int:
+        """
+        Однократное ожидание и обработка срабатываний таймеров
+
+        Args:
+            timeout (Optional[float]):
+                Таймаут ожидания в секундах (`None` - бесконечное ожидание)
+        Returns:
+            int: Количество отправленных отчётов
+        """
+
+        sent = 0
+        for fd, _event in self._epoll.poll(-1 if timeout is None else timeout):
+            if fd == self._wakeup_fd:
+                try:
+                    os.eventfd_read(self._wakeup_fd)
+                except BlockingIOError:
+                    pass
+                continue
+
+            with self._lock:
+                stream = self._streams.get(fd)
+            # Отправка идёт вне общей блокировки: запись в одно устройство не задерживает
+            # другие потоки и добавление потоков. Удалённый поток закрыт и ничего не отправит
+            if stream is not None and stream.fire():
+                sent += 1
+
+        return sent
+
+
+    def _run(self):
+        """
+        Цикл потока отправки
+        """
+
+        # Таймеры потока срабатывают без допустимой задержки по умолчанию (50 мкс):
+        _get_libc().prctl(PR_SET_TIMERSLACK, ctypes.c_ulong(PERIODIC_TIMER_SLACK_NS), 0, 0, 0)
+        while self._running:
+            self.poll()
+
+
+    def start(self):
+        """
+        Запуск потока отправки
+        """
+
+        if self._thread is None:
+            self._running = True
+            self._thread = Thread(target=self._run, name="HidPeriodic", daemon=True)
+            self._thread.start()
+
+
+    def stop(self):
+        """
+        Остановка потока отправки. Таймеры потоков продолжают работать,
+        пропущенные за время остановки периоды учитываются при запуске
+        """
+
+        self._running = False
+        os.eventfd_write(self._wakeup_fd, 1)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Снимок счётчиков всех потоков
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Снимки потоков по дескриптору таймера
+        """
+
+        with self._lock:
+            return {fd: stream.snapshot() for fd, stream in self._streams.items()}
+
+
+    def close(self):
+        """
+        Остановка планировщика, удаление всех потоков и освобождение ресурсов
+        """
+
+        self.stop()
+        for stream in list(self._streams.values()):
+            self.remove_stream(stream)
+        self._epoll.close()
+        os.close(self._wakeup_fd)
@@ -0,0 +1,202 @@
+from collections import deque
+from enum import Enum
+from threading import Condition, Event
+from typing import Deque, Dict, List, Optional
+
+REPORT_QUEUE_SIZE = 4096  # Размер очереди отчётов по умолчанию
+HIGH_WATER_RATIO = 0.75  # Доля заполнения очереди, считающаяся высоким уровнем
+
+
+class OverflowPolicy(Enum):
+    """
+    Поведение очереди отчётов при переполнении
+    """
+
+    DROP_OLDEST = "drop_oldest"  # Отбросить самый старый отчёт
+    DROP_NEWEST = "drop_newest"  # Отбросить новый отчёт
+    BLOCK = "block"  # Ожидать освобождения места
+
+
+class ReportQueue:
+    """
+    Ограниченная очередь отчётов с одним производителем.
+
+    Отчёты хранятся в `deque`, операции добавления и извлечения которой
+    атомарны, поэтому блокировка используется только при политике `BLOCK`
+    для ожидания свободного места. О наличии данных сигнализирует `Event`
+    """
+
+    def __init__(
+            self,
+            maxsize: int = REPORT_QUEUE_SIZE,
+            policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+            event: Optional[Event] = None
+        ):
+        """
+        Инициализация очереди
+
+        Args:
+            maxsize (int): Максимальное количество отчётов в очереди
+            policy (OverflowPolicy): Поведение при переполнении
+            event (Optional[Event]): Событие наличия данных (`None` - создать новое)
+        """
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.event = event if event is not None else Event()  # Событие наличия данных
+        self.high_water_mark = max(int(maxsize * HIGH_WATER_RATIO), 1)  # Порог высокого уровня
+        self._reports: Deque[bytes] = deque()
+        self._space = Condition()  # Ожидание свободного места для политики BLOCK
+        self._above_high_water = False  # Находится ли очередь выше порога высокого уровня
+        self._closed = False
+
+        self.put_count = 0  # Количество принятых отчётов
+        self.dropped_count = 0  # Количество отброшенных отчётов
+        self.high_water_count = 0  # Количество превышений порога высокого уровня
+        self.max_depth = 0  # Максимальная достигнутая глубина очереди
+
+
+    def __len__(self) -> int:
+        return len(self._reports)
+
+
+    def put(self, report: bytes) -> bool:
+        """
+        Добавление отчёта в очередь
+
+        Args:
+            report (bytes): Данные отчёта
+        Returns:
+            bool: Был ли отчёт добавлен
+        """
+
+        reports = self._reports
+        if len(reports) >= self.maxsize:
+            if self.policy is OverflowPolicy.DROP_OLDEST:
+                try:
+                    reports.popleft()
+                except IndexError:  # Потребитель успел освободить очередь
+                    pass
+                else:
+                    self.dropped_count += 1
+            elif self.policy is OverflowPolicy.DROP_NEWEST:
+                self.dropped_count += 1
+                return False
+            else:
+                with self._space:
+                    while len(reports) >= self.maxsize and not self._closed:
+                        self._space.wait()
+                if self._closed:
+                    return False
+
+        reports.append(report)
+        self.put_count += 1
+
+        depth = len(reports)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if depth >= self.high_water_mark:
+            if not self._above_high_water:  # Считаем только пересечение порога снизу вверх
+                self._above_high_water = True
+                self.high_water_count += 1
+        else:
+            self._above_high_water = False
+
+        self.event.set()  # Сообщаем о наличии данных
+
+        return True
+
+
+    def _on_consumed(self):
+        """
+        Обработка извлечения отчётов потребителем
+        """
+
+        if not self._reports:
+            self.event.clear()
+            if self._reports:  # Производитель успел добавить отчёт после проверки
+                self.event.set()
+        if self.policy is OverflowPolicy.BLOCK:
+            with self._space:
+                self._space.notify()
+
+
+    def get_nowait(self) -> Optional[bytes]:
+        """
+        Неблокирующее извлечение отчёта
+
+        Returns:
+            Optional[bytes]: Данные отчёта, `None` - если очередь пуста
+        """
+
+        try:
+            report = self._reports.popleft()
+        except IndexError:
+            return None
+        self._on_consumed()
+
+        return report
+
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Извлечение отчёта с ожиданием
+
+        Args:
+            timeout (Optional[float]):
+                Таймаут ожидания в секундах (`None` - бесконечное ожидание)
+        Returns:
+            Optional[bytes]: Данные отчёта, `None` - если истёк таймаут
+        """
+
+        report = self.get_nowait()
+        if report is None and self.event.wait(timeout):
+            report = self.get_nowait()
+
+        return report
+
+
+    def drain(self) -> List[bytes]:
+        """
+        Извлечение всех отчётов из очереди
+
+        Returns:
+            List[bytes]: Список отчётов
+        """
+
+        reports = []
+        while True:
+            try:
+                reports.append(self._reports.popleft())
+            except IndexError:
+                break
+        self._on_consumed()
+
+        return reports
+
+
+    def close(self):
+        """
+        Закрытие очереди: пробуждение ожидающего производителя
+        """
+
+        self._closed = True
+        with self._space:
+            self._space.notify_all()
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Получение счётчиков очереди
+
+        Returns:
+            Dict[str, int]: Счётчики очереди
+        """
+
+        return {
+            "depth": len(self._reports),
+            "max_depth": self.max_depth,
+            "put": self.put_count,
+            "dropped": self.dropped_count,
+            "high_water": self.high_water_count
+        }
@@ -0,0 +1,337 @@
+import os
+from collections import deque
+from queue import Full, Queue
+from select import epoll, EPOLLERR, EPOLLHUP, EPOLLIN
+from threading import Lock, Thread
+from typing import Any, Callable, Deque, Dict, Optional
+
+REACTOR_QUEUE_SIZE = 1024  # Размер очереди отчётов устройства по умолчанию
+
+ReportCallback = Callable[[Any, bytes], None]
+"""Обработчик входного отчёта: устройство и данные отчёта"""
+ErrorCallback = Callable[[Any, int], None]
+"""Обработчик ошибки устройства: устройство и маска событий epoll"""
+
+
+class _Registration:
+    """
+    Регистрация устройства в реакторе
+    """
+
+    __slots__ = ("device", "callback", "on_error", "queue")
+
+    def __init__(
+            self,
+            device,
+            callback: ReportCallback,
+            on_error: Optional[ErrorCallback],
+            queue: Optional[Queue]
+        ):
+        self.device = device
+        self.callback = callback
+        self.on_error = on_error
+        self.queue = queue
+
+
+class HidReactor:
+    """
+    Общий реактор для множества HID устройств.
+
+    Владеет одним epoll, в котором регистрируются дескрипторы устройств,
+    и из одного потока раздаёт входные отчёты по обработчикам или очередям
+    устройств. Ошибки и отключения устройств обрабатываются централизованно
+    """
+
+    def __init__(self, on_error: Optional[ErrorCallback] = None):
+        """
+        Инициализация реактора
+
+        Args:
+            on_error (Optional[ErrorCallback]):
+                Обработчик ошибок по умолчанию для всех устройств
+        """
+
+        self._epoll = epoll()
+        self._wakeup_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)  # Пробуждение для остановки
+        self._epoll.register(self._wakeup_fd, EPOLLIN)
+        self._registrations: Dict[int, _Registration] = {}  # Регистрации по дескриптору устройства
+        self._detached: Dict[int, _Registration] = {}  # Регистрации отключённых устройств по id устройства
+        self._calls: Deque[Callable[[], Any]] = deque()  # Вызовы, выполняемые потоком реактора
+        self._lock = Lock()
+        self._on_error = on_error
+        self._running = False
+        self._thread: Optional[Thread] = None
+
+
+    def register(
+            self,
+            device,
+            callback: Optional[ReportCallback] = None,
+            on_error: Optional[ErrorCallback] = None,
+            queue_size: int = REACTOR_QUEUE_SIZE
+        ) -> Optional[Queue]:
+        """
+        Регистрация открытого устройства в реакторе
+
+        Args:
+            device (Hid): Открытое устройство
+            callback (Optional[ReportCallback]):
+                Обработчик входных отчётов (`None` - складывать отчёты в очередь)
+            on_error (Optional[ErrorCallback]):
+                Обработчик ошибок устройства (`None` - обработчик реактора)
+            queue_size (int): Размер очереди, если обработчик не указан
+        Returns:
+            Optional[Queue]:
+                Очередь входных отчётов, если обработчик не указан
+        Raises:
+            ValueError: Если устройство не открыто или читает отчёты через HidD
+        """
+
+        fd = device.fileno()
+        if fd is None:
+            raise ValueError("Device is not opened")
+        if device._use_hidd:  # pylint: disable=protected-access
+            # HIDIOCGINPUT всегда возвращает текущий отчёт: вычитывание до EAGAIN не завершилось бы
+            raise ValueError("Devices reading through HidD cannot be served by the reactor")
+
+        queue = None
+        if callback is None:  # Складываем отчёты в очередь устройства
+            queue = Queue(queue_size)
+            callback = lambda _device, report: queue.put_nowait(report)  # pylint: disable=unnecessary-lambda-assignment
+
+        with self._lock:
+            self._detached.pop(id(device), None)
+            registered = self._registrations.get(fd)
+            self._registrations[fd] = _Registration(device, callback, on_error, queue)
+            if registered is None:
+                self._epoll.register(fd, EPOLLIN | EPOLLERR | EPOLLHUP)
+            device._reactor = self  # pylint: disable=protected-access
+
+        return queue
+
+
+    def unregister(self, device):
+        """
+        Снятие устройства с обслуживания реактором
+
+        Args:
+            device (Hid): Зарегистрированное устройство
+        """
+
+        with self._lock:
+            self._detached.pop(id(device), None)
+            for fd, registration in list(self._registrations.items()):
+                if registration.device is device:
+                    del self._registrations[fd]
+                    try:
+                        self._epoll.unregister(fd)
+                    except OSError:
+                        pass
+            if device._reactor is self:  # pylint: disable=protected-access
+                device._reactor = None  # pylint: disable=protected-access
+
+
+    def call_soon(self, callback: Callable[[], Any]):
+        """
+        Выполнение вызова потоком реактора (например, отключения
+        или переподключения устройства из потока наблюдателя)
+
+        Args:
+            callback (Callable[[], Any]): Вызов
+        """
+
+        self._calls.append(callback)
+        self.wakeup()
+
+
+    def _run_calls(self):
+        """
+        Выполнение отложенных вызовов и повторная регистрация
+        переподключённых ими устройств
+        """
+
+        if not self._calls:
+            return
+        while self._calls:
+            call = self._calls.popleft()
+            try:
+                call()
+            except Exception as exception:  # pylint: disable=broad-exception-caught
+                self._report(None, f"call failed: {exception!r}")
+
+        # Вызовы могли закрыть или переоткрыть дескрипторы: закрытый дескриптор epoll
+        # забывает сам, а номер нового может совпасть со старым
+        with self._lock:
+            registrations = [*self._registrations.values(), *self._detached.values()]
+            self._registrations.clear()
+            self._detached.clear()
+            for registration in registrations:
+                fd = registration.device.fileno()
+                if fd is None:
+                    self._detached[id(registration.device)] = registration
+                    continue
+                self._registrations[fd] = registration
+                try:
+                    self._epoll.register(fd, EPOLLIN | EPOLLERR | EPOLLHUP)
+                except FileExistsError:  # Дескриптор не менялся
+                    pass
+
+
+    def _dispatch(self, registration: _Registration):
+        """
+        Вычитывание всех доступных отчётов устройства и их раздача
+
+        Args:
+            registration (_Registration): Регистрация устройства
+        """
+
+        device = registration.device
+        callback = registration.callback
+        while True:
+            report = device.recv_report()
+            if not report:
+                break
+            if not device._on_input(report):  # pylint: disable=protected-access
+                continue  # Отчёт передан обработчику маршрута устройства или отброшен
+            try:
+                callback(device, report)
+            except Full:  # Очередь устройства переполнена - отчёт отбрасывается
+                if device.metrics is not None:
+                    device.metrics.dropped_reports += 1
+
+
+    def _handle_error(self, fd: int, registration: _Registration, event: int):
+        """
+        Обработка ошибки или отключения устройства
+
+        Args:
+            fd (int): Дескриптор устройства
+            registration (_Registration): Регистрация устройства
+            event (int): Маска событий epoll
+        """
+
+        with self._lock:
+            self._registrations.pop(fd, None)
+            try:
+                self._epoll.unregister(fd)
+            except OSError:
+                pass
+            if event & EPOLLHUP:  # Регистрация возобновится после переподключения (`call_soon`)
+                self._detached[id(registration.device)] = registration
+
+        if event & EPOLLHUP:  # Устройство отключено - освобождаем дескриптор
+            registration.device._handle_disconnect()  # pylint: disable=protected-access
+
+        on_error = registration.on_error or self._on_error
+        if on_error is not None:
+            on_error(registration.device, event)
+        else:
+            self._report(registration.device, f"error, epoll event {event:#x}")
+
+
+    @staticmethod
+    def _report(device, message: str):
+        """
+        Сообщение об ошибке, не переданной обработчику: поток реактора
+        обслуживает все устройства и продолжает работу
+
+        Args:
+            device (Optional[Hid]): Устройство (`None` - ошибка реактора)
+            message (str): Описание ошибки
+        """
+
+        if device is None:
+            print(f"HidReactor: {message}")
+        else:
+            print(f"HidReactor: device {device.path!r} {message}")
+
+
+    def poll(self, timeout: Optional[float] = None) -> int:
+        """
+        Однократное ожидание и обработка событий всех устройств
+
+        Args:
+            timeout (Optional[float]):
+                Таймаут ожидания в секундах (`None` - бесконечное ожидание)
+        Returns:
+            int: Количество обработанных событий устройств
+        """
+
+        handled = 0
+        for fd, event in self._epoll.poll(-1 if timeout is None else timeout):
+            if fd == self._wakeup_fd:
+                try:
+                    os.eventfd_read(self._wakeup_fd)
+                except BlockingIOError:
+                    pass
+                self._run_calls()
+                continue
+
+            registration = self._registrations.get(fd)
+            if registration is None:
+                continue
+            handled += 1
+
+            try:
+                if event & EPOLLIN:  # Сначала забираем данные, пришедшие до ошибки
+                    try:
+                        self._dispatch(registration)
+                    except OSError:
+                        event |= EPOLLERR
+                if event & (EPOLLERR | EPOLLHUP):
+                    self._handle_error(fd, registration, event)
+            except Exception as exception:  # pylint: disable=broad-exception-caught
+                # Исключение обработчика одного устройства не останавливает раздачу остальным
+                self._report(registration.device, f"handler failed: {exception!r}")
+
+        return handled
+
+
+    def _run(self):
+        """
+        Цикл обработки событий потока реактора
+        """
+
+        while self._running:
+            self.poll()
+
+
+    def start(self):
+        """
+        Запуск потока реактора
+        """
+
+        if self._thread is None:
+            self._running = True
+            self._thread = Thread(target=self._run, name="HidReactor", daemon=True)
+            self._thread.start()
+
+
+    def wakeup(self):
+        """
+        Пробуждение потока реактора из другого потока
+        """
+
+        os.eventfd_write(self._wakeup_fd, 1)
+
+
+    def stop(self):
+        """
+        Остановка потока реактора
+        """
+
+        self._running = False
+        self.wakeup()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def close(self):
+        """
+        Остановка реактора и освобождение его ресурсов
+        """
+
+        self.stop()
+        self._epoll.close()
+        os.close(self._wakeup_fd)
@@ -0,0 +1,446 @@
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from base_hid import BaseHid, HidAttributes, WriteResult
+from hid_queue import OverflowPolicy, REPORT_QUEUE_SIZE, ReportQueue
+from hid_reactor import HidReactor
+from hidraw_index import hidraw_index
+
+DeviceFactory = Callable[[], BaseHid]
+"""Создание и запуск устройства при первом открытии в реестре"""
+
+
+class _SharedDevice:
+    """
+    Устройство, открытое в реестре: одно на все описатели
+    """
+
+    __slots__ = ("key", "device", "refcount", "subscribers", "lock", "write_lock", "unrouted_count")
+
+    def __init__(self, key: Hashable, device: BaseHid):
+        self.key = key
+        self.device = device
+        self.refcount = 0  # Количество открытых описателей
+        self.subscribers: Tuple[ReportQueue, ...] = ()  # Заменяется целиком: поток реактора читает без блокировки
+        self.lock = Lock()  # Изменение подписчиков
+        self.write_lock = Lock()  # Запись описателей с разными ID отчёта через общий буфер устройства
+        self.unrouted_count = 0  # Количество отчётов, пришедших без подписчиков
+
+
+    def dispatch(self, device: BaseHid, report: bytes):
+        """
+        Раздача входного отчёта всем подписчикам (вызывается потоком реактора
+        после учёта и маршрутизации отчёта устройством)
+
+        Args:
+            device (BaseHid): Устройство
+            report (bytes): Данные отчёта
+        """
+
+        subscribers = self.subscribers
+        if not subscribers:
+            self.unrouted_count += 1
+        dropped_count = 0
+        for queue in subscribers:  # Отчёт неизменяемый: всем подписчикам отдаётся один объект
+            queue_dropped = queue.dropped_count
+            queue.put(report)
+            dropped_count += queue.dropped_count - queue_dropped
+        if dropped_count and device.metrics is not None:  # Переполненные подписки теряют отчёт
+            device.metrics.dropped_reports += dropped_count
+
+
+class SharedHid:
+    """
+    Описатель устройства, открытого в реестре.
+
+    Все описатели одного устройства используют один дескриптор и один
+    поток чтения реестра, который раздаёт каждый входной отчёт всем
+    подпискам (`subscribe`) со своими ограниченными очередями.
+    Устройство закрывается при закрытии последнего описателя
+    """
+
+    __slots__ = ("_registry", "_entry", "_queues", "send_report_id")
+
+    def __init__(self, registry: "DeviceRegistry", entry: _SharedDevice, send_report_id: int = 0):
+        self._registry = registry
+        self._entry: Optional[_SharedDevice] = entry
+        self._queues: List[ReportQueue] = []  # Подписки описателя
+        self.send_report_id = send_report_id  # ID отчёта при отправке через этот описатель
+
+
+    def __enter__(self) -> "SharedHid":
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def _get_entry(self) -> _SharedDevice:
+        entry = self._entry
+        if entry is None:
+            raise ValueError("Handle is closed")
+
+        return entry
+
+
+    @property
+    def device(self) -> BaseHid:
+        """
+        Общее устройство описателя
+
+        Returns:
+            BaseHid: Открытое устройство
+        Raises:
+            ValueError: Если описатель закрыт
+        """
+
+        return self._get_entry().device
+
+
+    @property
+    def closed(self) -> bool:
+        return self._entry is None
+
+
+    @property
+    def is_connected(self) -> bool:
+        entry = self._entry
+        return entry is not None and entry.device.fileno() is not None
+
+
+    def subscribe(
+            self,
+            maxsize: int = REPORT_QUEUE_SIZE,
+            policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+        ) -> ReportQueue:
+        """
+        Подписка на входные отчёты устройства
+
+        Args:
+            maxsize (int): Максимальное количество отчётов в очереди подписки
+            policy (OverflowPolicy):
+                Поведение очереди при переполнении (`BLOCK` недоступен:
+                медленный подписчик остановил бы раздачу отчётов всем устройствам)
+        Returns:
+            ReportQueue: Очередь отчётов подписки
+        Raises:
+            ValueError: Если описатель закрыт или указана политика `BLOCK`
+        """
+
+        if policy is OverflowPolicy.BLOCK:
+            raise ValueError("Shared device subscriptions cannot block the reader")
+        entry = self._get_entry()
+        queue = ReportQueue(maxsize, policy)
+        with entry.lock:
+            entry.subscribers = entry.subscribers + (queue,)
+        self._queues.append(queue)
+
+        return queue
+
+
+    def unsubscribe(self, queue: ReportQueue):
+        """
+        Отмена подписки описателя
+
+        Args:
+            queue (ReportQueue): Очередь подписки
+        """
+
+        entry = self._entry
+        if entry is None or queue not in self._queues:
+            return
+
+        self._queues.remove(queue)
+        with entry.lock:
+            entry.subscribers = tuple(subscriber for subscriber in entry.subscribers if subscriber is not queue)
+        queue.close()
+
+
+    def write(self, data: bytes | bytearray | memoryview) -> WriteResult:
+        """
+        Отправка данных с ID отчёта описателя
+
+        Args:
+            data (bytes | bytearray | memoryview): Данные для отправки
+        Returns:
+            WriteResult: Результат отправки
+        Raises:
+            ValueError: Если описатель закрыт
+        """
+
+        entry = self._get_entry()
+        device = entry.device
+        with entry.write_lock:
+            if device._send_report_id != self.send_report_id:  # pylint: disable=protected-access
+                device.set_report_id(self.send_report_id)
+            return device.write(data)
+
+
+    def reconnect(self) -> bool:
+        """
+        Переподключение общего устройства после отключения
+        и возобновление раздачи его отчётов
+
+        Returns:
+            bool: Подключено ли устройство
+        Raises:
+            ValueError: Если описатель закрыт
+        """
+
+        return self._registry._reconnect(self._get_entry())  # pylint: disable=protected-access
+
+
+    def close(self):
+        """
+        Закрытие описателя: отмена его подписок и закрытие устройства,
+        если описатель был последним
+        """
+
+        entry = self._entry
+        if entry is None:
+            return
+
+        for queue in list(self._queues):
+            self.unsubscribe(queue)
+        self._entry = None
+        self._registry._release(entry)  # pylint: disable=protected-access
+
+
+class DeviceRegistry:
+    """
+    Реестр устройств, открытых в процессе.
+
+    Устройство открывается один раз на ключ (узел hidraw), повторные
+    открытия получают описатели того же устройства со счётчиком ссылок.
+    Входные отчёты всех устройств реестра вычитывает один поток `HidReactor`
+    """
+
+    def __init__(self, reactor: Optional[HidReactor] = None):
+        """
+        Инициализация реестра
+
+        Args:
+            reactor (Optional[HidReactor]):
+                Реактор чтения отчётов (`None` - создать собственный при первом открытии)
+        """
+
+        self._reactor = reactor
+        self._own_reactor = reactor is None  # Управляет ли реестр жизненным циклом реактора
+        self._devices: Dict[Hashable, _SharedDevice] = {}  # Открытые устройства по ключу
+        self._lock = Lock()
+
+
+    @staticmethod
+    def device_key(device_address: HidAttributes | str | bytes) -> Hashable:
+        """
+        Ключ устройства: путь узла hidraw, к которому сводятся
+        пути на шине, пути sysfs, HID_PHYS и атрибуты устройства
+
+        Args:
+            device_address (HidAttributes | str | bytes): Идентификаторы устройства или путь до устройства
+        Returns:
+            Hashable: Ключ устройства
+        Raises:
+            RecursionError: Если не удалось найти устройство по указанным атрибутам
+        """
+
+        if isinstance(device_address, HidAttributes):
+            path = BaseHid.get_device_path_by_attributes(device_address)
+            if path is None:
+                raise RecursionError(f"No Device for attributes {device_address} found")
+            device_address = path
+
+        node = hidraw_index.resolve(device_address)
+        if node is not None:
+            return node.dev_path
+
+        return device_address.decode() if isinstance(device_address, bytes) else device_address
+
+
+    def _get_reactor(self) -> HidReactor:
+        if self._reactor is None:
+            self._reactor = HidReactor(self._on_error)
+        self._reactor.start()
+
+        return self._reactor
+
+
+    def acquire(self, key: Hashable, factory: DeviceFactory, send_report_id: int = 0) -> SharedHid:
+        """
+        Получение описателя устройства по ключу.
+        Если устройство ещё не открыто, оно создаётся и запускается фабрикой
+
+        Args:
+            key (Hashable): Ключ устройства
+            factory (DeviceFactory): Создание и запуск устройства
+            send_report_id (int): ID отчёта при отправке через описатель
+        Returns:
+            SharedHid: Описатель устройства
+        Raises:
+            ValueError: Если устройство читает отчёты через HidD (реактор его не обслуживает)
+        """
+
+        with self._lock:
+            entry = self._devices.get(key)
+            if entry is None:
+                device = factory()
+                entry = _SharedDevice(key, device)
+                try:
+                    self._get_reactor().register(device, entry.dispatch)
+                except Exception:
+                    device.close()
+                    raise
+                self._devices[key] = entry
+            entry.refcount += 1
+
+        return SharedHid(self, entry, send_report_id)
+
+
+    def open(
+            self,
+            device_address: HidAttributes | str | bytes,
+            send_report_id: int = 0
+        ) -> SharedHid:
+        """
+        Открытие устройства `Hid` или получение описателя уже открытого.
+        Отчёты общего устройства вычитывает реактор, поэтому чтение через HidD недоступно
+
+        Args:
+            device_address (HidAttributes | str | bytes): Идентификаторы устройства или путь до устройства
+            send_report_id (int): ID отчёта при отправке через описатель
+        Returns:
+            SharedHid: Описатель устройства
+        """
+
+        from HID import Hid  # pylint: disable=import-outside-toplevel
+
+        def factory() -> BaseHid:
+            device = Hid(device_address)
+            device.run()
+            return device
+
+        return self.acquire(self.device_key(device_address), factory, send_report_id)
+
+
+    def open_by_device_name(self, device_name: str, send_report_id: int = 0) -> SharedHid:
+        """
+        Открытие устройства по имени (product_string)
+
+        Args:
+            device_name (str): Имя HID устройства
+            send_report_id (int): ID отчёта при отправке через описатель
+        Returns:
+            SharedHid: Описатель устройства
+        Raises:
+            RuntimeError: Если в системе не найдено устройства с указанным именем
+        """
+
+        from hid_sysfs import get_device_table  # pylint: disable=import-outside-toplevel
+
+        device_info = get_device_table().by_product_string(device_name)
+        if device_info is None:
+            raise RuntimeError(f"No HID devices with name {device_name} found")
+
+        return self.open(device_info.path, send_report_id)
+
+
+    def _release(self, entry: _SharedDevice):
+        """
+        Освобождение ссылки описателя, закрытие устройства по последней ссылке
+
+        Args:
+            entry (_SharedDevice): Устройство реестра
+        """
+
+        with self._lock:
+            if entry.refcount <= 0:  # Устройство уже закрыто вместе с реестром
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            if self._devices.get(entry.key) is entry:
+                del self._devices[entry.key]
+            if self._reactor is not None:
+                self._reactor.unregister(entry.device)
+
+        entry.device.close()
+
+
+    def _reconnect(self, entry: _SharedDevice) -> bool:
+        """
+        Переподключение устройства и его повторная регистрация в реакторе
+
+        Args:
+            entry (_SharedDevice): Устройство реестра
+        Returns:
+            bool: Подключено ли устройство
+        """
+
+        with self._lock:
+            device = entry.device
+            if device.fileno() is not None:
+                return True
+            if not device.reconnect():
+                return False
+            self._get_reactor().register(device, entry.dispatch)
+
+        return True
+
+
+    def _on_error(self, device: BaseHid, event: int):
+        """
+        Обработка ошибки устройства реактором: устройство остаётся в реестре
+        до закрытия описателей и может быть переподключено через `SharedHid.reconnect`
+
+        Args:
+            device (BaseHid): Устройство
+            event (int): Маска событий epoll
+        """
+
+        print(f"DeviceRegistry: device {device.path!r} error, epoll event {event:#x}")
+
+
+    def devices(self) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        Снимок открытых устройств реестра
+
+        Returns:
+            Dict[Hashable, Dict[str, Any]]: Количество описателей, подписок и отчётов без подписчиков по ключу
+        """
+
+        with self._lock:
+            return {
+                key: {
+                    "handles": entry.refcount,
+                    "subscribers": len(entry.subscribers),
+                    "unrouted": entry.unrouted_count
+                }
+                for key, entry in self._devices.items()
+            }
+
+
+    def close(self):
+        """
+        Закрытие всех устройств реестра и остановка собственного реактора.
+        Описатели становятся недействительными
+        """
+
+        with self._lock:
+            entries = list(self._devices.values())
+            self._devices.clear()
+            for entry in entries:
+                entry.refcount = 0
+                if self._reactor is not None:
+                    self._reactor.unregister(entry.device)
+        for entry in entries:
+            for queue in entry.subscribers:
+                queue.close()
+            entry.device.close()
+
+        if self._own_reactor and self._reactor is not None:
+            self._reactor.close()
+            self._reactor = None
+
+
+registry = DeviceRegistry()  # Общий для процесса реестр устройств
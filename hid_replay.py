@@ -0,0 +1,252 @@
+from threading import Event
+from time import monotonic_ns
+from typing import Iterator, Optional
+
+from base_hid import BaseHid, HIDDeviceError
+from hid_capture import CAPTURE_INPUT, CaptureReader, CaptureRecord
+
+REPLAY_IDLE_INTERVAL = 0.1  # Интервал ожидания фонового чтения после окончания журнала
+
+
+class ReplayHid(BaseHid):
+    """
+    Воспроизведение журнала отчётов через API аксессора HID.
+
+    Входные отчёты журнала выдаются через `read`, `receive`, `in_waiting`
+    и фоновое чтение так же, как от реального устройства: с исходными
+    интервалами (с учётом множителя скорости) или без задержек.
+    Выходные отчёты принимаются и подсчитываются, но никуда не отправляются.
+    По окончании журнала ожидание данных завершается сразу, как при отключении
+    устройства, поэтому воспроизведение годится как воспроизводимый вход для измерений
+    """
+
+    _input_has_report_id = False  # Уточняется по журналу при открытии или по дескриптору
+
+    def __init__(self, capture_path: str, speed: float = 1.0, send_report_id: int = 0):
+        """
+        Инициализация воспроизведения
+
+        Args:
+            capture_path (str): Путь до файла журнала
+            speed (float):
+                Множитель скорости воспроизведения (`1.0` - исходные интервалы,
+                `0` - без задержек)
+            send_report_id (int): ID отчёта по-умолчанию при отправке отчёта
+        """
+
+        self.speed = speed
+        self.capture: Optional[CaptureReader] = None  # Воспроизводимый журнал
+        self._records: Optional[Iterator[CaptureRecord]] = None  # Оставшиеся входные отчёты
+        self._pending: Optional[CaptureRecord] = None  # Очередной ещё не выданный отчёт
+        self._first_timestamp = 0  # Момент первой записи журнала, нс
+        self._started_ns: Optional[int] = None  # Момент начала воспроизведения, нс
+        self._wake_event = Event()  # Прерывание ожидания очередного отчёта
+        self.written_reports = 0  # Количество принятых выходных отчётов
+        super().__init__(capture_path, send_report_id)
+
+
+    def _setup_api_functions(self):
+        pass
+
+
+    def _get_capabilities(self):
+        pass
+
+
+    def _get_device_info(self):
+        pass
+
+
+    def _init_overleaped(self):
+        pass
+
+
+    def _init_hidd(self):
+        pass
+
+
+    def _open_path(self, path):
+        self.capture = CaptureReader(path if isinstance(path, str) else path.decode())
+        # Журнал хранит отчёты в том виде, в котором их вернул hidraw, а ID отчёта
+        # записывается ненулевым, только если дескриптор устройства использует нумерацию
+        first = next(self.capture.records(CAPTURE_INPUT), None)
+        self._input_has_report_id = first is not None and first.report_id != 0
+        self.rewind()
+
+
+    def fileno(self):
+        return None  # Журнал не имеет дескриптора для epoll
+
+
+    def rewind(self):
+        """
+        Перезапуск воспроизведения с начала журнала
+        """
+
+        if self.capture is None:
+            raise HIDDeviceError("Capture not opened")
+
+        first = next(iter(self.capture), None)
+        self._first_timestamp = first.timestamp if first is not None else 0
+        self._records = self.capture.records(CAPTURE_INPUT)
+        self._pending = None
+        self._started_ns = None
+
+
+    def _next_record(self) -> Optional[CaptureRecord]:
+        """
+        Получение очередного ещё не выданного входного отчёта
+
+        Returns:
+            Optional[CaptureRecord]: Запись журнала, `None` - если журнал закончился
+        """
+
+        if self._pending is None and self._records is not None:
+            self._pending = next(self._records, None)
+            if self._pending is None:  # Журнал закончился
+                self._records = None
+
+        return self._pending
+
+
+    def _delay_ns(self, record: CaptureRecord) -> int:
+        """
+        Время до момента выдачи отчёта
+
+        Args:
+            record (CaptureRecord): Запись журнала
+        Returns:
+            int: Время в наносекундах (`<= 0` - отчёт уже можно выдать)
+        """
+
+        if not self.speed:
+            return 0
+
+        now = monotonic_ns()
+        if self._started_ns is None:  # Воспроизведение начинается с первого обращения
+            self._started_ns = now
+
+        return self._started_ns + int((record.timestamp - self._first_timestamp) / self.speed) - now
+
+
+    def _pop_due(self) -> Optional[memoryview]:
+        """
+        Извлечение очередного отчёта, если наступил момент его выдачи
+
+        Returns:
+            Optional[memoryview]: Данные отчёта из журнала без копирования или `None`
+        """
+
+        record = self._next_record()
+        if record is None or self._delay_ns(record) > 0:
+            return None
+        self._pending = None
+
+        return record.payload
+
+
+    def recv_report(self):
+        payload = self._pop_due()
+        if payload is None:
+            return b""
+        return bytes(payload)  # Отчёт покидает журнал (например, в очередь фонового чтения)
+
+
+    def recv_hidd_report(self, report_id=None):
+        return self.recv_report()
+
+
+    def _recv_report_into(self, slot):
+        payload = self._pop_due()
+        if payload is None:
+            return 0
+        size = len(payload)
+        slot[:size] = payload
+        return size
+
+
+    def _receive(self):
+        if self._reader_queue is not None:
+            BaseHid._receive(self)
+            return
+        if self._ring is not None:  # Отчёты публикует в кольцо фоновый поток
+            return
+        # Отчёты копируются из отображения журнала прямо в буфер приёма
+        buffer = self.buffer
+        reports_count = 0
+        bytes_count = 0
+        while True:
+            payload = self._pop_due()
+            if payload is None:
+                break
+            if self._accept_input(payload, len(payload)):
+                buffer.append(payload)
+            reports_count += 1
+            bytes_count += len(payload)
+        if self.metrics is not None:
+            self.metrics.record_input(reports_count, bytes_count)
+
+
+    def _wait_readable(self, timeout):
+        record = self._next_record()
+        if record is None:  # Журнал закончился - данных больше не будет
+            if self._reader_queue is not None:
+                self._wake_event.wait(REPLAY_IDLE_INTERVAL)
+                self._wake_event.clear()
+            return False
+
+        delay = self._delay_ns(record) / 1e9
+        if delay <= 0:
+            return True
+        if self._wake_event.wait(delay if timeout is None else min(delay, timeout)):
+            self._wake_event.clear()  # Внешнее пробуждение
+            return False
+
+        return timeout is None or delay <= timeout
+
+
+    def _wait_for_event(self):
+        timeout = self.timeout
+        if self._reader_queue is not None:
+            # Отчёты выдаёт поток фонового чтения, ждём их появления в очереди
+            ready = self.event.wait(timeout)
+            if self._woken:
+                self._woken = False
+                if not len(self._reader_queue):
+                    self.event.clear()
+                return False
+            if ready:
+                self._receive()
+            return ready
+
+        if not self._wait_readable(timeout):
+            return False
+        self._receive()
+        return True
+
+
+    def wakeup(self):
+        BaseHid.wakeup(self)
+        self._wake_event.set()
+
+
+    def _write_report(self, data):
+        self.written_reports += 1
+        return len(data)
+
+
+    def _write_hidd_report(self, data):
+        return self._write_report(data)
+
+
+    def close(self):
+        self.wakeup()
+        self.stop_reader()
+        self.stop_publisher()
+        self.stop_capture()
+        self._records = None
+        self._pending = None
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+        self.is_open = False
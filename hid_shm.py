@@ -0,0 +1,439 @@
+import struct
+from concurrent.futures import Executor, Future
+from multiprocessing import parent_process, resource_tracker, shared_memory
+from time import monotonic, monotonic_ns, sleep
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SHM_RING_MAGIC = b"HIDRING1"  # Сигнатура и версия формата кольца
+SHM_RING_HEADER = struct.Struct("<8sIIQ")  # Сигнатура, количество слотов, размер слота, последний номер отчёта
+SHM_RING_SEQUENCE_OFFSET = 16  # Смещение номера последнего опубликованного отчёта в заголовке
+SHM_SEQUENCE = struct.Struct("<Q")  # Номер отчёта (заголовок кольца и начало слота)
+SHM_SLOT_INFO = struct.Struct("<QH")  # Момент приёма (monotonic, нс) и длина данных, следуют за номером слота
+SHM_SLOT_HEADER_SIZE = SHM_SEQUENCE.size + SHM_SLOT_INFO.size  # Размер заголовка слота
+SHM_RING_SLOTS = 4096  # Количество слотов кольца по умолчанию
+SHM_POLL_INTERVAL_MAX = 0.001  # Максимальный интервал опроса кольца читателем
+
+_created_rings = set()  # Имена колец, созданных текущим процессом
+
+RingDecoder = Callable[[memoryview], Any]
+"""Декодер отчёта для пула процессов: функция уровня модуля, принимающая данные отчёта"""
+
+
+def _align(size: int) -> int:
+    """
+    Выравнивание размера по 8 байт
+
+    Args:
+        size (int): Размер
+    Returns:
+        int: Выровненный размер
+    """
+
+    return (size + 7) & ~7
+
+
+class SharedReportRing:
+    """
+    Кольцо отчётов в разделяемой памяти с одним писателем.
+
+    Писатель (поток приёма `Hid`) копирует каждый отчёт в слот кольца и
+    публикует его номер. Слот защищён номером отчёта по схеме seqlock:
+    перед записью номер слота обнуляется, после записи - устанавливается,
+    а номер последнего отчёта в заголовке обновляется в последнюю очередь.
+    Читатели не пишут в разделяемую память и не берут блокировок: каждый
+    хранит собственный курсор и проверяет номер слота до и после копирования.
+    Отстающий читатель, которого обогнал писатель, пропускает потерянные отчёты.
+
+    Порядок записей в разделяемую память полагается на строгий порядок
+    сохранений процессора (x86-64); выровненные 8-байтные номера записываются атомарно
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        """
+        Инициализация кольца поверх блока разделяемой памяти.
+        Используйте `create` и `attach`
+
+        Args:
+            memory (shared_memory.SharedMemory): Блок разделяемой памяти
+            owner (bool): Является ли процесс владельцем (писателем) кольца
+        Raises:
+            ValueError: Если блок не содержит кольца отчётов
+        """
+
+        self.memory = memory
+        self.owner = owner
+        self._buffer = memory.buf
+        magic, self.slot_count, self.slot_size, _ = SHM_RING_HEADER.unpack_from(self._buffer, 0)
+        if magic != SHM_RING_MAGIC:
+            raise ValueError(f"Shared memory {memory.name} is not a report ring")
+        self.report_size = self.slot_size - SHM_SLOT_HEADER_SIZE  # Максимальная длина отчёта
+        self._sequence = self.head  # Номер последнего опубликованного отчёта (писатель)
+        self.truncated_count = 0  # Количество отчётов, обрезанных до размера слота
+
+
+    @classmethod
+    def create(cls, report_size: int, slot_count: int = SHM_RING_SLOTS, name: Optional[str] = None) -> "SharedReportRing":
+        """
+        Создание кольца писателем
+
+        Args:
+            report_size (int): Максимальная длина отчёта (например, `input_report_length`)
+            slot_count (int): Количество слотов
+            name (Optional[str]): Имя блока разделяемой памяти (`None` - сгенерировать)
+        Returns:
+            SharedReportRing: Кольцо, принадлежащее текущему процессу
+        """
+
+        slot_size = _align(SHM_SLOT_HEADER_SIZE + report_size)
+        memory = shared_memory.SharedMemory(name, create=True, size=SHM_RING_HEADER.size + slot_count * slot_size)
+        SHM_RING_HEADER.pack_into(memory.buf, 0, SHM_RING_MAGIC, slot_count, slot_size, 0)
+        _created_rings.add(memory.name)
+
+        return cls(memory, True)
+
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedReportRing":
+        """
+        Подключение к существующему кольцу (читатели, в том числе в других процессах)
+
+        Args:
+            name (str): Имя блока разделяемой памяти
+        Returns:
+            SharedReportRing: Кольцо
+        """
+
+        memory = shared_memory.SharedMemory(name)
+        # Независимый процесс имеет собственный трекер ресурсов, который удалил бы блок при выходе.
+        # Дочерние процессы multiprocessing используют трекер родителя, снимать регистрацию им нельзя
+        if parent_process() is None and memory.name not in _created_rings:
+            resource_tracker.unregister(memory._name, "shared_memory")  # pylint: disable=protected-access
+
+        return cls(memory, False)
+
+
+    @property
+    def name(self) -> str:
+        """
+        Возвращает имя блока разделяемой памяти для подключения читателей
+
+        Returns:
+            str: Имя блока разделяемой памяти
+        """
+
+        return self.memory.name
+
+
+    @property
+    def head(self) -> int:
+        """
+        Возвращает номер последнего опубликованного отчёта
+
+        Returns:
+            int: Номер последнего опубликованного отчёта (`0` - отчётов не было)
+        """
+
+        return SHM_SEQUENCE.unpack_from(self._buffer, SHM_RING_SEQUENCE_OFFSET)[0]
+
+
+    def _slot_offset(self, sequence: int) -> int:
+        """
+        Смещение слота отчёта с указанным номером
+
+        Args:
+            sequence (int): Номер отчёта (начиная с 1)
+        Returns:
+            int: Смещение слота в блоке разделяемой памяти
+        """
+
+        return SHM_RING_HEADER.size + ((sequence - 1) % self.slot_count) * self.slot_size
+
+
+    def publish(self, report: bytes | bytearray | memoryview, timestamp: Optional[int] = None) -> int:
+        """
+        Публикация отчёта (только писатель)
+
+        Args:
+            report (bytes | bytearray | memoryview): Данные отчёта
+            timestamp (Optional[int]): Момент приёма (monotonic, нс), `None` - текущий
+        Returns:
+            int: Номер опубликованного отчёта
+        """
+
+        size = len(report)
+        if size > self.report_size:
+            report = memoryview(report)[:self.report_size]
+            size = self.report_size
+            self.truncated_count += 1
+
+        buffer = self._buffer
+        sequence = self._sequence + 1
+        offset = self._slot_offset(sequence)
+        data_start = offset + SHM_SLOT_HEADER_SIZE
+        SHM_SEQUENCE.pack_into(buffer, offset, 0)  # Слот занят записью
+        buffer[data_start:data_start + size] = report
+        SHM_SLOT_INFO.pack_into(buffer, offset + SHM_SEQUENCE.size, monotonic_ns() if timestamp is None else timestamp, size)
+        SHM_SEQUENCE.pack_into(buffer, offset, sequence)  # Слот заполнен
+        SHM_SEQUENCE.pack_into(buffer, SHM_RING_SEQUENCE_OFFSET, sequence)  # Публикуем отчёт
+        self._sequence = sequence
+
+        return sequence
+
+
+    def read_slot(self, sequence: int, out: bytearray | memoryview) -> Tuple[int, int]:
+        """
+        Копирование отчёта с указанным номером в буфер
+
+        Args:
+            sequence (int): Номер отчёта
+            out (bytearray | memoryview): Буфер не меньше `report_size`
+        Returns:
+            Tuple[int, int]:
+                Длина отчёта и момент его приёма, длина `-1` - если слот уже перезаписан
+        """
+
+        buffer = self._buffer
+        offset = self._slot_offset(sequence)
+        if SHM_SEQUENCE.unpack_from(buffer, offset)[0] != sequence:  # Слот перезаписан или занят записью
+            return -1, 0
+        timestamp, size = SHM_SLOT_INFO.unpack_from(buffer, offset + SHM_SEQUENCE.size)
+        data_start = offset + SHM_SLOT_HEADER_SIZE
+        out[:size] = buffer[data_start:data_start + size]
+        if SHM_SEQUENCE.unpack_from(buffer, offset)[0] != sequence:  # Писатель перезаписал слот во время копирования
+            return -1, 0
+
+        return size, timestamp
+
+
+    def close(self):
+        """
+        Отключение от кольца. Владелец также удаляет блок разделяемой памяти
+        """
+
+        self._buffer = None
+        self.memory.close()
+        if self.owner:
+            _created_rings.discard(self.memory.name)
+            try:
+                self.memory.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedRingReader:
+    """
+    Читатель кольца отчётов с собственным курсором.
+    Не изменяет разделяемую память, поэтому читателей может быть сколько угодно
+    """
+
+    def __init__(self, ring: SharedReportRing | str, from_start: bool = False):
+        """
+        Инициализация читателя
+
+        Args:
+            ring (SharedReportRing | str): Кольцо или имя его блока разделяемой памяти
+            from_start (bool):
+                Читать ли отчёты, ещё находящиеся в кольце (`False` - только новые)
+        """
+
+        self.ring = SharedReportRing.attach(ring) if isinstance(ring, str) else ring
+        self._owns_ring = isinstance(ring, str)
+        head = self.ring.head
+        self.cursor = max(head - self.ring.slot_count, 0) if from_start else head  # Номер последнего прочитанного
+        self._slot = bytearray(self.ring.report_size)  # Переиспользуемый буфер отчёта
+        self.lost_count = 0  # Количество пропущенных из-за отставания отчётов
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    @property
+    def pending(self) -> int:
+        """
+        Возвращает количество опубликованных, но не прочитанных отчётов
+
+        Returns:
+            int: Количество непрочитанных отчётов
+        """
+
+        return self.ring.head - self.cursor
+
+
+    def readinto(self, out: bytearray | memoryview) -> Tuple[int, int]:
+        """
+        Чтение очередного отчёта в буфер вызывающего без создания объектов
+
+        Args:
+            out (bytearray | memoryview): Буфер не меньше `ring.report_size`
+        Returns:
+            Tuple[int, int]: Длина отчёта и момент его приёма, длина `0` - если новых отчётов нет
+        """
+
+        ring = self.ring
+        while True:
+            head = ring.head
+            if self.cursor >= head:
+                return 0, 0
+            oldest = head - ring.slot_count + 1
+            if self.cursor + 1 < oldest:  # Писатель обогнал читателя - пропускаем потерянные отчёты
+                self.lost_count += oldest - self.cursor - 1
+                self.cursor = oldest - 1
+            size, timestamp = ring.read_slot(self.cursor + 1, out)
+            if size >= 0:
+                self.cursor += 1
+                return size, timestamp
+            # Слот перезаписан во время чтения - повторяем с обновлённой позицией писателя
+
+
+    def read(self) -> Optional[bytes]:
+        """
+        Чтение очередного отчёта
+
+        Returns:
+            Optional[bytes]: Данные отчёта, `None` - если новых отчётов нет
+        """
+
+        cursor = self.cursor
+        size, _ = self.readinto(self._slot)
+        if self.cursor == cursor:  # Новых отчётов нет
+            return None
+
+        return bytes(self._slot[:size])
+
+
+    def read_all(self, max_count: Optional[int] = None) -> List[bytes]:
+        """
+        Чтение всех доступных отчётов
+
+        Args:
+            max_count (Optional[int]): Максимальное количество отчётов
+        Returns:
+            List[bytes]: Данные отчётов
+        """
+
+        reports = []
+        while max_count is None or len(reports) < max_count:
+            report = self.read()
+            if report is None:
+                break
+            reports.append(report)
+
+        return reports
+
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидание новых отчётов опросом с нарастающим интервалом
+
+        Args:
+            timeout (Optional[float]): Таймаут в секундах (`None` - бесконечное ожидание)
+        Returns:
+            bool: Появились ли новые отчёты
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        interval = 0.00005
+        while self.cursor >= self.ring.head:
+            if deadline is not None and monotonic() >= deadline:
+                return False
+            sleep(interval)
+            interval = min(interval * 2, SHM_POLL_INTERVAL_MAX)
+
+        return True
+
+
+    def close(self):
+        """
+        Отключение читателя от кольца
+        """
+
+        if self._owns_ring:
+            self.ring.close()
+
+
+_worker_rings: Dict[str, SharedReportRing] = {}  # Подключённые кольца в процессе-обработчике
+
+
+def decode_ring_range(name: str, start: int, stop: int, decoder: RingDecoder) -> Tuple[List[Any], int]:
+    """
+    Декодирование диапазона отчётов кольца в процессе-обработчике.
+    Отчёты читаются из разделяемой памяти, а не передаются через pickle
+
+    Args:
+        name (str): Имя блока разделяемой памяти кольца
+        start (int): Номер первого отчёта
+        stop (int): Номер отчёта, следующего за последним
+        decoder (RingDecoder): Декодер отчёта
+    Returns:
+        Tuple[List[Any], int]: Результаты декодирования и количество потерянных отчётов
+    """
+
+    ring = _worker_rings.get(name)
+    if ring is None:
+        ring = _worker_rings[name] = SharedReportRing.attach(name)
+
+    slot = bytearray(ring.report_size)
+    view = memoryview(slot)
+    results = []
+    lost = 0
+    for sequence in range(start, stop):
+        size, _ = ring.read_slot(sequence, slot)
+        if size < 0:  # Отчёт уже перезаписан
+            lost += 1
+            continue
+        results.append(decoder(view[:size]))
+
+    return results, lost
+
+
+class RingDecodePool:
+    """
+    Распределение декодирования отчётов кольца по пулу процессов.
+
+    Родительский процесс передаёт обработчикам только имя кольца и диапазоны
+    номеров отчётов, а сами отчёты обработчики читают из разделяемой памяти
+    """
+
+    def __init__(self, executor: Executor, ring: SharedReportRing, decoder: RingDecoder, batch_size: int = 256):
+        """
+        Инициализация распределителя
+
+        Args:
+            executor (Executor): Пул процессов (например, `ProcessPoolExecutor`)
+            ring (SharedReportRing): Кольцо отчётов
+            decoder (RingDecoder): Декодер отчёта (функция уровня модуля)
+            batch_size (int): Количество отчётов в одной задаче
+        """
+
+        self.executor = executor
+        self.ring = ring
+        self.decoder = decoder
+        self.batch_size = batch_size
+        self.cursor = ring.head  # Номер последнего распределённого отчёта
+
+
+    def submit_pending(self) -> List[Future]:
+        """
+        Распределение всех опубликованных, но ещё не распределённых отчётов
+
+        Returns:
+            List[Future]: Задачи декодирования в порядке номеров отчётов.
+                Результат задачи - результаты декодирования и количество потерянных отчётов
+        """
+
+        head = self.ring.head
+        start = max(self.cursor + 1, head - self.ring.slot_count + 1)  # Перезаписанные отчёты уже недоступны
+        futures = []
+        for batch_start in range(start, head + 1, self.batch_size):
+            batch_stop = min(batch_start + self.batch_size, head + 1)
+            futures.append(
+                self.executor.submit(decode_ring_range, self.ring.name, batch_start, batch_stop, self.decoder)
+            )
+        self.cursor = head
+
+        return futures
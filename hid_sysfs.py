@@ -0,0 +1,368 @@
+import os
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from hid_cache import DeviceSignature, device_signature, load_cache, store_cache
+from hid_descriptor import parse_report_descriptor
+from hidraw_index import parse_hid_id, read_uevent
+from hidraw_ioctl import read_sysfs_report_descriptor
+
+SYSFS_HID_DEVICES_ROOT = "/sys/bus/hid/devices"  # Каталог sysfs с HID устройствами
+DEVICE_TABLE_TTL = 2.0  # Время жизни кэша таблицы устройств в секундах
+DEVICE_TABLE_CACHE = "device_table"  # Имя записи таблицы устройств в кэше на диске
+
+
+def _read_attribute(directory: str, name: str) -> str:
+    """
+    Чтение текстового атрибута устройства из sysfs
+
+    Args:
+        directory (str): Каталог устройства в sysfs
+        name (str): Имя атрибута
+    Returns:
+        str: Значение атрибута, пустая строка - если атрибут отсутствует
+    """
+
+    try:
+        with open(os.path.join(directory, name), "r", encoding="utf-8", errors="replace") as file:
+            return file.read().strip()
+    except OSError:
+        return ""
+
+
+class DeviceInfo:
+    """
+    Сведения об обнаруженном HID устройстве
+    """
+
+    __slots__ = (
+        "path", "vendor_id", "product_id", "serial_number", "release_number",
+        "manufacturer_string", "product_string", "usage_page", "usage",
+        "interface_number", "bus_type"
+    )
+
+    def __init__(
+            self,
+            path: bytes,
+            vendor_id: int,
+            product_id: int,
+            serial_number: str = "",
+            release_number: int = 0,
+            manufacturer_string: str = "",
+            product_string: str = "",
+            usage_page: int = 0,
+            usage: int = 0,
+            interface_number: int = -1,
+            bus_type: int = 0
+        ):
+        """
+        Инициализация сведений об устройстве
+
+        Args:
+            path (bytes): Путь до устройства
+            vendor_id (int): ID производителя
+            product_id (int): ID продукта
+            serial_number (str): Серийный номер
+            release_number (int): Номер версии устройства
+            manufacturer_string (str): Имя производителя
+            product_string (str): Имя продукта
+            usage_page (int): Страница использования верхнего уровня
+            usage (int): Использование верхнего уровня
+            interface_number (int): Номер интерфейса USB (`-1` - неизвестен)
+            bus_type (int): Тип шины
+        """
+
+        self.path = path
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.serial_number = serial_number
+        self.release_number = release_number
+        self.manufacturer_string = manufacturer_string
+        self.product_string = product_string
+        self.usage_page = usage_page
+        self.usage = usage
+        self.interface_number = interface_number
+        self.bus_type = bus_type
+
+
+    def __repr__(self) -> str:
+        return (
+            f"DeviceInfo(path={self.path!r}, vendor_id={self.vendor_id:#06x}, "
+            f"product_id={self.product_id:#06x}, product_string={self.product_string!r})"
+        )
+
+
+    @classmethod
+    def from_dict(cls, device: Dict[str, Any]) -> "DeviceInfo":
+        """
+        Создание сведений из словаря в формате hidapi
+
+        Args:
+            device (Dict[str, Any]): Словарь свойств устройства
+        Returns:
+            DeviceInfo: Сведения об устройстве
+        """
+
+        return cls(**{name: device[name] for name in cls.__slots__ if device.get(name) is not None})
+
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Представление сведений в виде словаря в формате hidapi
+
+        Returns:
+            Dict[str, Any]: Словарь свойств устройства
+        """
+
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class DeviceTable:
+    """
+    Таблица обнаруженных HID устройств с поиском за O(1)
+    по имени продукта, VID/PID и серийному номеру
+    """
+
+    __slots__ = ("devices", "_by_product", "_by_ids", "_by_serial")
+
+    def __init__(self, devices: List[DeviceInfo]):
+        """
+        Построение таблицы устройств
+
+        Args:
+            devices (List[DeviceInfo]): Список сведений об устройствах
+        """
+
+        self.devices = devices
+        self._by_product: Dict[str, DeviceInfo] = {}  # Поиск по имени продукта
+        self._by_ids: Dict[Tuple[int, int, Optional[str]], DeviceInfo] = {}  # Поиск по VID/PID/серийному номеру
+        self._by_serial: Dict[str, DeviceInfo] = {}  # Поиск по серийному номеру
+
+        for device in devices:  # Первое обнаруженное устройство имеет приоритет
+            self._by_product.setdefault(device.product_string, device)
+            self._by_ids.setdefault((device.vendor_id, device.product_id, None), device)
+            if device.serial_number:
+                self._by_ids.setdefault((device.vendor_id, device.product_id, device.serial_number), device)
+                self._by_serial.setdefault(device.serial_number, device)
+
+
+    def __iter__(self) -> Iterator[DeviceInfo]:
+        return iter(self.devices)
+
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+
+    def by_product_string(self, product_string: str) -> Optional[DeviceInfo]:
+        """
+        Поиск устройства по имени продукта
+
+        Args:
+            product_string (str): Имя продукта
+        Returns:
+            Optional[DeviceInfo]: Сведения об устройстве или `None`
+        """
+
+        return self._by_product.get(product_string)
+
+
+    def by_ids(
+            self,
+            vendor_id: int,
+            product_id: int,
+            serial_number: Optional[str | int] = None
+        ) -> Optional[DeviceInfo]:
+        """
+        Поиск устройства по VID/PID и, опционально, серийному номеру
+
+        Args:
+            vendor_id (int): ID производителя
+            product_id (int): ID продукта
+            serial_number (Optional[str | int]): Серийный номер
+        Returns:
+            Optional[DeviceInfo]: Сведения об устройстве или `None`
+        """
+
+        serial = None if serial_number is None else str(serial_number)
+
+        return self._by_ids.get((vendor_id, product_id, serial))
+
+
+    def by_serial(self, serial_number: str | int) -> Optional[DeviceInfo]:
+        """
+        Поиск устройства по серийному номеру
+
+        Args:
+            serial_number (str | int): Серийный номер
+        Returns:
+            Optional[DeviceInfo]: Сведения об устройстве или `None`
+        """
+
+        return self._by_serial.get(str(serial_number))
+
+
+def _read_sysfs_device(device_dir: str) -> Optional[DeviceInfo]:
+    """
+    Чтение сведений об HID устройстве из его каталога sysfs
+
+    Args:
+        device_dir (str): Каталог HID устройства в `/sys/bus/hid/devices`
+    Returns:
+        Optional[DeviceInfo]:
+            Сведения об устройстве, `None` - если у устройства нет узла hidraw
+    """
+
+    try:
+        hidraw_names = os.listdir(os.path.join(device_dir, "hidraw"))
+    except OSError:
+        return None
+    if not hidraw_names:
+        return None
+
+    uevent = read_uevent(os.path.join(device_dir, "uevent"))
+    bus_type, vendor_id, product_id = parse_hid_id(uevent.get("HID_ID", ""))
+    hid_name = uevent.get("HID_NAME", "")
+    serial_number = uevent.get("HID_UNIQ", "")
+    manufacturer_string = ""
+    product_string = hid_name
+    release_number = 0
+    interface_number = -1
+
+    # Для USB устройств строки берём из дескрипторов родительского устройства USB:
+    interface_dir = os.path.dirname(os.path.realpath(device_dir))  # Интерфейс USB (`3-1:1.0`)
+    usb_dir = os.path.dirname(interface_dir)  # Устройство USB (`3-1`)
+    interface_attribute = _read_attribute(interface_dir, "bInterfaceNumber")
+    if interface_attribute:
+        interface_number = int(interface_attribute, 16)
+        manufacturer_string = _read_attribute(usb_dir, "manufacturer")
+        product_string = _read_attribute(usb_dir, "product") or hid_name
+        serial_number = _read_attribute(usb_dir, "serial") or serial_number
+        release_number = int(_read_attribute(usb_dir, "bcdDevice") or "0", 16)
+
+    # Использование верхнего уровня берём из дескриптора отчётов, как это делает hidapi:
+    usage_page = usage = 0
+    raw_descriptor = read_sysfs_report_descriptor(device_dir)
+    if raw_descriptor:
+        try:
+            descriptor = parse_report_descriptor(raw_descriptor)
+            usage_page, usage = descriptor.usage_page, descriptor.usage
+        except ValueError:
+            pass
+
+    return DeviceInfo(
+        path = f"/dev/{min(hidraw_names, key=lambda name: (len(name), name))}".encode(),
+        vendor_id = vendor_id,
+        product_id = product_id,
+        serial_number = serial_number,
+        release_number = release_number,
+        manufacturer_string = manufacturer_string,
+        product_string = product_string,
+        usage_page = usage_page,
+        usage = usage,
+        interface_number = interface_number,
+        bus_type = bus_type
+    )
+
+
+def enumerate_sysfs(root: str = SYSFS_HID_DEVICES_ROOT) -> List[DeviceInfo]:
+    """
+    Обнаружение HID устройств через sysfs без использования hidapi
+
+    Args:
+        root (str): Каталог sysfs с HID устройствами
+    Returns:
+        List[DeviceInfo]: Сведения обо всех устройствах с узлами hidraw
+    """
+
+    devices = []
+    for name in sorted(os.listdir(root)):
+        device = _read_sysfs_device(os.path.join(root, name))
+        if device is not None:
+            devices.append(device)
+
+    return devices
+
+
+def enumerate_hidapi() -> List[DeviceInfo]:
+    """
+    Обнаружение HID устройств через hidapi (для систем без sysfs)
+
+    Returns:
+        List[DeviceInfo]: Сведения обо всех обнаруженных устройствах
+    """
+
+    from hid import enumerate as hid_enumerate  # pylint: disable=import-outside-toplevel
+
+    return [DeviceInfo.from_dict(device) for device in hid_enumerate()]
+
+
+def enumerate_devices() -> List[DeviceInfo]:
+    """
+    Обнаружение HID устройств доступным способом:
+    через sysfs на Linux и через hidapi на остальных системах
+
+    Returns:
+        List[DeviceInfo]: Сведения обо всех обнаруженных устройствах
+    """
+
+    if os.path.isdir(SYSFS_HID_DEVICES_ROOT):
+        return enumerate_sysfs()
+
+    return enumerate_hidapi()
+
+
+_table_lock = Lock()  # Блокировка обновления кэша таблицы
+_cached_table: Optional[DeviceTable] = None  # Кэшированная таблица устройств
+_cached_at = 0.0  # Момент построения кэшированной таблицы
+_table_built = False  # Строилась ли таблица в этом процессе
+_stored_cache: Optional[Tuple[Optional[DeviceSignature], List[Dict[str, Any]]]] = None  # Записанное в кэш на диске
+
+
+def get_device_table(max_age: float = DEVICE_TABLE_TTL) -> DeviceTable:
+    """
+    Получение общей для процесса таблицы HID устройств.
+    Таблица перестраивается, если она старше указанного времени.
+    При первом обращении в процессе таблица берётся из кэша на диске,
+    если набор узлов устройств с момента его записи не изменился
+
+    Args:
+        max_age (float): Допустимый возраст таблицы в секундах (`0` - всегда перестраивать)
+    Returns:
+        DeviceTable: Таблица обнаруженных устройств
+    """
+
+    global _cached_table, _cached_at, _table_built, _stored_cache  # pylint: disable=global-statement
+
+    with _table_lock:
+        now = monotonic()
+        if _cached_table is None or now - _cached_at >= max_age:
+            signature = device_signature()
+            cached = load_cache(DEVICE_TABLE_CACHE, signature) if not _table_built and max_age else None
+            if cached is not None:
+                devices = [DeviceInfo.from_dict(device) for device in cached]
+                _stored_cache = (signature, cached)
+            else:
+                devices = enumerate_devices()
+                data = [device.as_dict() for device in devices]
+                # Перестроение по истечении возраста таблицы не переписывает неизменившийся кэш
+                if _stored_cache != (signature, data):
+                    store_cache(DEVICE_TABLE_CACHE, signature, data)
+                    _stored_cache = (signature, data)
+            _cached_table = DeviceTable(devices)
+            _cached_at = now
+            _table_built = True
+
+        return _cached_table
+
+
+def invalidate_device_table():
+    """
+    Сброс кэша таблицы устройств
+    """
+
+    global _cached_table  # pylint: disable=global-statement
+
+    with _table_lock:
+        _cached_table = None
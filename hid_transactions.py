@@ -0,0 +1,417 @@
+import asyncio
+import heapq
+from collections import deque
+from concurrent.futures import Future
+from itertools import count
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from base_hid import HIDDeviceError
+from crsf import CRSF_EXTENDED_FRAMETYPE_MIN, CRSF_FRAMETYPE_DEVICE_INFO, CRSF_FRAMETYPE_LINK_STATISTICS, \
+    CRSF_FRAMETYPE_RC_CHANNELS_PACKED, CrsfDeviceInfo, CrsfFrame, CrsfParser, LinkStatistics, RcChannels
+
+TRANSACTION_TIMEOUT = 1.0  # Время ожидания ответа по умолчанию в секундах
+TRANSACTION_POLL_INTERVAL = 0.1  # Максимальный интервал ожидания потока приёма
+
+FrameKey = Tuple[int, Optional[int]]
+"""Ключ сопоставления ответа: тип кадра и адрес отправителя (`None` - любой)"""
+FrameMatcher = Callable[[Any], bool]
+"""Дополнительная проверка ответа (например, по номеру параметра)"""
+FrameCallback = Callable[[Any], None]
+"""Обработчик кадров, не относящихся ни к одному запросу"""
+
+
+def frame_key(frame) -> FrameKey:
+    """
+    Получение ключа сопоставления декодированного кадра CRSF
+
+    Args:
+        frame (CrsfFrame | RcChannels | LinkStatistics | CrsfDeviceInfo): Кадр
+    Returns:
+        FrameKey: Тип кадра и адрес отправителя (`None` - для кадров без адресов)
+    """
+
+    if isinstance(frame, CrsfDeviceInfo):
+        return CRSF_FRAMETYPE_DEVICE_INFO, frame.origin
+    if isinstance(frame, RcChannels):
+        return CRSF_FRAMETYPE_RC_CHANNELS_PACKED, None
+    if isinstance(frame, LinkStatistics):
+        return CRSF_FRAMETYPE_LINK_STATISTICS, None
+    if frame.frame_type >= CRSF_EXTENDED_FRAMETYPE_MIN and len(frame.payload) >= 2:
+        return frame.frame_type, frame.payload[1]  # Расширенный кадр: получатель, отправитель
+
+    return frame.frame_type, None
+
+
+class _Transaction:
+    """
+    Ожидающий ответа запрос
+    """
+
+    __slots__ = ("key", "match", "future", "deadline")
+
+    def __init__(self, key: FrameKey, match: Optional[FrameMatcher], future: Future, deadline: float):
+        self.key = key
+        self.match = match
+        self.future = future
+        self.deadline = deadline
+
+
+class TransactionManager:
+    """
+    Менеджер конвейерных транзакций запрос-ответ поверх HID устройства.
+
+    Запросы отправляются сразу, не дожидаясь ответов на предыдущие,
+    а ответы сопоставляются с запросами в потоке приёма по типу кадра CRSF,
+    адресу отправителя и, при необходимости, дополнительной проверке.
+    Ответы на запросы с одинаковым ключом распределяются в порядке отправки.
+    Для каждого запроса возвращается `Future` с собственным временем ожидания;
+    для asyncio доступен `arequest`
+    """
+
+    def __init__(self, device, on_frame: Optional[FrameCallback] = None):
+        """
+        Инициализация менеджера
+
+        Args:
+            device (BaseHid): Открытое устройство. Менеджер забирает на себя
+                приём данных устройства, поэтому фоновое чтение должно быть выключено
+            on_frame (Optional[FrameCallback]):
+                Обработчик кадров, не являющихся ответом ни на один запрос
+        Raises:
+            ValueError: Если у устройства запущено фоновое чтение
+                или устройство асинхронное (`AsyncHid`)
+        """
+
+        if device.reader_queue is not None:
+            raise ValueError("Device reader is running")
+        if asyncio.iscoroutinefunction(device.write):  # Запросы пишутся синхронно из вызывающего потока
+            raise ValueError("Asynchronous devices are not supported")
+
+        self.device = device
+        self.parser = CrsfParser()
+        self.on_frame = on_frame
+        self._pending: Dict[FrameKey, Deque[_Transaction]] = {}  # Ожидающие запросы по ключу ответа
+        self._deadlines: List[Tuple[float, int, _Transaction]] = []  # Куча сроков ожидания
+        self._sequence = count()  # Порядок запросов с одинаковым сроком
+        self._lock = Lock()  # Защита ожидающих запросов
+        self._write_lock = Lock()  # Запись отчётов из нескольких потоков
+        self._running = False
+        self._thread: Optional[Thread] = None
+
+        self.requests_count = 0  # Количество отправленных запросов
+        self.responses_count = 0  # Количество сопоставленных ответов
+        self.timeouts_count = 0  # Количество запросов, не дождавшихся ответа
+        self.unmatched_count = 0  # Количество кадров, не относящихся ни к одному запросу
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Возвращает количество запросов, ожидающих ответа
+
+        Returns:
+            int: Количество запросов, ожидающих ответа
+        """
+
+        with self._lock:
+            return sum(len(transactions) for transactions in self._pending.values())
+
+
+    def start(self):
+        """
+        Запуск потока приёма и сопоставления ответов
+        """
+
+        if self._thread is None:
+            self._running = True
+            self._thread = Thread(target=self._receive_loop, name="HidTransactions", daemon=True)
+            self._thread.start()
+
+
+    def submit(
+            self,
+            request: bytes | bytearray | memoryview,
+            frame_type: int,
+            origin: Optional[int] = None,
+            timeout: float = TRANSACTION_TIMEOUT,
+            match: Optional[FrameMatcher] = None
+        ) -> Future:
+        """
+        Отправка запроса без ожидания ответа
+
+        Args:
+            request (bytes | bytearray | memoryview): Данные запроса (например, кадр CRSF)
+            frame_type (int): Тип кадра ответа
+            origin (Optional[int]): Адрес отправителя ответа (`None` - любой)
+            timeout (float): Время ожидания ответа в секундах
+            match (Optional[FrameMatcher]): Дополнительная проверка кадра ответа
+        Returns:
+            Future: Ожидание кадра ответа. При истечении времени
+                завершается исключением `TimeoutError`, если поток приёма
+                не запущен - исключением `HIDDeviceError`
+        """
+
+        future: Future = Future()
+        if not self._running:  # Ответ некому сопоставить и некому истечь сроку ожидания
+            future.set_exception(HIDDeviceError("Transaction manager is not running"))
+            return future
+
+        transaction = _Transaction((frame_type, origin), match, future, monotonic() + timeout)
+
+        # Регистрируем запрос до отправки, чтобы не пропустить быстрый ответ:
+        with self._lock:
+            self._pending.setdefault(transaction.key, deque()).append(transaction)
+            earliest = not self._deadlines or transaction.deadline < self._deadlines[0][0]
+            heapq.heappush(self._deadlines, (transaction.deadline, next(self._sequence), transaction))
+
+        try:
+            with self._write_lock:
+                result = self.device.write(request)
+                if result.bytes_count < len(request):  # Очередь отправки переполнена или ошибка записи
+                    raise HIDDeviceError("Request not accepted by the device")
+                self.requests_count += 1
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            self._discard(transaction)
+            future.set_exception(exception)
+            return future
+
+        if earliest:  # Поток приёма должен пересчитать время ожидания
+            self.device.wakeup()
+
+        return future
+
+
+    def submit_many(
+            self,
+            requests: Iterable[Tuple],
+            timeout: float = TRANSACTION_TIMEOUT,
+            match: Optional[FrameMatcher] = None
+        ) -> List[Future]:
+        """
+        Конвейерная отправка пакета запросов
+
+        Args:
+            requests (Iterable[Tuple]):
+                Данные запроса, тип кадра ответа, адрес отправителя ответа
+                и, при необходимости, собственная проверка кадра ответа
+            timeout (float): Время ожидания каждого ответа в секундах
+            match (Optional[FrameMatcher]): Проверка кадров ответа для запросов без собственной
+        Returns:
+            List[Future]: Ожидания ответов в порядке запросов
+        """
+
+        futures: List[Future] = []
+        for request, frame_type, origin, *own_match in requests:
+            futures.append(self.submit(request, frame_type, origin, timeout, own_match[0] if own_match else match))
+
+        return futures
+
+
+    def request(
+            self,
+            request: bytes | bytearray | memoryview,
+            frame_type: int,
+            origin: Optional[int] = None,
+            timeout: float = TRANSACTION_TIMEOUT,
+            match: Optional[FrameMatcher] = None
+        ):
+        """
+        Отправка запроса с ожиданием ответа в текущем потоке
+
+        Args:
+            request (bytes | bytearray | memoryview): Данные запроса
+            frame_type (int): Тип кадра ответа
+            origin (Optional[int]): Адрес отправителя ответа (`None` - любой)
+            timeout (float): Время ожидания ответа в секундах
+            match (Optional[FrameMatcher]): Дополнительная проверка кадра ответа
+        Returns:
+            CrsfFrame | CrsfDeviceInfo | LinkStatistics | RcChannels: Кадр ответа
+        Raises:
+            TimeoutError: Если ответ не получен за указанное время
+            HIDDeviceError: Если поток приёма не запущен
+        """
+
+        # Срок ожидания ограничивается и здесь: поток приёма мог остановиться после отправки
+        return self.submit(request, frame_type, origin, timeout, match).result(timeout)
+
+
+    async def arequest(
+            self,
+            request: bytes | bytearray | memoryview,
+            frame_type: int,
+            origin: Optional[int] = None,
+            timeout: float = TRANSACTION_TIMEOUT,
+            match: Optional[FrameMatcher] = None
+        ):
+        """
+        Отправка запроса с ожиданием ответа в asyncio
+
+        Args:
+            request (bytes | bytearray | memoryview): Данные запроса
+            frame_type (int): Тип кадра ответа
+            origin (Optional[int]): Адрес отправителя ответа (`None` - любой)
+            timeout (float): Время ожидания ответа в секундах
+            match (Optional[FrameMatcher]): Дополнительная проверка кадра ответа
+        Returns:
+            CrsfFrame | CrsfDeviceInfo | LinkStatistics | RcChannels: Кадр ответа
+        Raises:
+            TimeoutError: Если ответ не получен за указанное время
+        """
+
+        return await asyncio.wrap_future(self.submit(request, frame_type, origin, timeout, match))
+
+
+    def _discard(self, transaction: _Transaction):
+        """
+        Удаление запроса из ожидающих
+
+        Args:
+            transaction (_Transaction): Запрос
+        """
+
+        with self._lock:
+            transactions = self._pending.get(transaction.key)
+            if transactions is not None and transaction in transactions:
+                transactions.remove(transaction)
+                if not transactions:
+                    del self._pending[transaction.key]
+
+
+    def _take(self, key: FrameKey, frame) -> Optional[_Transaction]:
+        """
+        Извлечение первого запроса, ожидающего кадр с указанным ключом
+
+        Args:
+            key (FrameKey): Ключ кадра
+            frame: Декодированный кадр
+        Returns:
+            Optional[_Transaction]: Запрос или `None`
+        """
+
+        transactions = self._pending.get(key)
+        if not transactions:
+            return None
+
+        for transaction in transactions:
+            if transaction.match is None or transaction.match(frame):
+                transactions.remove(transaction)
+                if not transactions:
+                    del self._pending[key]
+                return transaction
+
+        return None
+
+
+    def dispatch(self, frame) -> bool:
+        """
+        Сопоставление принятого кадра с ожидающими запросами
+
+        Args:
+            frame (CrsfFrame | CrsfDeviceInfo | LinkStatistics | RcChannels): Кадр
+        Returns:
+            bool: Был ли кадр ответом на запрос
+        """
+
+        frame_type, origin = frame_key(frame)
+        with self._lock:
+            transaction = self._take((frame_type, origin), frame)
+            if transaction is None and origin is not None:  # Запросы, ожидающие ответ от любого отправителя
+                transaction = self._take((frame_type, None), frame)
+
+        if transaction is None:
+            self.unmatched_count += 1
+            if self.on_frame is not None:
+                self.on_frame(frame)
+            return False
+
+        self.responses_count += 1
+        if not transaction.future.done():
+            transaction.future.set_result(frame)
+
+        return True
+
+
+    def _expire(self) -> Optional[float]:
+        """
+        Завершение запросов с истёкшим временем ожидания
+
+        Returns:
+            Optional[float]: Время до ближайшего срока в секундах (`None` - запросов нет)
+        """
+
+        expired = []
+        now = monotonic()
+        with self._lock:
+            deadlines = self._deadlines
+            while deadlines and (deadlines[0][2].future.done() or deadlines[0][0] <= now):
+                transaction = heapq.heappop(deadlines)[2]
+                if not transaction.future.done():
+                    transactions = self._pending.get(transaction.key)
+                    if transactions is not None and transaction in transactions:
+                        transactions.remove(transaction)
+                        if not transactions:
+                            del self._pending[transaction.key]
+                    expired.append(transaction)
+            delay = deadlines[0][0] - now if deadlines else None
+
+        for transaction in expired:
+            self.timeouts_count += 1
+            if not transaction.future.done():
+                transaction.future.set_exception(TimeoutError("No response"))
+
+        return delay
+
+
+    def _receive_loop(self):
+        """
+        Цикл потока приёма: разбор кадров, сопоставление ответов и отслеживание сроков
+        """
+
+        device = self.device
+        parser = self.parser
+        while self._running:
+            try:
+                if device.in_waiting:
+                    for frame in parser.feed_from(device.buffer):
+                        self.dispatch(frame)
+            except (OSError, TypeError):  # Устройство закрыто или отключено
+                pass
+
+            delay = self._expire()
+            timeout = TRANSACTION_POLL_INTERVAL if delay is None else min(delay, TRANSACTION_POLL_INTERVAL)
+            if self._running:
+                device._wait_readable(max(timeout, 0))  # pylint: disable=protected-access
+
+
+    def close(self):
+        """
+        Остановка потока приёма и отмена всех ожидающих запросов
+        """
+
+        self._running = False
+        if self._thread is not None:
+            self.device.wakeup()
+            self._thread.join()
+            self._thread = None
+            # Пробуждение адресовалось потоку приёма и не должно прервать следующее чтение устройства
+            self.device.cancel_wakeup()
+
+        with self._lock:
+            transactions = [transaction for pending in self._pending.values() for transaction in pending]
+            self._pending.clear()
+            self._deadlines.clear()
+
+        for transaction in transactions:
+            if not transaction.future.done():
+                transaction.future.set_exception(HIDDeviceError("Transaction manager closed"))
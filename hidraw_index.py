@@ -0,0 +1,373 @@
+import os
+import re
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from hid_cache import DeviceSignature, device_signature, load_cache, store_cache
+
+SYSFS_HIDRAW_ROOT = "/sys/class/hidraw"  # Каталог sysfs с узлами hidraw
+DEV_ROOT = "/dev"  # Каталог файлов устройств
+HIDRAW_INDEX_CACHE = "hidraw_index"  # Имя записи индекса в кэше на диске
+MISS_RESCAN_INTERVAL = 1.0  # Минимальный интервал перестроения индекса при промахах поиска, с
+
+_USB_DEVICE_PATTERN = re.compile(r"\d+-[\d.]+")  # Путь USB устройства на шине (`3-1`, `3-1.2`)
+_USB_INTERFACE_PATTERN = re.compile(r"\d+-[\d.]+:\d+\.\d+")  # Путь интерфейса USB (`3-1:1.0`)
+_HID_DEVICE_PATTERN = re.compile(r"[0-9A-F]{4}:[0-9A-F]{4}:[0-9A-F]{4}\.[0-9A-F]{4}")  # Имя HID устройства
+
+
+def read_uevent(path: str) -> Dict[str, str]:
+    """
+    Чтение файла uevent из sysfs
+
+    Args:
+        path (str): Путь до файла uevent
+    Returns:
+        Dict[str, str]:
+            Пары ключ-значение из файла, пустой словарь - если файл не прочитан
+    """
+
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            content = file.read()
+    except OSError:
+        return {}
+
+    return dict(line.split("=", 1) for line in content.splitlines() if "=" in line)
+
+
+def parse_hid_id(hid_id: str) -> Tuple[int, int, int]:
+    """
+    Разбор значения HID_ID из uevent (`BBBB:VVVVVVVV:PPPPPPPP`)
+
+    Args:
+        hid_id (str): Значение HID_ID
+    Returns:
+        Tuple[int, int, int]: Тип шины, ID производителя и ID продукта
+    """
+
+    try:
+        bus_type, vendor_id, product_id = (int(part, 16) for part in hid_id.split(":"))
+    except ValueError:
+        return 0, 0, 0
+
+    return bus_type, vendor_id, product_id
+
+
+class HidrawNode(NamedTuple):
+    """
+    Узел hidraw и сведения о соответствующем HID устройстве
+
+    Attributes:
+        name (str): Имя узла (`hidrawN`)
+        dev_path (str): Путь до файла устройства (`/dev/hidrawN`)
+        sys_path (str): Полный путь до HID устройства в sysfs
+        bus_type (int): Тип шины (`3` - USB, `5` - Bluetooth)
+        vendor_id (int): ID производителя
+        product_id (int): ID продукта
+        uniq (str): Уникальный идентификатор (HID_UNIQ, обычно серийный номер)
+        hid_name (str): Имя устройства (HID_NAME)
+        phys (str): Физический путь устройства (HID_PHYS)
+    """
+
+    name: str  # Имя узла
+    dev_path: str  # Путь до файла устройства
+    sys_path: str  # Полный путь до HID устройства в sysfs
+    bus_type: int  # Тип шины
+    vendor_id: int  # ID производителя
+    product_id: int  # ID продукта
+    uniq: str  # Уникальный идентификатор
+    hid_name: str  # Имя устройства
+    phys: str  # Физический путь устройства
+
+
+class HidrawIndex:
+    """
+    Кэшируемый индекс узлов hidraw.
+
+    Строится однократно по содержимому `/sys/class/hidraw` и сопоставляет
+    узлу пути hidapi, пути на шине, VID/PID/серийный номер и HID_UNIQ.
+    Индекс перестраивается при изменении каталога `/dev`
+    (создание или удаление узлов) или при явной инвалидации.
+    Узлы сохраняются в кэш на диске, поэтому повторный запуск процесса
+    при неизменном наборе устройств обходится без чтения sysfs
+    """
+
+    def __init__(self, sysfs_root: str = SYSFS_HIDRAW_ROOT, dev_root: str = DEV_ROOT, disk_cache: bool = True):
+        """
+        Инициализация индекса
+
+        Args:
+            sysfs_root (str): Каталог sysfs с узлами hidraw
+            dev_root (str): Каталог файлов устройств
+            disk_cache (bool): Использовать ли кэш на диске (только для стандартных каталогов)
+        """
+
+        self._sysfs_root = sysfs_root
+        self._dev_root = dev_root
+        self._disk_cache = disk_cache and sysfs_root == SYSFS_HIDRAW_ROOT and dev_root == DEV_ROOT
+        self._built = False  # Строился ли индекс в этом процессе
+        self._from_disk = False  # Построен ли индекс из кэша на диске
+        self._refreshed_at = 0.0  # Момент последнего перестроения (monotonic)
+        self._lock = Lock()  # Блокировка перестроения индекса
+        self._signature: Optional[int] = None  # Признак актуальности индекса
+        self._stored_signature: Optional[DeviceSignature] = None  # Признак узлов, записанных в кэш на диске
+        self._nodes: List[HidrawNode] = []  # Все найденные узлы
+        self._by_path: Dict[str, HidrawNode] = {}  # Поиск по путям и их компонентам
+        self._by_ids: Dict[Tuple[int, int, Optional[str]], HidrawNode] = {}  # Поиск по VID/PID/серийному номеру
+        self._by_uniq: Dict[str, HidrawNode] = {}  # Поиск по HID_UNIQ
+
+
+    def _current_signature(self) -> Optional[int]:
+        """
+        Получение признака актуальности индекса (время изменения `/dev`)
+
+        Returns:
+            Optional[int]: Время изменения каталога в наносекундах
+        """
+
+        try:
+            return os.stat(self._dev_root).st_mtime_ns
+        except OSError:
+            return None
+
+
+    def _read_node(self, name: str) -> HidrawNode:
+        """
+        Чтение сведений об узле hidraw из sysfs
+
+        Args:
+            name (str): Имя узла (`hidrawN`)
+        Returns:
+            HidrawNode: Сведения об узле
+        """
+
+        device_link = os.path.join(self._sysfs_root, name, "device")  # Ссылка на HID устройство
+        uevent = read_uevent(os.path.join(device_link, "uevent"))
+        bus_type, vendor_id, product_id = parse_hid_id(uevent.get("HID_ID", ""))
+
+        return HidrawNode(
+            name = name,
+            dev_path = os.path.join(self._dev_root, name),
+            sys_path = os.path.realpath(device_link),
+            bus_type = bus_type,
+            vendor_id = vendor_id,
+            product_id = product_id,
+            uniq = uevent.get("HID_UNIQ", ""),
+            hid_name = uevent.get("HID_NAME", ""),
+            phys = uevent.get("HID_PHYS", "")
+        )
+
+
+    def _scan(self) -> List[HidrawNode]:
+        """
+        Чтение сведений обо всех узлах hidraw из sysfs
+
+        Returns:
+            List[HidrawNode]: Узлы в порядке номеров
+        """
+
+        try:
+            names = os.listdir(self._sysfs_root)
+        except OSError:
+            names = []
+        # Сортируем по номеру узла, чтобы первым находился узел с меньшим номером:
+        names.sort(key=lambda name: (len(name), name))
+
+        return [self._read_node(name) for name in names]
+
+
+    def refresh(self, use_disk_cache: bool = False):
+        """
+        Перестроение индекса по содержимому sysfs
+
+        Args:
+            use_disk_cache (bool): Взять ли узлы из кэша на диске, если набор устройств не изменился
+        """
+
+        with self._lock:
+            signature = self._current_signature()  # Фиксируем признак до чтения каталога
+            disk_signature = device_signature(self._dev_root) if self._disk_cache else None
+
+            cached = load_cache(HIDRAW_INDEX_CACHE, disk_signature) if use_disk_cache else None
+            if cached is not None:
+                nodes = [HidrawNode(*fields) for fields in cached]
+                self._stored_signature = disk_signature
+            else:
+                nodes = self._scan()
+                # Повторные сканирования при промахах не переписывают кэш, если узлы не изменились
+                if disk_signature != self._stored_signature or nodes != self._nodes:
+                    store_cache(HIDRAW_INDEX_CACHE, disk_signature, [tuple(node) for node in nodes])
+                    self._stored_signature = disk_signature
+
+            by_path: Dict[str, HidrawNode] = {}
+            by_ids: Dict[Tuple[int, int, Optional[str]], HidrawNode] = {}
+            by_uniq: Dict[str, HidrawNode] = {}
+
+            for node in nodes:
+                by_path.setdefault(node.name, node)
+                by_path.setdefault(node.dev_path, node)
+                by_path.setdefault(node.sys_path, node)
+                for component in self._path_keys(node.sys_path):
+                    by_path.setdefault(component, node)
+                if node.phys:
+                    by_path.setdefault(node.phys, node)
+
+                by_ids.setdefault((node.vendor_id, node.product_id, None), node)
+                if node.uniq:
+                    by_ids.setdefault((node.vendor_id, node.product_id, node.uniq), node)
+                    by_uniq.setdefault(node.uniq, node)
+
+            self._nodes = nodes
+            self._by_path = by_path
+            self._by_ids = by_ids
+            self._by_uniq = by_uniq
+            self._signature = signature
+            self._built = True
+            self._from_disk = cached is not None
+            self._refreshed_at = monotonic()
+
+
+    @staticmethod
+    def _path_keys(sys_path: str) -> List[str]:
+        """
+        Компоненты пути sysfs, однозначно указывающие на устройство:
+        путь USB устройства на шине, ближайший к узлу (`3-1.2`), путь интерфейса (`3-1.2:1.0`)
+        и имя HID устройства. Общие предки (контроллеры PCI, хабы) не индексируются
+
+        Args:
+            sys_path (str): Полный путь до HID устройства в sysfs
+        Returns:
+            List[str]: Ключи поиска
+        """
+
+        usb_device = None
+        usb_interface = None
+        keys = []
+        for component in sys_path.split(os.sep):
+            if _USB_INTERFACE_PATTERN.fullmatch(component):
+                usb_interface = component
+            elif _USB_DEVICE_PATTERN.fullmatch(component):
+                usb_device = component
+            elif _HID_DEVICE_PATTERN.fullmatch(component):
+                keys.append(component)
+
+        return [key for key in (usb_device, usb_interface) if key is not None] + keys
+
+
+    def invalidate(self):
+        """
+        Сброс индекса. Индекс будет перестроен при следующем обращении
+        """
+
+        self._signature = None
+
+
+    def _ensure_fresh(self) -> bool:
+        """
+        Перестроение индекса, если узлы устройств изменились
+
+        Returns:
+            bool: Был ли индекс перестроен
+        """
+
+        if not self._built:  # Первое построение может взять узлы из кэша на диске
+            self.refresh(use_disk_cache=True)
+            return True
+        if self._signature is None or self._signature != self._current_signature():
+            self.refresh()
+            return True
+
+        return False
+
+
+    def _lookup(self, table: str, key) -> Optional[HidrawNode]:
+        """
+        Поиск узла в таблице индекса с однократным перестроением при промахе
+
+        Args:
+            table (str): Имя атрибута таблицы индекса
+            key: Ключ поиска
+        Returns:
+            Optional[HidrawNode]: Найденный узел или `None`
+        """
+
+        refreshed = self._ensure_fresh()
+        node = getattr(self, table).get(key)
+        # Узел мог появиться после построения индекса, а кэш на диске - не учитывать его.
+        # Промахи по несуществующим ключам не перестраивают индекс чаще MISS_RESCAN_INTERVAL:
+        if node is None and (
+                self._from_disk or (not refreshed and monotonic() - self._refreshed_at >= MISS_RESCAN_INTERVAL)
+            ):
+            self.refresh()
+            node = getattr(self, table).get(key)
+
+        return node
+
+
+    def resolve(self, path: str | bytes) -> Optional[HidrawNode]:
+        """
+        Поиск узла hidraw по пути устройства: пути hidapi (`/dev/hidrawN`),
+        пути на шине (`3-1:1.0`), пути sysfs или HID_PHYS
+
+        Args:
+            path (str | bytes): Путь до устройства
+        Returns:
+            Optional[HidrawNode]: Найденный узел или `None`
+        """
+
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", errors="replace")
+
+        return self._lookup("_by_path", path)
+
+
+    def find(
+            self,
+            vendor_id: int,
+            product_id: int,
+            serial_number: Optional[str | int] = None
+        ) -> Optional[HidrawNode]:
+        """
+        Поиск узла hidraw по идентификаторам устройства
+
+        Args:
+            vendor_id (int): ID производителя
+            product_id (int): ID продукта
+            serial_number (Optional[str | int]): Серийный номер, опционально
+        Returns:
+            Optional[HidrawNode]: Найденный узел или `None`
+        """
+
+        serial = None if serial_number is None else str(serial_number)
+
+        return self._lookup("_by_ids", (vendor_id, product_id, serial))
+
+
+    def find_by_uniq(self, uniq: str) -> Optional[HidrawNode]:
+        """
+        Поиск узла hidraw по HID_UNIQ
+
+        Args:
+            uniq (str): Уникальный идентификатор устройства
+        Returns:
+            Optional[HidrawNode]: Найденный узел или `None`
+        """
+
+        return self._lookup("_by_uniq", uniq)
+
+
+    def nodes(self) -> List[HidrawNode]:
+        """
+        Получение списка всех узлов hidraw
+
+        Returns:
+            List[HidrawNode]: Актуальный список узлов
+        """
+
+        self._ensure_fresh()
+
+        return list(self._nodes)
+
+
+hidraw_index = HidrawIndex()  # Общий для процесса индекс узлов hidraw
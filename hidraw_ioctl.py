@@ -0,0 +1,134 @@
+import fcntl
+import os
+import struct
+
+_IOC_NRBITS = 8
+_IOC_TYPEBITS = 8
+_IOC_SIZEBITS = 14
+
+_IOC_NRSHIFT = 0
+_IOC_TYPESHIFT = _IOC_NRSHIFT + _IOC_NRBITS
+_IOC_SIZESHIFT = _IOC_TYPESHIFT + _IOC_TYPEBITS
+_IOC_DIRSHIFT = _IOC_SIZESHIFT + _IOC_SIZEBITS
+
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+HID_MAX_DESCRIPTOR_SIZE = 4096  # Максимальный размер дескриптора отчётов
+HIDRAW_TYPE = ord("H")  # Тип ioctl команд hidraw
+DESCRIPTOR_SIZE = struct.Struct("I")  # Размер дескриптора в struct hidraw_report_descriptor
+
+
+def _ioc(direction: int, number: int, size: int) -> int:
+    """
+    Формирование номера ioctl команды hidraw (аналог макроса `_IOC`)
+
+    Args:
+        direction (int): Направление передачи (`_IOC_READ`, `_IOC_WRITE`)
+        number (int): Номер команды
+        size (int): Размер аргумента в байтах
+    Returns:
+        int: Номер ioctl команды
+    """
+
+    return (
+        (direction << _IOC_DIRSHIFT) | (HIDRAW_TYPE << _IOC_TYPESHIFT)
+        | (number << _IOC_NRSHIFT) | (size << _IOC_SIZESHIFT)
+    )
+
+
+HIDIOCGRDESCSIZE = _ioc(_IOC_READ, 0x01, DESCRIPTOR_SIZE.size)  # Получение размера дескриптора
+HIDIOCGRDESC = _ioc(_IOC_READ, 0x02, DESCRIPTOR_SIZE.size + HID_MAX_DESCRIPTOR_SIZE)  # Получение дескриптора
+
+
+def HIDIOCSFEATURE(length: int) -> int:  # pylint: disable=invalid-name
+    """
+    Номер ioctl команды отправки отчёта функций
+
+    Args:
+        length (int): Длина отчёта вместе с Report ID
+    Returns:
+        int: Номер ioctl команды
+    """
+
+    return _ioc(_IOC_WRITE | _IOC_READ, 0x06, length)
+
+
+def HIDIOCGFEATURE(length: int) -> int:  # pylint: disable=invalid-name
+    """
+    Номер ioctl команды получения отчёта функций
+
+    Args:
+        length (int): Длина буфера отчёта вместе с Report ID
+    Returns:
+        int: Номер ioctl команды
+    """
+
+    return _ioc(_IOC_WRITE | _IOC_READ, 0x07, length)
+
+
+def HIDIOCGINPUT(length: int) -> int:  # pylint: disable=invalid-name
+    """
+    Номер ioctl команды получения входного отчёта
+
+    Args:
+        length (int): Длина буфера отчёта вместе с Report ID
+    Returns:
+        int: Номер ioctl команды
+    """
+
+    return _ioc(_IOC_WRITE | _IOC_READ, 0x0A, length)
+
+
+def HIDIOCSOUTPUT(length: int) -> int:  # pylint: disable=invalid-name
+    """
+    Номер ioctl команды отправки выходного отчёта
+
+    Args:
+        length (int): Длина отчёта вместе с Report ID
+    Returns:
+        int: Номер ioctl команды
+    """
+
+    return _ioc(_IOC_WRITE | _IOC_READ, 0x0B, length)
+
+
+def get_report_descriptor(fd: int) -> bytes:
+    """
+    Получение дескриптора отчётов устройства через ioctl hidraw
+
+    Args:
+        fd (int): Дескриптор открытого узла hidraw
+    Returns:
+        bytes: Дескриптор отчётов
+    Raises:
+        OSError: Если ioctl не поддерживается дескриптором
+    """
+
+    size_buffer = bytearray(DESCRIPTOR_SIZE.size)
+    fcntl.ioctl(fd, HIDIOCGRDESCSIZE, size_buffer, True)
+    size = DESCRIPTOR_SIZE.unpack(size_buffer)[0]
+
+    # struct hidraw_report_descriptor { __u32 size; __u8 value[HID_MAX_DESCRIPTOR_SIZE]; }
+    descriptor = bytearray(DESCRIPTOR_SIZE.size + HID_MAX_DESCRIPTOR_SIZE)
+    DESCRIPTOR_SIZE.pack_into(descriptor, 0, size)
+    fcntl.ioctl(fd, HIDIOCGRDESC, descriptor, True)
+
+    return bytes(descriptor[DESCRIPTOR_SIZE.size:DESCRIPTOR_SIZE.size + size])
+
+
+def read_sysfs_report_descriptor(device_dir: str) -> bytes:
+    """
+    Чтение дескриптора отчётов из sysfs
+
+    Args:
+        device_dir (str): Каталог HID устройства в sysfs
+    Returns:
+        bytes: Дескриптор отчётов, пустой набор байт - если файл не прочитан
+    """
+
+    try:
+        with open(os.path.join(device_dir, "report_descriptor"), "rb") as file:
+            return file.read()
+    except OSError:
+        return b""
@@ -1,4 +1,4 @@
-from HID import *
+from HID import Hid
 from commands.ping import ping
 if __name__ == "__main__":
     print(Hid.discover())
@@ -0,0 +1,77 @@
+"""
+Несколько корутин, читающих одно асинхронное устройство
+"""
+
+import asyncio
+
+from async_hid import AsyncHid
+from hid_fake import FakeHid
+
+REPORTS_COUNT = 30
+
+
+class AsyncFakeHid(FakeHid, AsyncHid):
+    """
+    Фиктивное устройство с асинхронным чтением
+    """
+
+    def close(self):
+        self._stop_device()
+        AsyncHid.close(self)
+
+
+def test_concurrent_readers_share_reports():
+    async def main():
+        device = AsyncFakeHid(loopback=False)
+        device._loop = asyncio.get_running_loop()
+        device.run()
+        received = {"first": [], "second": [], "iterator": []}
+
+        async def reader(name):
+            while True:
+                report = await device.read_report()
+                if not report:
+                    return
+                received[name].append(report[1])
+
+        async def iterate():
+            async for report in device:
+                received["iterator"].append(report[1])
+
+        tasks = [
+            asyncio.create_task(reader("first")),
+            asyncio.create_task(reader("second")),
+            asyncio.create_task(iterate()),
+        ]
+        await asyncio.sleep(0.05)
+        for index in range(REPORTS_COUNT):
+            device.peer.send(bytes([0, index]) + bytes(63))
+            await asyncio.sleep(0.002)
+        await asyncio.sleep(0.1)
+
+        device.close()
+        await asyncio.wait_for(asyncio.gather(*tasks), 2)  # Закрытие будит все ожидающие корутины
+
+        return sorted(value for values in received.values() for value in values)
+
+    assert asyncio.run(main()) == list(range(REPORTS_COUNT))
+
+
+def test_cancelled_reader_does_not_cancel_others():
+    async def main():
+        device = AsyncFakeHid(loopback=False)
+        device._loop = asyncio.get_running_loop()
+        device.run()
+        try:
+            cancelled = asyncio.create_task(device.read_report())
+            waiting = asyncio.create_task(device.read_report())
+            await asyncio.sleep(0.02)
+            cancelled.cancel()
+            await asyncio.sleep(0.02)
+            device.peer.send(bytes([0, 7]) + bytes(63))
+            report = await asyncio.wait_for(waiting, 2)
+        finally:
+            device.close()
+        return report[1]
+
+    assert asyncio.run(main()) == 7
@@ -0,0 +1,73 @@
+"""
+ID входных отчётов в журнале и при воспроизведении
+"""
+
+from hid_capture import CAPTURE_INPUT, CAPTURE_OUTPUT, CaptureReader, CaptureWriter
+from hid_fake import FakeHid
+from hid_replay import ReplayHid
+
+REPORT_SIZE = 16
+
+
+def capture_fake_reports(path, report_id, count=5):
+    device = FakeHid(report_size=REPORT_SIZE, rate=1000, send_report_id=report_id)
+    device.run()
+    device.timeout = 1
+    reports = []
+    try:
+        device.start_capture(str(path))
+        while len(reports) < count:
+            report = device.read(REPORT_SIZE + 1)
+            if report:
+                reports.append(report)
+        device.stop_capture()
+    finally:
+        device.close()
+    return reports
+
+
+def test_capture_records_report_id_without_descriptor(tmp_path):
+    path = tmp_path / "numbered.cap"
+    reports = capture_fake_reports(path, report_id=4)
+
+    with CaptureReader(str(path)) as reader:
+        records = list(reader.records(CAPTURE_INPUT))
+
+    assert records
+    assert {record.report_id for record in records} == {4}
+    assert [bytes(record.payload) for record in records[:len(reports)]] == reports
+
+
+def test_replay_routes_captured_report_id(tmp_path):
+    path = tmp_path / "numbered.cap"
+    capture_fake_reports(path, report_id=4)
+
+    replay = ReplayHid(str(path), speed=0)
+    replay.run()
+    try:
+        assert replay._input_has_report_id is True
+        batch = replay.recv_reports(10)
+        assert batch
+        assert {report.report_id for report in batch} == {4}
+    finally:
+        replay.close()
+
+
+def test_replay_of_unnumbered_capture(tmp_path):
+    path = str(tmp_path / "plain.cap")
+    writer = CaptureWriter(path)
+    writer.append(CAPTURE_OUTPUT, 0, b"\x00out")
+    for index in range(3):
+        writer.append(CAPTURE_INPUT, 0, bytes([index]) * 4)
+    writer.close()
+
+    replay = ReplayHid(path, speed=0)
+    replay.run()
+    try:
+        assert replay._input_has_report_id is False
+        batch = replay.recv_reports(10)
+        assert [(report.report_id, bytes(report.payload)) for report in batch] == [
+            (0, bytes([index]) * 4) for index in range(3)
+        ]
+    finally:
+        replay.close()
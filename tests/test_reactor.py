@@ -0,0 +1,120 @@
+"""
+Раздача отчётов реактором и обработка ошибок устройств
+"""
+
+from select import EPOLLHUP
+
+import pytest
+
+from hid_fake import FakeHid
+from hid_reactor import HidReactor
+
+
+@pytest.fixture
+def reactor():
+    reactor = HidReactor()
+    yield reactor
+    reactor.close()
+
+
+@pytest.fixture
+def devices():
+    opened = []
+
+    def open_device(**kwargs):
+        device = FakeHid(**kwargs)
+        device.run()
+        opened.append(device)
+        return device
+
+    yield open_device
+    for device in opened:
+        device.close()
+
+
+def poll_until(reactor, condition, attempts=50):
+    for _ in range(attempts):
+        if condition():
+            return True
+        reactor.poll(0.05)
+    return condition()
+
+
+def test_reports_go_to_callback_and_queue(reactor, devices):
+    first = devices(loopback=True)
+    second = devices(loopback=True)
+    received = []
+    reactor.register(first, lambda device, report: received.append(report[1]))
+    queue = reactor.register(second)
+
+    first.write(b"\x01")
+    second.write(b"\x02")
+
+    assert poll_until(reactor, lambda: received and queue.qsize())
+    assert received == [1]
+    assert queue.get_nowait()[1] == 2
+
+
+def test_route_handlers_filter_by_report_id(reactor, devices):
+    device = devices(loopback=True)
+    routed = []
+    device.route(lambda report: routed.append(bytes(report[:2])), report_id=5)
+    device.route(None, report_id=6)
+    queue = reactor.register(device)
+
+    for report_id in (5, 6, 7):
+        device.set_report_id(report_id)
+        device.write(b"x")
+
+    assert poll_until(reactor, lambda: routed and queue.qsize())
+    assert routed == [b"\x05x"]
+    assert queue.get_nowait()[0] == 6
+    assert device.metrics_snapshot()["dispatch"]["dropped"] == 1
+
+
+def test_failing_callback_does_not_stop_other_devices(reactor, devices, capsys):
+    failing = devices(loopback=True)
+    healthy = devices(loopback=True)
+    received = []
+
+    def fail(_device, _report):
+        raise RuntimeError("callback failed")
+
+    reactor.register(failing, fail)
+    reactor.register(healthy, lambda device, report: received.append(report[1]))
+    reactor.call_soon(lambda: 1 / 0)
+
+    failing.write(b"\x01")
+    healthy.write(b"\x02")
+
+    assert poll_until(reactor, lambda: received)
+    assert received == [2]
+    output = capsys.readouterr().out
+    assert "callback failed" in output
+    assert "ZeroDivisionError" in output
+
+
+def test_disconnect_is_routed_to_error_handler(reactor, devices):
+    device = devices()
+    errors = []
+
+    def on_error(failed, event):
+        errors.append((failed, event))
+        raise RuntimeError("error handler failed")
+
+    reactor.register(device, lambda _device, _report: None, on_error=on_error)
+    device.disconnect()
+
+    assert poll_until(reactor, lambda: errors)
+    assert errors[0][0] is device
+    assert errors[0][1] & EPOLLHUP
+    assert not device.is_connected
+    reactor.poll(0)  # Ошибка обработчика не нарушила работу реактора
+
+
+def test_hidd_devices_are_rejected(reactor, devices):
+    device = devices()
+    device._use_hidd = True
+
+    with pytest.raises(ValueError):
+        reactor.register(device)
@@ -0,0 +1,96 @@
+"""
+Очередь отправки `Hid`: отчёты, не принятые занятым устройством,
+ждут в очереди и отмечаются явным статусом
+"""
+
+import os
+import threading
+
+import pytest
+
+from base_hid import REPORT_QUEUED, WriteResult
+from hid_fake import FakeHid
+
+REPORT_SIZE = 64
+
+
+@pytest.fixture
+def stalled():
+    """
+    Устройство, которое перестало забирать отчёты: буфер сокета заполнен
+    """
+
+    device = FakeHid(report_size=REPORT_SIZE, loopback=False)
+    device.run()
+    device._device_stop.set()
+    device._device_thread.join()
+    while True:
+        try:
+            os.write(device.fd, bytes(REPORT_SIZE + 1))
+        except BlockingIOError:
+            break
+    yield device
+    device.close()
+
+
+def test_write_accepted_immediately():
+    device = FakeHid(report_size=REPORT_SIZE, loopback=False)
+    device.run()
+    try:
+        assert device.write(bytes(REPORT_SIZE * 3)) == WriteResult(3, REPORT_SIZE * 3, 0)
+        assert device.write_queue_depth == 0
+    finally:
+        device.close()
+
+
+def test_busy_device_queues_reports(stalled):
+    assert stalled._write_report(bytes(REPORT_SIZE + 1)) == REPORT_QUEUED
+
+    result = stalled.write(bytes(REPORT_SIZE * 4))
+
+    assert result == WriteResult(4, REPORT_SIZE * 4, 4)
+    assert stalled.write_queue_depth == 5
+    assert stalled.metrics.queued_writes == 5
+
+
+def test_write_report_returns_queued_status(stalled):
+    result = stalled.write_report(bytes(REPORT_SIZE + 1))
+
+    assert result == WriteResult(1, REPORT_SIZE, 1)
+    assert stalled.write_queue_depth == 1
+
+
+def test_high_water_rejects_reports(stalled):
+    stalled.write_high_water = 3
+
+    result = stalled.write(bytes(REPORT_SIZE * 5))
+
+    assert result == WriteResult(3, REPORT_SIZE * 3, 3)
+    assert stalled.write_backpressure
+    assert stalled.metrics.write_errors == 1
+    assert stalled.write_report(bytes(REPORT_SIZE + 1)) == WriteResult(0, 0)
+    assert stalled.metrics.write_errors == 2
+
+
+def test_flush_sends_queue_in_order(stalled):
+    stalled.write(bytes([1]) * REPORT_SIZE)
+    stalled.write(bytes([2]) * REPORT_SIZE)
+    received = []
+
+    def consume():
+        peer = stalled.peer
+        peer.setblocking(True)
+        peer.settimeout(0.5)
+        try:
+            while True:
+                received.append(peer.recv(REPORT_SIZE + 1))
+        except OSError:
+            pass
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    assert stalled.flush(2)
+    consumer.join()
+
+    assert stalled.write_queue_depth == 0
+    assert [report[1] for report in received if any(report)] == [1, 2]